@@ -9,6 +9,17 @@
 from circle import Circle
 from math import fabs, sqrt
 from logger import Logger
+from snapshot import Snapshot
+from body_import import BodyImporter
+from scenario import ScenarioLoader
+from generators import Generators
+from escape import EscapeMonitor
+from telemetry import TelemetryExporter
+from trails import TrailBuffer
+from trajectory import EXTENSION as TRAJECTORY_EXTENSION, TrajectoryRecorder
+from codec import StateCodec
+from sampling import AdaptiveSampler
+from replay import ReplayPlayer
 
 
 class ActionManager:
@@ -68,17 +79,25 @@ def quit_engine(text: Optional[str] = None):
             text = f"{60 * "="}\nSee you soon! Project available on https://github.com/Nitr0xis/GravityEngine/\n{60 * "="}"
 
         Logger.info("Quitting engine")
+        if state.engine is not None and state.engine.telemetry is not None:
+            state.engine.telemetry.stop()
+        if state.engine is not None and state.engine.trajectory_recorder is not None:
+            state.engine.trajectory_recorder.close()
+        if state.engine is not None:
+            # Clean exit: no crash to recover from
+            state.engine.checkpoints.discard()
         pygame.quit()
         sys.exit(text)
 
     @staticmethod
     def delete_selected_circle():
         """Delete the currently selected body from the simulation."""
-        for circle in state.circles:
+        for index, circle in enumerate(state.circles):
             if circle.is_selected:
-                state.circles.remove(circle)
+                del state.circles[index]
+                state.engine.history.record("Delete body", removed=[(index, circle)])
+                Logger.info(f"Deleted selected circle : ID={circle.number}")
                 break
-        Logger.info(f"Deleted selected circle : ID={circle.number}")
 
     @staticmethod
     def handle_mouse_button_down(event: pygame.event):
@@ -139,7 +158,7 @@ def handle_mouse_button_down(event: pygame.event):
                 elif state.engine.circle_selected:
                     for circle in state.circles:
                         circle.is_selected = False
-                else:
+                elif state.engine.replay is None:
                     state.engine.can_create_circle = True
 
                 if state.engine.can_create_circle:
@@ -148,8 +167,8 @@ def handle_mouse_button_down(event: pygame.event):
                                             state.engine.default_density, 
                                             mass=state.engine.minimum_mass)
                     state.engine.can_create_circle = False
-            else:
-                # Create in world coordinates
+            elif state.engine.replay is None:
+                # Create in world coordinates (never while replaying a recording)
                 state.engine.temp_circle = Circle(world_x, world_y, 
                                         state.engine.default_density, 
                                         mass=state.engine.minimum_mass)
@@ -185,6 +204,7 @@ def handle_mouse_button_up(event: pygame.event):
             state.engine.mouse_down_start_time = None
             if state.engine.temp_circle is not None:
                 state.circles.append(state.engine.temp_circle)
+                state.engine.history.record("Create body", added=[state.engine.temp_circle])
                 state.engine.temp_circle = None
 
     @staticmethod
@@ -273,6 +293,215 @@ def save_screenshot(path: Optional[str] = None):
             )
             Logger.exception(f"Screenshot failed: {e}")
 
+    @staticmethod
+    def undo():
+        """Ctrl+Z: revert the last scene edit."""
+        if not pygame.key.get_mods() & pygame.KMOD_CTRL:
+            return
+        label = state.engine.history.undo()
+        state.engine.notify(f"Undo : {label}" if label else "Nothing to undo", duration=1.5)
+
+    @staticmethod
+    def redo():
+        """Ctrl+Y (or Ctrl+Shift+Z): re-apply the last undone edit."""
+        if not pygame.key.get_mods() & pygame.KMOD_CTRL:
+            return
+        label = state.engine.history.redo()
+        state.engine.notify(f"Redo : {label}" if label else "Nothing to redo", duration=1.5)
+
+    @staticmethod
+    def rewind(steps: int):
+        """Pause and move through the recent history by `steps` physics steps (negative = backwards)."""
+        engine = state.engine
+        if engine.rewind is None:
+            return
+        engine.pause()
+        reached = engine.rewind.scrub(engine, int(steps))
+        if reached == engine.rewind.earliest and steps < 0:
+            engine.notify("Start of the rewind history", duration=1.5)
+        elif reached == engine.rewind.head and steps > 0:
+            engine.notify("Back to the present", duration=1.5)
+
+    @staticmethod
+    def save_snapshot():
+        """Save the whole simulation (bodies, parameters, camera) to saves/."""
+        try:
+            path = Snapshot.save(state.engine)
+            state.engine.notify(f"Simulation saved : {os.path.basename(path)}", duration=3.0)
+        except (OSError, ValueError) as e:
+            state.engine.notify(f"Save failed : {e}", duration=4.0)
+            Logger.exception(f"Snapshot save failed: {e}")
+
+    @staticmethod
+    def load_snapshot():
+        """Replace the current simulation with the most recent snapshot in saves/."""
+        try:
+            path = Snapshot.load(state.engine)
+            if path is None:
+                state.engine.notify("No saved simulation found", duration=3.0)
+                return
+            state.engine.notify(f"Simulation loaded : {os.path.basename(path)} ({len(state.circles)} bodies)",
+                                duration=3.0)
+        except (OSError, ValueError, KeyError) as e:
+            state.engine.notify(f"Load failed : {e}", duration=4.0)
+            Logger.exception(f"Snapshot load failed: {e}")
+
+    @staticmethod
+    def import_bodies():
+        """Add the bodies of the most recent .npz / .npy / .csv file in imports/ to the scene."""
+        engine = state.engine
+        path = BodyImporter.latest(engine)
+        if path is None:
+            engine.fm.create_folder(BodyImporter.FOLDER)
+            engine.notify(f"No file to import in {engine.fm.user_data_path(BodyImporter.FOLDER)}", duration=3.0)
+            return
+        try:
+            count = BodyImporter.load(engine, path)
+            engine.notify(f"Imported {count} bodies from {os.path.basename(path)}", duration=3.0)
+        except (OSError, ValueError) as e:
+            engine.notify(f"Import failed : {e}", duration=4.0)
+            Logger.exception(f"Body import failed: {e}")
+
+    @staticmethod
+    def next_scenario():
+        """Replace the scene with the next scenario preset."""
+        engine = state.engine
+        try:
+            path = ScenarioLoader.next_preset(engine)
+            if path is None:
+                engine.notify("No scenario preset found", duration=3.0)
+                return
+            engine.notify(f"Scenario : {engine.scenario_name} ({len(state.circles)} bodies)", duration=3.0)
+        except (OSError, ValueError, KeyError) as e:
+            engine.notify(f"Scenario failed : {e}", duration=4.0)
+            Logger.exception(f"Scenario load failed: {e}")
+
+    @staticmethod
+    def next_generator():
+        """Replace the scene with the next procedural system, sized to the view."""
+        engine = state.engine
+        engine.generator_index = (engine.generator_index + 1) % len(Generators.CYCLE)
+        name = Generators.CYCLE[engine.generator_index]
+        count = Generators.spawn(engine, name)
+        engine.notify(f"Generated : {name.replace('_', ' ')} ({count} bodies)", duration=3.0)
+
+    @staticmethod
+    def cycle_escape_policy():
+        """Switch to the next escape policy for unbound bodies (see EscapeMonitor.POLICIES)."""
+        engine = state.engine
+        policies = EscapeMonitor.POLICIES
+        current = policies.index(engine.escape_policy) if engine.escape_policy in policies else -1
+        engine.escape_policy = policies[(current + 1) % len(policies)]
+        Logger.info(f"Escape policy: {engine.escape_policy}")
+        engine.notify(f"Escape policy : {engine.escape_policy}", duration=2.0)
+
+    @staticmethod
+    def toggle_trails():
+        """Show or hide the orbit trails (the ring buffer is allocated while they are shown)."""
+        engine = state.engine
+        if engine.trails is not None:
+            engine.trails = None
+            Logger.info("Orbit trails: False")
+            engine.notify("Orbit trails : Disabled", duration=2.0)
+            return
+
+        engine.trails = TrailBuffer(max_bodies=int(engine.trail_max_bodies), length=int(engine.trail_length))
+        Logger.info(f"Orbit trails: True ({engine.trails.nbytes / 1e6:.1f} MB)")
+        engine.notify(f"Orbit trails : Enabled ({engine.trails.length} points, "
+                      f"up to {engine.trails.max_bodies} bodies)", duration=2.0)
+
+    @staticmethod
+    def toggle_field_heatmap():
+        """Show or hide the heatmap of the attraction field (felt by the selected body)."""
+        engine = state.engine
+        engine.field_heatmap_enabled = not engine.field_heatmap_enabled
+        engine.field_heatmap.clear()
+        Logger.info(f"Field heatmap: {engine.field_heatmap_enabled}")
+        engine.notify(f"Field heatmap : {'Enabled' if engine.field_heatmap_enabled else 'Disabled'}", duration=2.0)
+
+    @staticmethod
+    def toggle_telemetry():
+        """Start or stop the streaming CSV export of per-body telemetry."""
+        engine = state.engine
+        if engine.telemetry is not None and engine.telemetry.running:
+            engine.telemetry.stop()
+            engine.notify(f"Telemetry stopped : {engine.telemetry.written_rows} rows, "
+                          f"{engine.telemetry.dropped_rows} dropped", duration=3.0)
+            engine.telemetry = None
+            return
+
+        folder = engine.fm.create_folder("telemetry")
+        engine.telemetry = TelemetryExporter(folder,
+                                             sample_every=int(engine.telemetry_sample_every),
+                                             policy=engine.telemetry_policy)
+        engine.telemetry.start()
+        engine.notify(f"Telemetry export started (every {engine.telemetry.sample_every} steps)", duration=3.0)
+
+    @staticmethod
+    def toggle_recording():
+        """Start or stop recording the full trajectory of every body to recordings/."""
+        engine = state.engine
+        if engine.trajectory_recorder is not None:
+            recorder = engine.trajectory_recorder
+            recorder.close()
+            engine.trajectory_recorder = None
+            engine.notify(f"Recording stopped : {recorder.frames_recorded} frames "
+                          f"({recorder.bytes_written / 1e6:.1f} MB)", duration=3.0)
+            return
+
+        engine.fm.create_folder("recordings")
+        path = engine.fm.user_data_path(f"recordings/recording_{time.strftime('%Y%m%d_%H%M%S')}{TRAJECTORY_EXTENSION}")
+        try:
+            codec = None
+            if engine.recording_codec != "raw":
+                codec = StateCodec(position_error=engine.recording_position_error,
+                                   velocity_error=engine.recording_velocity_error,
+                                   method=engine.recording_codec,
+                                   level=int(engine.recording_compression_level))
+            sampler = AdaptiveSampler(tolerance=engine.recording_tolerance or None,
+                                      background_every=int(engine.recording_background_every),
+                                      region_of_interest=engine.recording_region_of_interest)
+            engine.trajectory_recorder = TrajectoryRecorder(
+                path,
+                sample_every=int(engine.recording_sample_every),
+                codec=codec,
+                sampler=sampler,
+                metadata={"physics_timestep": engine.physics_timestep,
+                          "time_acceleration": engine.time_acceleration},
+            )
+        except (OSError, ValueError) as e:
+            engine.notify(f"Recording failed : {e}", duration=4.0)
+            Logger.exception(f"Trajectory recording failed: {e}")
+            return
+        engine.notify(f"Recording started : {os.path.basename(path)}", duration=3.0)
+
+    @staticmethod
+    def toggle_replay():
+        """Replay the most recent recording (physics off), or return to the live simulation."""
+        engine = state.engine
+        if engine.replay is not None:
+            engine.replay.close()
+            engine.replay = None
+            engine.notify("Back to the simulation", duration=2.0)
+            return
+
+        # The recording being written would be incomplete: finish it first
+        if engine.trajectory_recorder is not None:
+            ActionManager.toggle_recording()
+
+        files = engine.fm.list_files("recordings", extension=TRAJECTORY_EXTENSION, absolute_paths=True)
+        if not files:
+            engine.notify("No recording found (F6 to record)", duration=3.0)
+            return
+        path = max(files, key=os.path.getmtime)
+        try:
+            engine.replay = ReplayPlayer(engine, path)
+        except (OSError, ValueError) as e:
+            engine.notify(f"Replay failed : {e}", duration=4.0)
+            Logger.exception(f"Replay failed: {e}")
+            return
+        engine.notify(f"Replaying {os.path.basename(path)} (F7 to exit)", duration=3.0)
+
     @staticmethod
     def open_config_panel():
         """Open/close the configuration panel."""
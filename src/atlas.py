@@ -555,3 +555,21 @@ def move_file(self,
         except Exception as e:
             print(f"✗ Failed to move file '{src}' -> '{dst}': {e}")
             return False
+
+    def replace_file(self,
+                     src: str,
+                     dst: str,
+                     use_user_data: bool = True) -> bool:
+        """Atomically replace dst with src (same folder / filesystem), overwriting dst if it exists."""
+        try:
+            if use_user_data:
+                src_path = self.user_data_path(src)
+                dst_path = self.user_data_path(dst)
+            else:
+                src_path = src if os.path.isabs(src) else os.path.join(self.project_root, src)
+                dst_path = dst if os.path.isabs(dst) else os.path.join(self.project_root, dst)
+            os.replace(src_path, dst_path)
+            return True
+        except Exception as e:
+            print(f"✗ Failed to replace file '{dst}' with '{src}': {e}")
+            return False
@@ -0,0 +1,140 @@
+"""
+Columnar (NumPy) views of the body list.
+========================================
+
+The simulation keeps its bodies as Circle objects in ``state.circles``.
+Persistence and analysis code (snapshots, recordings, imports) works on
+columns instead: one NumPy array per field, all of the same length.
+This module converts between both representations.
+
+Usage:
+    from body_arrays import BodyArrays
+
+    columns = BodyArrays.to_columns()            # state.circles -> dict of arrays
+    bodies = BodyArrays.from_columns(columns)     # dict of arrays -> new Circles
+"""
+
+from itertools import chain
+from operator import attrgetter
+from typing import Optional
+
+import numpy as np
+
+import state
+from circle import Circle
+
+
+class BodyArrays:
+    """
+    Static helpers converting Circle lists to columns and back.
+
+    Columns are keyed by Circle attribute name, see FIELDS.
+    """
+
+    # Column order used by every on-disk format
+    FIELDS: tuple[str, ...] = ("number", "x", "y", "vx", "vy", "mass", "radius", "density", "age",
+                               "escaped_frozen")
+    DTYPES: dict[str, type] = {
+        "number": np.int64,
+        "x": np.float64,
+        "y": np.float64,
+        "vx": np.float64,
+        "vy": np.float64,
+        "mass": np.float64,
+        "radius": np.float64,
+        "density": np.float64,
+        "age": np.float64,
+        "escaped_frozen": np.bool_,
+    }
+
+    # All fields, gathered in a single pass over the bodies (IDs travel as
+    # float64, exact up to 2**53, and are cast back to int64)
+    _get_all = attrgetter(*FIELDS)
+
+    @staticmethod
+    def alive(circles: Optional[list[Circle]] = None) -> list[Circle]:
+        """Return the bodies not marked for removal (state.circles by default)."""
+        if circles is None:
+            circles = state.circles
+        return [circle for circle in circles if not circle.suicide]
+
+    @staticmethod
+    def to_columns(circles: Optional[list[Circle]] = None) -> dict[str, np.ndarray]:
+        """
+        Gather the bodies into one array per field.
+
+        Args:
+            circles: Bodies to convert (default: alive bodies of state.circles)
+
+        Returns:
+            Dict field name -> 1D array (arrays are copies, safe to hand to other threads)
+        """
+        if circles is None:
+            circles = BodyArrays.alive()
+        count = len(circles)
+
+        # One flat stream of values straight into a preallocated buffer:
+        # ~5x faster than np.array() over a list of per-body tuples
+        width = len(BodyArrays.FIELDS)
+        flat = np.fromiter(chain.from_iterable(map(BodyArrays._get_all, circles)), np.float64, count * width)
+        table = flat.reshape(count, width)
+        columns = {}
+        for i, name in enumerate(BodyArrays.FIELDS):
+            columns[name] = np.ascontiguousarray(table[:, i], dtype=BodyArrays.DTYPES[name])
+        return columns
+
+    @staticmethod
+    def radius_from(mass: np.ndarray, density: np.ndarray) -> np.ndarray:
+        """Vectorized version of the radius formula of Circle.__init__."""
+        mass = np.asarray(mass, dtype=np.float64)
+        density = np.asarray(density, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            radius = np.cbrt((3 * mass / np.where(density > 0, density, 1.0)) / (4 * np.pi))
+        return np.where(density > 0, radius, np.cbrt(mass))
+
+    @staticmethod
+    def from_columns(columns: dict[str, np.ndarray],
+                     keep_ids: bool = True,
+                     keep_ages: bool = True) -> list[Circle]:
+        """
+        Build new Circle objects from columns (see Circle.bulk_create).
+
+        Required columns: x, y, mass, density. Missing vx / vy default to 0,
+        a missing radius is derived from mass and density, a missing
+        escaped_frozen to False (files written before the column existed).
+
+        Args:
+            columns: Dict field name -> 1D array
+            keep_ids: Reuse the "number" column as body IDs (if present)
+            keep_ages: Reuse the "age" column (if present), otherwise bodies are new
+
+        Returns:
+            List of new Circle objects (not yet appended to state.circles)
+        """
+        count = len(columns["x"])
+        zeros = np.zeros(count, dtype=np.float64)
+
+        def column(name, default=None):
+            values = columns.get(name, default)
+            return None if values is None else np.asarray(values, dtype=np.float64).tolist()
+
+        radius = columns.get("radius")
+        if radius is None:
+            radius = BodyArrays.radius_from(columns["mass"], columns["density"])
+
+        numbers = None
+        if keep_ids and "number" in columns:
+            numbers = np.asarray(columns["number"], dtype=np.int64).tolist()
+
+        return Circle.bulk_create(
+            x=column("x"),
+            y=column("y"),
+            vx=column("vx", zeros),
+            vy=column("vy", zeros),
+            mass=column("mass"),
+            density=column("density"),
+            radius=np.asarray(radius, dtype=np.float64).tolist(),
+            numbers=numbers,
+            age=column("age") if keep_ages else None,
+            escaped_frozen=columns.get("escaped_frozen"),
+        )
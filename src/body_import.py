@@ -0,0 +1,215 @@
+"""
+Bulk body import from NumPy / CSV files.
+========================================
+
+Loads initial conditions produced by external tools straight into the
+body store: columns are read as arrays, validated with vectorized checks
+and turned into bodies by BodyArrays.from_columns (Circle.bulk_create),
+without building one Circle through __init__ per row.
+
+Accepted files (user_data/imports/ by default):
+    .npz  one array per column, named after the columns
+    .npy  structured array with named fields, or a 2D float array whose
+          columns follow POSITIONAL_COLUMNS
+    .csv  header row naming the columns (or no header: POSITIONAL_COLUMNS
+          order); read in streaming chunks of CSV_CHUNK_ROWS rows
+
+Columns (SI units, names are case-insensitive):
+    x, y, mass              required
+    vx, vy                  default 0
+    density                 default Engine.default_density
+    radius                  default derived from mass and density
+Other columns are ignored. Rows with a non-finite value or a
+non-positive mass / density / radius are skipped and counted.
+
+Usage:
+    from body_import import BodyImporter
+
+    count = BodyImporter.load(engine, "user_data/imports/plummer_1M.npz")
+    count = BodyImporter.load(engine, path, replace=True)   # instead of adding to the scene
+"""
+
+import os
+import time
+from itertools import islice
+from typing import Optional
+
+import numpy as np
+
+import state
+from body_arrays import BodyArrays
+from logger import Logger
+
+
+class BodyImporter:
+    """
+    Static readers / validators for bulk body imports.
+    """
+
+    FOLDER = "imports"
+    EXTENSIONS: tuple[str, ...] = (".npz", ".npy", ".csv")
+    COLUMNS: tuple[str, ...] = ("x", "y", "vx", "vy", "mass", "density", "radius")
+    REQUIRED: tuple[str, ...] = ("x", "y", "mass")
+    POSITIONAL_COLUMNS: tuple[str, ...] = ("x", "y", "vx", "vy", "mass", "density")
+    CSV_CHUNK_ROWS = 1 << 18
+
+    # Imports larger than this are not undoable (freezing every body would double the memory)
+    UNDO_LIMIT = 10_000
+
+    # ==================== READERS ====================
+
+    @staticmethod
+    def _named(columns: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+        """Keep the known columns (lower-cased names) as float64 arrays."""
+        named = {}
+        for name, values in columns.items():
+            key = name.strip().lower()
+            if key in BodyImporter.COLUMNS:
+                named[key] = np.asarray(values, dtype=np.float64).ravel()
+        return named
+
+    @staticmethod
+    def _positional(table: np.ndarray) -> dict[str, np.ndarray]:
+        table = np.atleast_2d(table)
+        if table.shape[1] < 5:
+            raise ValueError(f"Expected at least 5 columns {BodyImporter.POSITIONAL_COLUMNS}, got {table.shape[1]}")
+        return {name: table[:, i] for i, name in enumerate(BodyImporter.POSITIONAL_COLUMNS[:table.shape[1]])}
+
+    @staticmethod
+    def read_npz(path: str) -> dict[str, np.ndarray]:
+        with np.load(path, allow_pickle=False) as archive:
+            return BodyImporter._named({name: archive[name] for name in archive.files})
+
+    @staticmethod
+    def read_npy(path: str) -> dict[str, np.ndarray]:
+        # Memory-mapped: only the columns actually used are read from disk
+        array = np.load(path, mmap_mode="r", allow_pickle=False)
+        if array.dtype.names:
+            return BodyImporter._named({name: array[name] for name in array.dtype.names})
+        return BodyImporter._named(BodyImporter._positional(array))
+
+    @staticmethod
+    def read_csv(path: str, chunk_rows: Optional[int] = None) -> dict[str, np.ndarray]:
+        """Parse a CSV file CSV_CHUNK_ROWS rows at a time (bounded temporary memory)."""
+        chunk_rows = chunk_rows or BodyImporter.CSV_CHUNK_ROWS
+        with open(path, "r", encoding="utf-8") as f:
+            first = f.readline()
+            cells = [cell.strip() for cell in first.split(",")]
+            try:
+                [float(cell) for cell in cells]
+                names = list(BodyImporter.POSITIONAL_COLUMNS[:len(cells)])
+                pending = [first]  # No header: the first line is data
+            except ValueError:
+                names = [cell.lower() for cell in cells]
+                pending = []
+            if pending and len(names) < 5:
+                raise ValueError(f"Expected at least 5 columns {BodyImporter.POSITIONAL_COLUMNS}")
+
+            parts = []
+            while True:
+                lines = pending + list(islice(f, chunk_rows))
+                pending = []
+                if not lines:
+                    break
+                parts.append(np.loadtxt(lines, delimiter=",", dtype=np.float64, ndmin=2))
+
+        table = np.concatenate(parts) if parts else np.empty((0, len(names)))
+        if table.shape[1] != len(names):
+            raise ValueError(f"{path}: {table.shape[1]} values per row for {len(names)} columns")
+        return BodyImporter._named({name: table[:, i] for i, name in enumerate(names)})
+
+    @staticmethod
+    def read(path: str) -> dict[str, np.ndarray]:
+        """Read the columns of a file (format chosen by extension)."""
+        extension = os.path.splitext(path)[1].lower()
+        readers = {".npz": BodyImporter.read_npz, ".npy": BodyImporter.read_npy, ".csv": BodyImporter.read_csv}
+        if extension not in readers:
+            raise ValueError(f"Unsupported import format '{extension}' (expected one of {BodyImporter.EXTENSIONS})")
+        return readers[extension](path)
+
+    # ==================== VALIDATION ====================
+
+    @staticmethod
+    def validate(columns: dict[str, np.ndarray], default_density: float) -> tuple[dict[str, np.ndarray], int]:
+        """
+        Fill defaults and drop invalid rows.
+
+        Returns:
+            (columns ready for BodyArrays.from_columns, number of skipped rows)
+
+        Raises:
+            ValueError: if a required column is missing or the columns differ in length
+        """
+        missing = [name for name in BodyImporter.REQUIRED if name not in columns]
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(missing)}")
+        count = len(columns["x"])
+        if any(len(values) != count for values in columns.values()):
+            raise ValueError("Columns have different lengths")
+
+        columns = dict(columns)
+        columns.setdefault("vx", np.zeros(count))
+        columns.setdefault("vy", np.zeros(count))
+        columns.setdefault("density", np.full(count, float(default_density)))
+
+        valid = np.ones(count, dtype=bool)
+        for values in columns.values():
+            valid &= np.isfinite(values)
+        for name in ("mass", "density", "radius"):
+            if name in columns:
+                valid &= columns[name] > 0
+
+        skipped = count - int(np.count_nonzero(valid))
+        if skipped:
+            columns = {name: values[valid] for name, values in columns.items()}
+        return columns, skipped
+
+    # ==================== ENGINE ====================
+
+    @staticmethod
+    def load(engine, path: str, replace: bool = False) -> int:
+        """
+        Import the bodies of a file into the scene.
+
+        Args:
+            engine: Running engine
+            path: .npz / .npy / .csv file
+            replace: Replace the current bodies instead of adding to them
+
+        Returns:
+            Number of imported bodies
+        """
+        start = time.perf_counter()
+        columns, skipped = BodyImporter.validate(BodyImporter.read(path), engine.default_density)
+        read_time = time.perf_counter() - start
+
+        bodies = BodyArrays.from_columns(columns, keep_ids=False, keep_ages=False)
+
+        # Mutate in place: other modules hold references to state.circles
+        if replace:
+            state.circles.clear()
+            engine.history.clear()
+        state.circles.extend(bodies)
+        if not replace and len(bodies) <= BodyImporter.UNDO_LIMIT:
+            engine.history.record(f"Import {os.path.basename(path)}", added=bodies)
+        elif not replace:
+            engine.history.clear()
+        engine.temp_circle = None
+        engine.circle_selected = False
+        if engine.rewind is not None:
+            engine.rewind.mark_dirty()
+
+        if skipped:
+            Logger.warning(f"Import: {skipped} invalid row(s) skipped in {path}")
+        Logger.info(f"Imported {len(bodies)} bodies from {path} "
+                    f"(read {read_time:.2f} s, total {time.perf_counter() - start:.2f} s)")
+        return len(bodies)
+
+    @staticmethod
+    def latest(engine) -> Optional[str]:
+        """Return the most recent importable file in imports/, or None."""
+        files = [path for path in engine.fm.list_files(BodyImporter.FOLDER, absolute_paths=True)
+                 if os.path.splitext(path)[1].lower() in BodyImporter.EXTENSIONS]
+        if not files:
+            return None
+        return max(files, key=os.path.getmtime)
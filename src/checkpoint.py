@@ -0,0 +1,195 @@
+"""
+Background checkpoint autosave.
+===============================
+
+Periodically saves the running simulation to user_data/checkpoints/ so
+that a crash loses at most one interval of work. A clean quit discards
+the checkpoint; if one is found at launch, the engine offers to resume it.
+
+The main thread only copies the body columns (BodyArrays.to_columns) and
+the engine metadata. A background thread encodes them in the snapshot
+format (see snapshot.py), compresses the stream with zlib, writes it to a
+temporary file, flushes it to disk and atomically renames it over the
+previous checkpoint: a checkpoint file is always either the old one or
+the complete new one. When a write is still running at the next
+interval, that checkpoint is skipped instead of waiting.
+
+File layout:
+    magic b"GECKPT\\x00\\x00", uint32 version, uint32 codec (0 = zlib),
+    then the compressed .gesnap content
+
+Usage:
+    from checkpoint import CheckpointManager
+
+    engine.checkpoints = CheckpointManager(engine.fm, interval=60.0)
+    engine.checkpoints.tick(engine)         # once per frame
+    path = engine.checkpoints.latest()      # at launch
+    engine.checkpoints.restore(engine, path)
+    engine.checkpoints.discard()            # clean quit
+"""
+
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+import state
+from body_arrays import BodyArrays
+from logger import Logger
+from snapshot import Snapshot
+
+
+class CheckpointManager:
+    """
+    Periodic checkpoints written atomically on a background thread.
+    """
+
+    MAGIC = b"GECKPT\x00\x00"
+    VERSION = 1
+    CODEC_ZLIB = 0
+    FOLDER = "checkpoints"
+    FILENAME = "autosave.geckpt"
+
+    # magic, version, codec
+    _HEADER = struct.Struct("<8sII")
+
+    def __init__(self, fm, interval: float = 60.0, level: int = 1):
+        """
+        Args:
+            fm: FileManager of the engine
+            interval: Seconds (wall clock) between two checkpoints, 0 = disabled
+            level: zlib compression level (1 = fastest)
+        """
+        self.fm = fm
+        self.interval = interval
+        self.level = level
+
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="CheckpointWriter")
+        self._pending: Optional[Future] = None
+        self._last_time = time.time()
+        self._last_state: Optional[tuple] = None
+        self.keep_on_exit = False  # Set to keep the checkpoint through a clean quit (e.g. resume not answered)
+
+        # Statistics (read by the HUD / logs)
+        self.saved = 0
+        self.skipped = 0
+        self.last_path: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        return self.fm.user_data_path(f"{self.FOLDER}/{self.FILENAME}")
+
+    @property
+    def busy(self) -> bool:
+        return self._pending is not None and not self._pending.done()
+
+    # ==================== MAIN THREAD ====================
+
+    def tick(self, engine) -> None:
+        """Start a checkpoint if the interval has elapsed (never waits for the disk)."""
+        if self.interval <= 0 or time.time() - self._last_time < self.interval:
+            return
+        self._last_time = time.time()
+
+        # Nothing changed since the last checkpoint (e.g. paused)
+        scene_state = (engine.simulation_time, engine.circle_number, len(state.circles))
+        if scene_state == self._last_state:
+            return
+        if self.busy:
+            self.skipped += 1
+            Logger.warning("Checkpoint skipped: previous one still being written")
+            return
+
+        self.save_async(engine)
+        self._last_state = scene_state
+
+    def save_async(self, engine) -> Future:
+        """Copy the scene now, write it in the background."""
+        columns = BodyArrays.to_columns()
+        metadata = Snapshot.engine_metadata(engine)
+        self.fm.create_folder(self.FOLDER)
+        self._pending = self._writer.submit(self._write, columns, metadata)
+        return self._pending
+
+    # ==================== WRITER THREAD ====================
+
+    def _write(self, columns, metadata) -> Optional[str]:
+        start = time.perf_counter()
+        path = self.path
+        temp_path = path + ".tmp"
+        try:
+            compressor = zlib.compressobj(self.level)
+            with open(temp_path, "wb") as f:
+                f.write(self._HEADER.pack(self.MAGIC, self.VERSION, self.CODEC_ZLIB))
+                for part in Snapshot.encode_parts(columns, metadata):
+                    f.write(compressor.compress(part))
+                f.write(compressor.flush())
+                f.flush()
+                os.fsync(f.fileno())
+            if not self.fm.replace_file(temp_path, path):
+                return None
+        except OSError as e:
+            Logger.exception(f"Checkpoint write failed: {e}")
+            return None
+
+        self.saved += 1
+        self.last_path = path
+        Logger.info(f"Checkpoint saved: {path} ({len(columns['x'])} bodies, "
+                    f"{os.path.getsize(path) / 1e6:.1f} MB, {time.perf_counter() - start:.2f} s)")
+        return path
+
+    # ==================== RESUME / DISCARD ====================
+
+    def latest(self) -> Optional[str]:
+        """Return the checkpoint left by the previous session, or None."""
+        return self.path if os.path.isfile(self.path) else None
+
+    def read(self, path: str):
+        """
+        Decompress and parse a checkpoint.
+
+        Returns:
+            (metadata, columns) as Snapshot.read_buffer
+
+        Raises:
+            ValueError: if the file is not a checkpoint or is corrupted
+        """
+        with open(path, "rb") as f:
+            header = f.read(self._HEADER.size)
+            if len(header) < self._HEADER.size:
+                raise ValueError("Not a GravityEngine checkpoint (file too short)")
+            magic, version, codec = self._HEADER.unpack(header)
+            if magic != self.MAGIC:
+                raise ValueError("Not a GravityEngine checkpoint (bad magic)")
+            if version > self.VERSION or codec != self.CODEC_ZLIB:
+                raise ValueError(f"Unsupported checkpoint (v{version}, codec {codec})")
+            try:
+                data = zlib.decompress(f.read())
+            except zlib.error as e:
+                raise ValueError(f"Corrupted checkpoint: {e}") from e
+        return Snapshot.read_buffer(data)
+
+    def restore(self, engine, path: Optional[str] = None) -> int:
+        """
+        Replace the current scene with a checkpoint.
+
+        Returns:
+            Number of restored bodies
+        """
+        path = path or self.path
+        metadata, columns = self.read(path)
+        count = Snapshot.apply(engine, metadata, columns)
+        Logger.info(f"Checkpoint restored: {path} ({count} bodies)")
+        return count
+
+    def discard(self) -> None:
+        """Wait for a running write, then delete the checkpoint (clean quit)."""
+        self._writer.shutdown(wait=True)
+        if self.keep_on_exit:
+            return
+        for path in (self.path, self.path + ".tmp"):
+            if os.path.isfile(path):
+                os.remove(path)
+        Logger.info("Checkpoint discarded (clean exit)")
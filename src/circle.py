@@ -1,7 +1,7 @@
+import gc
 import state
 import pygame
 import warnings
-import random
 from math import *
 from typing import Optional
 from color import Color, Display
@@ -23,6 +23,10 @@ class Circle:
     Each Circle object has physical properties (mass, radius, position, velocity)
     and can interact with other bodies through gravitational forces.
     """
+
+    # Set by the "freeze" escape policy: skipped by the force loop (see escape.py).
+    # Not to be confused with freeze() / thaw() (state records)
+    escaped_frozen: bool = False
     def __init__(self, x, y, density, mass):
         """
         Initialize a new celestial body.
@@ -150,6 +154,134 @@ def __init__(self, x, y, density, mass):
         self.force: list[float] = [0.0, 0.0]  # Net force vector (x, y), in pixel variants
         self.printed_force: list[float] = [0.0, 0.0]  # Force for display (scaled to real units [Newtons])
 
+    @classmethod
+    def bulk_create(cls, x, y, vx, vy, mass, density, radius,
+                    numbers=None, age=None, escaped_frozen=None) -> list["Circle"]:
+        """
+        Create many bodies at once, without running __init__ for each one.
+
+        Used to restore snapshots and import large scenes: every attribute is
+        filled from the given columns in a single dict per body instead of the
+        per-body geometry, color and engine lookups of __init__.
+        The attribute set MUST stay in sync with __init__.
+
+        Args:
+            x, y, vx, vy, mass, density, radius: Sequences (lists) of equal length
+            numbers: Body IDs to keep (None = allocate new IDs)
+            age: Ages in simulation time (None = new bodies, born on their first update)
+            escaped_frozen: Flags of the bodies frozen by the escape policy (None = none)
+
+        Returns:
+            List of new Circle objects (not yet appended to state.circles)
+        """
+        engine = state.engine
+        count = len(x)
+
+        if numbers is None:
+            first = engine.circle_number + 1
+            numbers = range(first, first + count)
+        if count > 0:
+            engine.circle_number = max(engine.circle_number, int(max(numbers)))
+
+        color = Display.WHITE if engine.screen_mode == "dark" else Display.BLACK
+        info_y = 6 * engine.txt_gap + 4 * engine.txt_size
+        now = engine.net_simulation_time()
+        born = age is not None
+
+        # Creating many container objects triggers repeated cyclic-GC passes
+        # that cost more than the creation itself: pause the collector meanwhile
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+
+        bodies = []
+        try:
+            for i in range(count):
+                bx, by, bvx, bvy = x[i], y[i], vx[i], vy[i]
+                bmass, bradius = mass[i], radius[i]
+                body = cls.__new__(cls)
+                body.__dict__ = {
+                    'pos': (bx, by),
+                    'full_selected_mode': False,
+                    'number': int(numbers[i]),
+                    'x': bx,
+                    'y': by,
+                    'basic_mass': bmass,
+                    'mass': bmass,
+                    'density': density[i],
+                    'radius': bradius,
+                    'surface': 4 * bradius ** 2 * pi,
+                    'volume': 4 / 3 * pi * bradius ** 3,
+                    'rect': None,
+                    'color': color,
+                    'is_selected': False,
+                    'vx': bvx,
+                    'vy': bvy,
+                    'ax': 0.0,
+                    'ay': 0.0,
+                    'speed': sqrt(bvx ** 2 + bvy ** 2),
+                    'suicide': False,
+                    'prev_x': bx,
+                    'prev_y': by,
+                    'prev_vx': bvx,
+                    'prev_vy': bvy,
+                    'prev_force': [0.0, 0.0],
+                    'prev_radius': bradius,
+                    '_interpolated_cache': {'x': bx, 'y': by, 'vx': bvx, 'vy': bvy, 'fx': 0.0, 'fy': 0.0,
+                                            'radius': bradius, 'alpha': -1.0},
+                    'is_born': born,
+                    'birth_time': now - age[i] if born else None,
+                    'age': age[i] if born else 0,
+                    'simulation_time_in_pause': 0,
+                    'info_y': info_y,
+                    'vector_width': 1,
+                    'global_speed_vector_scale': 1e4,
+                    'force_vector_scale': 1e2,
+                    'GSV_color': Display.RED,
+                    'CSV_x_color': Display.GREEN,
+                    'CSV_y_color': Display.YELLOW,
+                    'attract_forces': [],
+                    'force': [0.0, 0.0],
+                    'printed_force': [0.0, 0.0],
+                }
+                bodies.append(body)
+            if escaped_frozen is not None:
+                # Rare: set on the instance only, the class default covers the others
+                for body, flag in zip(bodies, escaped_frozen):
+                    if flag:
+                        body.escaped_frozen = True
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        return bodies
+
+    # Mutable attributes that freeze() / thaw() must copy (everything else is immutable)
+    _MUTABLE_ATTRIBUTES: tuple[str, ...] = ("force", "prev_force", "printed_force", "_interpolated_cache")
+
+    def freeze(self) -> dict:
+        """
+        Return an exact, independent copy of the body state.
+
+        Immutable values (floats, tuples, colors) are shared with the body,
+        so a record costs little more than its dict. Used by the rewind and
+        undo histories to restore bodies bit for bit.
+        """
+        record = self.__dict__.copy()
+        for name in Circle._MUTABLE_ATTRIBUTES:
+            record[name] = record[name].copy()
+        record['attract_forces'] = []  # Rebuilt by every physics step
+        return record
+
+    @classmethod
+    def thaw(cls, record: dict) -> "Circle":
+        """Create a new body from a freeze() record (the record stays reusable)."""
+        body = cls.__new__(cls)
+        body.__dict__ = record.copy()
+        for name in Circle._MUTABLE_ATTRIBUTES:
+            body.__dict__[name] = record[name].copy()
+        body.attract_forces = []
+        return body
+
     def kinetic_energy(self):
         """
         Calculate kinetic energy of the body.
@@ -580,8 +712,8 @@ def physics_update(self, dt):
                 max_velocity_per_frame = sqrt(2 * total_energy / self.mass)
                 max_velocity = max_velocity_per_frame * state.engine.FPS_TARGET
                 
-                self.vx = random.uniform(-max_velocity, max_velocity)
-                self.vy = random.uniform(-max_velocity, max_velocity)
+                self.vx = state.engine.rng.uniform(-max_velocity, max_velocity)
+                self.vy = state.engine.rng.uniform(-max_velocity, max_velocity)
             
             self.is_born = True
         
@@ -653,7 +785,31 @@ def draw_interpolated(self, screen, alpha, interpolate_radius: bool = True):
         if (screen_x < -margin or screen_x > screen.get_width() + margin or
             screen_y < -margin or screen_y > screen.get_height() + margin):
             return  # Out of screen, don't draw
-            
+
+        self.draw_at(screen, int(screen_x), int(screen_y), visible_radius)
+
+    def draw_at(self, screen, screen_x: int, screen_y: int, visible_radius: int):
+        """
+        Draw the body at an already projected screen position.
+
+        Used by FrameData.draw, which interpolates, projects and culls all
+        bodies at once (see frame.py), and by draw_interpolated.
+
+        Args:
+            screen: Pygame screen surface
+            screen_x, screen_y: Screen position of the center, in pixels
+            visible_radius: Screen radius in pixels (>= 1)
+        """
+        color, style = self.display_style()
+        self.rect = Circle.paint(screen, screen_x, screen_y, visible_radius, color, style)
+
+    def display_style(self) -> tuple:
+        """
+        Return (body color, outline style) for the current selection state.
+
+        Styles: "shadow" (not selected), "ring" (selected: green ring around
+        the body), "plain" (selected in full selection mode: green body).
+        """
         # ===== SELECTION HIGHLIGHTING =====
         if self.full_selected_mode:
             if self.is_selected:
@@ -663,40 +819,47 @@ def draw_interpolated(self, screen, alpha, interpolate_radius: bool = True):
                     self.color = Display.WHITE
                 elif state.engine.screen_mode == "light":
                     self.color = Display.BLACK
-        else:
-            if self.is_selected:
-                if visible_radius <= 4:
-                    pygame.draw.circle(screen, Display.DUCKY_GREEN, 
-                                    (int(screen_x), int(screen_y)),
-                                    visible_radius + 2)
-                elif visible_radius <= 20:
-                    pygame.draw.circle(screen, Display.DUCKY_GREEN, 
-                                    (int(screen_x), int(screen_y)),
-                                    visible_radius + visible_radius // 4 + 1)
-                else:
-                    pygame.draw.circle(screen, Display.DUCKY_GREEN, 
-                                    (int(screen_x), int(screen_y)),
-                                    visible_radius + 5)
-        
-        # ===== DRAW SHADOW/OUTLINE =====
-        if not self.is_selected:
+            return self.color, "plain" if self.is_selected else "shadow"
+        return self.color, "ring" if self.is_selected else "shadow"
+
+    @staticmethod
+    def outline_radius(visible_radius: int, style: str) -> int:
+        """Screen radius of the outline (ring or shadow) drawn behind a body of visible_radius."""
+        if style == "ring":
             if visible_radius <= 4:
-                pygame.draw.circle(screen, Display.DARK_GREY, 
-                                (int(screen_x), int(screen_y)), 
-                                visible_radius + 1)
+                return visible_radius + 2
             elif visible_radius <= 20:
-                pygame.draw.circle(screen, Display.DARK_GREY, 
-                                (int(screen_x), int(screen_y)),
-                                visible_radius + visible_radius // 5)
-            else:
-                pygame.draw.circle(screen, Display.DARK_GREY, 
-                                (int(screen_x), int(screen_y)), 
-                                visible_radius + 3)
-        
+                return visible_radius + visible_radius // 4 + 1
+            return visible_radius + 5
+        if style == "shadow":
+            if visible_radius <= 4:
+                return visible_radius + 1
+            elif visible_radius <= 20:
+                return visible_radius + visible_radius // 5
+            return visible_radius + 3
+        return visible_radius
+
+    @staticmethod
+    def paint(surface, screen_x: int, screen_y: int, visible_radius: int, color, style: str):
+        """
+        Draw a body (outline, then body) centered on (screen_x, screen_y).
+
+        Shared by draw_at and the pre-rendered sprites of SpriteCache, so
+        both paths produce the same pixels.
+
+        Returns:
+            Rect of the body circle
+        """
+        center = (int(screen_x), int(screen_y))
+        if style == "ring":
+            # ===== SELECTION RING =====
+            pygame.draw.circle(surface, Display.DUCKY_GREEN, center, Circle.outline_radius(visible_radius, style))
+        elif style == "shadow":
+            # ===== DRAW SHADOW/OUTLINE =====
+            pygame.draw.circle(surface, Display.DARK_GREY, center, Circle.outline_radius(visible_radius, style))
+
         # ===== DRAW MAIN BODY CIRCLE =====
-        self.rect = pygame.draw.circle(screen, self.color, 
-                                    (int(screen_x), int(screen_y)), 
-                                    visible_radius)
+        return pygame.draw.circle(surface, color, center, visible_radius)
 
     def _will_collide_continuous(self, other, dt_sim: float) -> bool:
         """
@@ -791,7 +954,7 @@ def update_fusion(self, other, dt_sim: float):
             self.fusion(other)
         elif visual_collision and not physical_collision:
             # Visual collision detected but not physical collision
-            # → Force a physics step (already handled by _check_visual_collisions)
+            # → Force a physics step (already handled by FrameData.has_visual_collision)
             pass
 
     def fusion(self, other):
@@ -0,0 +1,267 @@
+"""
+Compact codec for recorded body states.
+=======================================
+
+Encodes trajectory chunks (see trajectory.py) in a fraction of their raw
+float64 size, with a guaranteed maximum error on positions and velocities.
+
+Per chunk and per field ([frames x slots] arrays):
+    quantized fields (x, y / vx, vy, user-set error bound e):
+        q = round((value - lo) / (2 e)), lo = minimum of the field over the
+        chunk (per-chunk bounding box), so |decoded - value| <= e
+    lossless fields (forces, mass, radius, density):
+        float64 bits XOR-ed with the previous frame (exact)
+then, for every field:
+    prediction from the previous frames of the same body (order 1 = delta,
+    order 2 = linear extrapolation), residuals stored in the smallest
+    integer type that fits, byte shuffle (all first bytes, then all second
+    bytes...) and zlib or lzma compression.
+
+Fields are compressed and decompressed in parallel on a thread pool
+(zlib and lzma release the GIL), so decoding keeps up with playback.
+
+Usage:
+    from codec import StateCodec
+
+    codec = StateCodec(position_error=1e-3, velocity_error=1e-7, method="zlib", level=6)
+    payload = codec.encode(times, ids, values)          # values: dict field -> [frames, slots]
+    times, ids, values = StateCodec.decode(payload)     # self-describing: no codec settings needed
+"""
+
+import json
+import lzma
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+
+class StateCodec:
+    """
+    Error-bounded quantization + temporal prediction + byte shuffle + zlib / lzma.
+    """
+
+    METHODS: tuple[str, ...] = ("zlib", "lzma")
+    POSITION_FIELDS: tuple[str, ...] = ("x", "y")
+    VELOCITY_FIELDS: tuple[str, ...] = ("vx", "vy")
+
+    # Shared by every codec instance (compression threads are stateless)
+    _pool: Optional[ThreadPoolExecutor] = None
+
+    # metadata length
+    _HEADER = struct.Struct("<I")
+
+    def __init__(self,
+                 position_error: Optional[float] = 1e-3,
+                 velocity_error: Optional[float] = 1e-7,
+                 method: str = "zlib",
+                 level: int = 6,
+                 order: int = 2):
+        """
+        Args:
+            position_error: Max absolute error on x / y in meters (None = lossless)
+            velocity_error: Max absolute error on vx / vy in m/s (None = lossless)
+            method: "zlib" or "lzma"
+            level: Compression level (zlib 1-9, lzma preset 0-9)
+            order: Prediction order of quantized fields (1 = previous frame, 2 = linear extrapolation)
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown codec method '{method}' (expected one of {self.METHODS})")
+        for name, bound in (("position_error", position_error), ("velocity_error", velocity_error)):
+            if bound is not None and not bound > 0:
+                raise ValueError(f"{name} must be > 0 (or None for lossless)")
+        self.position_error = position_error
+        self.velocity_error = velocity_error
+        self.method = method
+        self.level = int(level)
+        self.order = max(1, min(int(order), 2))
+
+    def describe(self) -> dict:
+        """JSON-serializable settings, stored in the recording header."""
+        return {
+            "position_error": self.position_error,
+            "velocity_error": self.velocity_error,
+            "method": self.method,
+            "level": self.level,
+            "order": self.order,
+        }
+
+    @staticmethod
+    def _executor() -> ThreadPoolExecutor:
+        if StateCodec._pool is None:
+            StateCodec._pool = ThreadPoolExecutor(thread_name_prefix="StateCodec")
+        return StateCodec._pool
+
+    def error_bound(self, name: str) -> Optional[float]:
+        if name in self.POSITION_FIELDS:
+            return self.position_error
+        if name in self.VELOCITY_FIELDS:
+            return self.velocity_error
+        return None
+
+    # ==================== BUILDING BLOCKS ====================
+
+    @staticmethod
+    def _predict(q: np.ndarray, order: int) -> np.ndarray:
+        """Residuals of a temporal predictor along axis 0 (exact, integer arithmetic)."""
+        for _ in range(order):
+            q = np.diff(q, axis=0, prepend=np.zeros((1,) + q.shape[1:], dtype=q.dtype))
+        return q
+
+    @staticmethod
+    def _unpredict(r: np.ndarray, order: int) -> np.ndarray:
+        for _ in range(order):
+            r = np.cumsum(r, axis=0, dtype=r.dtype)
+        return r
+
+    @staticmethod
+    def _narrow(r: np.ndarray) -> np.ndarray:
+        """Store integer residuals in the smallest signed type that holds them."""
+        if r.size == 0:
+            return r.astype(np.int8)
+        peak = max(int(r.max()), -int(r.min()) - 1)
+        for dtype in (np.int8, np.int16, np.int32):
+            if peak <= np.iinfo(dtype).max:
+                return r.astype(dtype)
+        return r
+
+    @staticmethod
+    def _shuffle(array: np.ndarray) -> bytes:
+        """Byte shuffle: byte k of every element, for k = 0..itemsize-1."""
+        raw = np.ascontiguousarray(array).view(np.uint8)
+        return raw.reshape(-1, array.dtype.itemsize).T.tobytes()
+
+    @staticmethod
+    def _unshuffle(data: bytes, dtype: np.dtype, shape: tuple) -> np.ndarray:
+        itemsize = np.dtype(dtype).itemsize
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(itemsize, -1).T
+        return np.ascontiguousarray(raw).view(dtype).reshape(shape)
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.method == "lzma":
+            return lzma.compress(data, preset=self.level)
+        return zlib.compress(data, self.level)
+
+    @staticmethod
+    def _decompress(data: bytes, method: str) -> bytes:
+        if method == "lzma":
+            return lzma.decompress(data)
+        return zlib.decompress(data)
+
+    # ==================== FIELD ENCODING ====================
+
+    @staticmethod
+    def _hold(array: np.ndarray, present: np.ndarray) -> np.ndarray:
+        """
+        Replace absent entries (fused bodies, samples skipped by a sampler) by
+        the last present value of the same body, so that they cost nothing
+        after prediction. Leading absent entries take row 0.
+        """
+        rows = np.where(present, np.arange(len(array))[:, None], 0)
+        np.maximum.accumulate(rows, axis=0, out=rows)
+        return np.take_along_axis(array, rows, axis=0)
+
+    def _encode_field(self, name: str, values: np.ndarray, present: np.ndarray) -> tuple[dict, bytes]:
+        bound = self.error_bound(name)
+        if bound is None:
+            # Lossless: XOR with the previous frame (unchanged values -> 0)
+            bits = self._hold(values.view(np.uint64), present)
+            residual = bits.copy()
+            residual[1:] ^= bits[:-1]
+            info = {"kind": "xor"}
+        else:
+            step = 2.0 * bound
+            lo = float(np.nanmin(values)) if present.any() else 0.0
+            q = np.zeros(values.shape, dtype=np.int64)
+            np.rint((values - lo) / step, out=q, where=present, casting="unsafe")
+            q = self._hold(q, present)
+            residual = self._narrow(self._predict(q, self.order))
+            info = {"kind": "quant", "lo": lo, "step": step, "order": self.order}
+
+        info["dtype"] = residual.dtype.str
+        return info, self._compress(self._shuffle(residual))
+
+    @staticmethod
+    def _decode_field(info: dict, data: bytes, method: str, shape: tuple, present: np.ndarray) -> np.ndarray:
+        residual = StateCodec._unshuffle(StateCodec._decompress(data, method), np.dtype(info["dtype"]), shape)
+        if info["kind"] == "xor":
+            bits = residual.astype(np.uint64)
+            np.bitwise_xor.accumulate(bits, axis=0, out=bits)
+            values = bits.view(np.float64)
+            values[~present] = np.nan
+            return values
+
+        q = StateCodec._unpredict(residual.astype(np.int64), info["order"])
+        values = info["lo"] + q * info["step"]
+        values[~present] = np.nan
+        return values
+
+    # ==================== CHUNK ENCODING ====================
+
+    def encode(self, times: np.ndarray, ids: np.ndarray, values: dict[str, np.ndarray]) -> bytes:
+        """
+        Encode one chunk.
+
+        Args:
+            times: float64[frames]
+            ids: int64[slots]
+            values: dict field -> float64[frames, slots] (NaN = body absent)
+
+        Returns:
+            Self-describing payload (see decode)
+        """
+        names = list(values)
+        frames, slots = values[names[0]].shape
+        present = ~np.isnan(values["x"])
+
+        futures = [self._executor().submit(self._encode_field, name, values[name], present) for name in names]
+        mask = zlib.compress(np.packbits(present).tobytes(), 1)
+
+        blocks = [mask]
+        table = []
+        for name, future in zip(names, futures):
+            info, data = future.result()
+            table.append({"name": name, "size": len(data), **info})
+            blocks.append(data)
+
+        meta = json.dumps({
+            "method": self.method, "frames": frames, "slots": slots,
+            "mask_size": len(mask), "fields": table,
+        }).encode("utf-8")
+        return b"".join([self._HEADER.pack(len(meta)), meta,
+                         np.ascontiguousarray(times, np.float64).tobytes(),
+                         np.ascontiguousarray(ids, np.int64).tobytes(), *blocks])
+
+    @staticmethod
+    def decode(payload) -> tuple[np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+        """
+        Decode a chunk produced by encode().
+
+        Returns:
+            (times, ids, values) with values a dict field -> float64[frames, slots]
+        """
+        (meta_length,) = StateCodec._HEADER.unpack_from(payload, 0)
+        position = StateCodec._HEADER.size
+        meta = json.loads(bytes(payload[position:position + meta_length]))
+        position += meta_length
+
+        frames, slots, method = meta["frames"], meta["slots"], meta["method"]
+        times = np.frombuffer(payload, np.float64, frames, position).copy()
+        position += 8 * frames
+        ids = np.frombuffer(payload, np.int64, slots, position).copy()
+        position += 8 * slots
+
+        mask_bytes = zlib.decompress(bytes(payload[position:position + meta["mask_size"]]))
+        position += meta["mask_size"]
+        present = np.unpackbits(np.frombuffer(mask_bytes, np.uint8), count=frames * slots)
+        present = present.astype(bool).reshape(frames, slots)
+
+        futures = []
+        for info in meta["fields"]:
+            data = bytes(payload[position:position + info["size"]])
+            position += info["size"]
+            futures.append((info["name"], StateCodec._executor().submit(
+                StateCodec._decode_field, info, data, method, (frames, slots), present)))
+        return times, ids, {name: future.result() for name, future in futures}
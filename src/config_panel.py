@@ -171,6 +171,29 @@ def draw(self, surf):
 # ==================================================================================
 
 class ConfigPanel:
+    # Engine attributes persisted by "Save Config" (and stored in snapshots)
+    CONFIG_KEYS: list[str] = [
+        "time_acceleration", "FPS_TARGET", "default_density", "fusions",
+        "vectors_printed", "force_vectors", "vector_scale", "vector_arrowheads", "vector_antialiasing",
+        "trail_sample_every", "trail_min_spacing_px",
+        "field_heatmap_enabled", "field_heatmap_cell_px", "field_heatmap_opacity", "field_heatmap_decades",
+        "camera_zoom",
+        "adaptive_substeps", "adaptive_substeps_max_extra",
+        "reversed_gravity", "random_mode",
+        "gravitational_grid_enabled", "grid_lens_amount", "grid_target_spacing_px",
+        "telemetry_sample_every", "telemetry_policy", "recording_sample_every",
+        "recording_codec", "recording_compression_level",
+        "recording_position_error", "recording_velocity_error",
+        "recording_tolerance", "recording_background_every", "recording_region_of_interest",
+        "generator_count", "sprite_antialiasing",
+        "lod_splat_radius", "lod_mass_weighted", "lod_log_tone",
+        "render_scale", "render_scale_dynamic", "render_scale_min", "render_scale_smooth",
+        "quality_governor", "quality_degrade_ratio", "quality_degrade_frames",
+        "quality_restore_ratio", "quality_restore_frames",
+        "idle_throttling", "idle_wait_ms", "hud_refresh_rate",
+        "escape_policy", "escape_distance_factor", "escape_check_every",
+    ]
+
     def __init__(self, engine, screen, font_path):
         self.engine, self.screen = engine, screen
         self.font_big = pygame.font.Font(font_path, 28)
@@ -203,6 +226,8 @@ def _build(self):
                          30, 240, False, "{:.0f} FPS")
         y = self._slider(x, y, w, "Time Acceleration", "time_acceleration",
                          1e3, 1e5, True, "{:.2e}x")
+        y = self._slider(x, y, w, "Generated system size (O key)", "generator_count",
+                         100, 1e6, True, "{:.0f} bodies")
         
         # === PHYSICS ===
         y = self._sec(x, y, "Physics")
@@ -211,26 +236,85 @@ def _build(self):
         y = self._slider(x, y, w, "Corpses Density", "default_density",
                          1e0, 1e5, True, "{:.2e} kg/m³")
         y = self._checkbox(x, y, "Enable Body Fusions", "fusions")
+        y = self._slider(x, y, w, "Escape distance (U key policy)", "escape_distance_factor",
+                         2.0, 100.0, True, "{:.1f} half-mass radii")
+        y = self._slider(x, y, w, "Escape check period", "escape_check_every",
+                         1, 600, True, "every {:.0f} steps")
         
         # === VISUAL ===
         y = self._sec(x, y, "Visual")
         y = self._slider(x, y, w, "Camera Zoom", "camera_zoom",
                          1e-7, 100.0, True, "{:.2e}x")
+        y = self._slider(x, y, w, "Render scale", "render_scale",
+                         0.25, 1.0, False, "{:.0%}")
+        y = self._checkbox(x, y, "Dynamic render scale (frame time)", "render_scale_dynamic")
+        y = self._slider(x, y, w, "Dynamic render scale floor", "render_scale_min",
+                         0.25, 1.0, False, "{:.0%}")
+        y = self._checkbox(x, y, "Smooth upscaling", "render_scale_smooth")
+        y = self._checkbox(x, y, "Antialiased bodies", "sprite_antialiasing")
+        y = self._slider(x, y, w, "Point splats below", "lod_splat_radius",
+                         0.0, 4.0, False, "{:.1f} px (0 = off)")
+        y = self._checkbox(x, y, "Mass-weighted splats", "lod_mass_weighted")
+        y = self._checkbox(x, y, "Log tone mapping of splats", "lod_log_tone")
+        y = self._slider(x, y, w, "HUD refresh rate", "hud_refresh_rate",
+                         1.0, 120.0, True, "{:.0f} Hz")
         y = self._checkbox(x, y, "Show Vectors", "vectors_printed")
         y = self._slider(x, y, w, "Vector Scale", "vector_scale",
                          0.1, 10.0, False, "{:.2f}x")
+        y = self._checkbox(x, y, "Vector arrowheads", "vector_arrowheads")
+        y = self._checkbox(x, y, "Antialiased vectors", "vector_antialiasing")
+        y = self._slider(x, y, w, "Trail sample period", "trail_sample_every",
+                         1, 60, True, "every {:.0f} steps")
+        y = self._slider(x, y, w, "Trail point spacing", "trail_min_spacing_px",
+                         0.5, 20.0, True, "{:.1f} px")
+        y = self._checkbox(x, y, "Attraction-field heatmap", "field_heatmap_enabled")
+        y = self._slider(x, y, w, "Heatmap cell size", "field_heatmap_cell_px",
+                         4, 64, True, "{:.0f} px")
+        y = self._slider(x, y, w, "Heatmap opacity", "field_heatmap_opacity",
+                         0.1, 1.0, False, "{:.0%}")
+        y = self._slider(x, y, w, "Heatmap range", "field_heatmap_decades",
+                         1.0, 10.0, False, "{:.1f} decades")
         y = self._checkbox(x, y, "Gravitational lensing grid", "gravitational_grid_enabled")
         y = self._slider(x, y, w, "Grid lens strength", "grid_lens_amount",
                          0.0, 10, False, "{:.2f}x")
         y = self._slider(x, y, w, "Grid spacing (screen px)", "grid_target_spacing_px",
                          40.0, 160.0, False, "{:.0f} px")
 
+        # === ADAPTIVE QUALITY ===
+        y = self._sec(x, y, "Adaptive Quality")
+        y = self._checkbox(x, y, "Hold the frame budget (degrade rendering)", "quality_governor")
+        y = self._slider(x, y, w, "Degrade above", "quality_degrade_ratio",
+                         0.5, 1.5, False, "{:.0%} of the budget")
+        y = self._slider(x, y, w, "Frames before degrading", "quality_degrade_frames",
+                         1, 120, False, "{:.0f} frames")
+        y = self._slider(x, y, w, "Restore below", "quality_restore_ratio",
+                         0.2, 1.0, False, "{:.0%} of the budget")
+        y = self._slider(x, y, w, "Frames before restoring", "quality_restore_frames",
+                         10, 600, True, "{:.0f} frames")
+        y = self._checkbox(x, y, "Idle throttling (paused, unchanged frames)", "idle_throttling")
+        y = self._slider(x, y, w, "Idle wake-up period", "idle_wait_ms",
+                         20, 1000, True, "{:.0f} ms")
+
         # === ADVANCED / CCD ===
         y = self._sec(x, y, "Advanced (Collisions)")
         y = self._checkbox(x, y, "Enable Adaptive Substeps", "adaptive_substeps")
         y = self._slider(x, y, w, "Substep Precision (+N extra)", "adaptive_substeps_max_extra",
                          0.0, 8.0, False, "+{:.0f} steps")
         
+        # === DATA EXPORT ===
+        y = self._sec(x, y, "Data Export")
+        y = self._slider(x, y, w, "Telemetry sample period", "telemetry_sample_every",
+                         1, 120, False, "every {:.0f} steps")
+        y = self._slider(x, y, w, "Recording sample period", "recording_sample_every",
+                         1, 120, False, "every {:.0f} steps")
+        y = self._slider(x, y, w, "Recording compression level", "recording_compression_level",
+                         1, 9, False, "level {:.0f}")
+        y = self._slider(x, y, w, "Recording decimation tolerance", "recording_tolerance",
+                         0.0, 10.0, False, "{:.1f} m (0 = off)")
+        y = self._slider(x, y, w, "Recording rate out of view", "recording_background_every",
+                         1, 64, False, "1 / {:.0f} frames")
+        y = self._checkbox(x, y, "Record bodies in view at full rate", "recording_region_of_interest")
+
         # === BUTTONS ===
         y += 20
         bw = (w - 20) // 3
@@ -258,13 +342,7 @@ def _slider(self, x, y, w, label, attr, mn, mx, log, fmt):
         return y + 60
     
     def _save(self):
-        cfg = {k: getattr(self.engine, k) for k in [
-            "time_acceleration", "FPS_TARGET", "default_density", "fusions",
-            "vectors_printed", "force_vectors", "vector_scale", "camera_zoom",
-            "adaptive_substeps", "adaptive_substeps_max_extra",
-            "reversed_gravity", "random_mode",
-            "gravitational_grid_enabled", "grid_lens_amount", "grid_target_spacing_px",
-        ]}
+        cfg = {k: getattr(self.engine, k) for k in self.CONFIG_KEYS}
         payload = {
             "version": getattr(self.engine, "project_version", "unknown"),
             "config": cfg,
@@ -0,0 +1,186 @@
+"""
+Escape detection and far-field culling.
+=======================================
+
+Bodies flung out of the system still cost O(n) force work per step. Every
+Engine.escape_check_every physics steps, the monitor looks for bodies that
+are both:
+    - unbound: positive specific energy relative to the center of mass of
+      the system, e = |v - v_com|² / 2 - G * M / |r - r_com|
+      (M = total mass, the monopole approximation holds that far out)
+    - far: beyond Engine.escape_distance_factor half-mass radii of the COM
+
+and applies Engine.escape_policy to them:
+    "off"        nothing is checked (default)
+    "remove"     the bodies are deleted
+    "freeze"     the bodies stay in the scene, motionless, and are skipped
+                 by the force loop (Circle.escaped_frozen)
+    "aggregate"  the bodies are merged into a single far-field body that
+                 conserves their mass and momentum; its position is their
+                 center of mass, kept at least at the escape distance
+
+The selected body, frozen bodies and the aggregate itself are never
+checked. Nothing happens under reversed gravity (every body is unbound).
+Each action is logged and counted (removed / frozen / aggregated).
+
+Usage:
+    from escape import EscapeMonitor
+
+    monitor = EscapeMonitor()
+    monitor.on_physics_step(engine)   # called at the start of Engine.physics_step
+"""
+
+from itertools import chain
+from math import pi, sqrt
+from operator import attrgetter
+from typing import Optional
+
+import numpy as np
+
+import state
+from circle import Circle
+from logger import Logger
+
+
+class EscapeMonitor:
+    """
+    Periodic unbound-body detection applying the engine's escape policy.
+    """
+
+    POLICIES: tuple[str, ...] = ("off", "remove", "freeze", "aggregate")
+    # IDs listed per logged action (the rest is only counted)
+    LOGGED_IDS = 10
+
+    _get_state = attrgetter("x", "y", "vx", "vy", "mass")
+
+    def __init__(self):
+        self._steps = 0
+        self.removed = 0
+        self.frozen = 0
+        self.aggregated = 0
+        self.aggregate_number: Optional[int] = None  # ID of the far-field body (None = not created yet)
+
+    @property
+    def total(self) -> int:
+        return self.removed + self.frozen + self.aggregated
+
+    def describe(self) -> str:
+        return f"{self.removed} removed, {self.frozen} frozen, {self.aggregated} aggregated"
+
+    # ==================== DETECTION ====================
+
+    def find_escapers(self, engine, bodies: list[Circle]) -> tuple[list[Circle], float, np.ndarray]:
+        """
+        Return (escaping bodies, escape distance, system COM position).
+
+        Args:
+            engine: Running engine (gravity, escape_distance_factor)
+            bodies: Bodies forming the system (all of them contribute to the COM)
+        """
+        count = len(bodies)
+        table = np.fromiter(chain.from_iterable(map(EscapeMonitor._get_state, bodies)),
+                            np.float64, count * 5).reshape(count, 5)
+        x, y, vx, vy, mass = table.T
+        total_mass = mass.sum()
+        com = np.array([x @ mass, y @ mass]) / total_mass
+        com_v = np.array([vx @ mass, vy @ mass]) / total_mass
+
+        distance = np.hypot(x - com[0], y - com[1])
+        order = np.argsort(distance)
+        half = np.searchsorted(np.cumsum(mass[order]), total_mass / 2)
+        half_mass_radius = distance[order[min(half, count - 1)]]
+        escape_distance = float(engine.escape_distance_factor) * half_mass_radius
+
+        with np.errstate(divide="ignore"):
+            energy = 0.5 * ((vx - com_v[0]) ** 2 + (vy - com_v[1]) ** 2) - engine.gravity * total_mass / distance
+        escaping = (energy > 0) & (distance > escape_distance)
+        return [bodies[i] for i in np.flatnonzero(escaping) if not bodies[i].is_selected], escape_distance, com
+
+    # ==================== POLICIES ====================
+
+    def on_physics_step(self, engine) -> None:
+        """Run a check every escape_check_every steps (nothing when the policy is "off")."""
+        if engine.escape_policy == "off" or engine.reversed_gravity:
+            return
+        self._steps += 1
+        if self._steps % max(1, int(engine.escape_check_every)):
+            return
+
+        bodies = [circle for circle in state.circles
+                  if not circle.suicide and not circle.escaped_frozen and circle.number != self.aggregate_number]
+        if len(bodies) < 3:
+            return
+        escapers, escape_distance, com = self.find_escapers(engine, bodies)
+        if not escapers:
+            return
+
+        if engine.escape_policy == "remove":
+            self._remove(escapers)
+            self.removed += len(escapers)
+        elif engine.escape_policy == "freeze":
+            for circle in escapers:
+                circle.escaped_frozen = True
+            self.frozen += len(escapers)
+        elif engine.escape_policy == "aggregate":
+            self._aggregate(engine, escapers, escape_distance, com)
+            self.aggregated += len(escapers)
+        else:
+            raise ValueError(f"Unknown escape policy '{engine.escape_policy}' (expected one of {self.POLICIES})")
+
+        ids = ", ".join(f"n°{circle.number}" for circle in escapers[:self.LOGGED_IDS])
+        more = f" and {len(escapers) - self.LOGGED_IDS} more" if len(escapers) > self.LOGGED_IDS else ""
+        Logger.info(f"Escape ({engine.escape_policy}): {len(escapers)} unbound bodies beyond "
+                    f"{escape_distance:.3e} m ({ids}{more})")
+
+        # The scene changed outside the integrator: the rewind history needs a keyframe
+        if engine.rewind is not None:
+            engine.rewind.mark_dirty()
+
+    @staticmethod
+    def _remove(circles: list[Circle]) -> None:
+        gone = {id(circle) for circle in circles}
+        # Mutate in place: other modules hold references to state.circles
+        state.circles[:] = [circle for circle in state.circles if id(circle) not in gone]
+
+    def _aggregate(self, engine, escapers: list[Circle], escape_distance: float, com: np.ndarray) -> None:
+        """Merge the escapers into the far-field body (created from the heaviest one if needed)."""
+        aggregate = None
+        if self.aggregate_number is not None:
+            aggregate = next((circle for circle in state.circles
+                              if circle.number == self.aggregate_number and not circle.suicide), None)
+        if aggregate is None:
+            # The heaviest escaper becomes the aggregate
+            aggregate = max(escapers, key=attrgetter("mass"))
+            escapers = [circle for circle in escapers if circle is not aggregate]
+            self.aggregate_number = aggregate.number
+
+        members = [aggregate] + escapers
+        mass = sum(circle.mass for circle in members)
+        x = sum(circle.x * circle.mass for circle in members) / mass
+        y = sum(circle.y * circle.mass for circle in members) / mass
+        vx = sum(circle.vx * circle.mass for circle in members) / mass
+        vy = sum(circle.vy * circle.mass for circle in members) / mass
+
+        # Escapers on opposite sides average out near the system: keep the mass far
+        dx, dy = x - com[0], y - com[1]
+        distance = sqrt(dx * dx + dy * dy)
+        if distance < escape_distance:
+            if distance == 0.0:
+                dx, dy, distance = vx, vy, sqrt(vx * vx + vy * vy) or 1.0
+            x = com[0] + dx / distance * escape_distance
+            y = com[1] + dy / distance * escape_distance
+
+        self._remove(escapers)
+        aggregate.mass = mass
+        aggregate.x, aggregate.y = float(x), float(y)
+        aggregate.vx, aggregate.vy = vx, vy
+        aggregate.speed = sqrt(vx * vx + vy * vy)
+        density = aggregate.density if aggregate.density > 0 else engine.default_density
+        aggregate.radius = ((3 * mass / density) / (4 * pi)) ** (1 / 3)
+        aggregate.surface = 4 * aggregate.radius ** 2 * pi
+        aggregate.volume = 4 / 3 * pi * aggregate.radius ** 3
+        # Teleported: no interpolation from the old position
+        aggregate.prev_x, aggregate.prev_y = aggregate.x, aggregate.y
+        aggregate.prev_vx, aggregate.prev_vy = vx, vy
+        aggregate.prev_radius = aggregate.radius
+        aggregate._interpolated_cache['alpha'] = -1.0
@@ -0,0 +1,306 @@
+"""
+Attraction-field heatmap.
+=========================
+
+Colors the background by the strength of the gravitational field a test
+mass would feel at each point of the screen: the field of every body, the
+selected body excepted (it shows what attracts the selected body).
+Evaluating it per pixel is out of reach, so FieldHeatmap:
+
+    1. samples the field on a coarse screen-space lattice (one point per
+       Engine.field_heatmap_cell_px pixels, ~3600 points on a 1280x720
+       screen with 16 px cells)
+    2. sums the contributions of the bodies with NumPy, in chunks of
+       CHUNK_PAIRS (lattice point, source) pairs, with a softening of half a
+       lattice cell (no singularity at a body)
+    3. beyond EXACT_PAIRS pairs (more than ~140 bodies), switches to a
+       particle-mesh evaluation: the bodies over the lattice (and a margin
+       around it) are spread on a mesh and convolved with the field kernel
+       by FFT; the bodies further away are aggregated into far-field
+       sources (mass and center of mass per world cell, cells growing with
+       the distance to the view, a Barnes-Hut style opening angle) and
+       summed directly
+    4. maps log10(|g|) between its 1st and 99th percentiles (at most
+       Engine.field_heatmap_decades decades) to a 256-entry colormap lookup
+       table, and upscales the lattice image to the screen with smoothscale
+
+The upscaled image is cached and blitted (with Engine.field_heatmap_opacity)
+every frame. It is recomputed only when the zoom, the screen size, the
+selection or the body count change, when the camera pans by more than
+Engine.field_heatmap_tolerance_px (smaller pans shift the cached image), or
+when a body moved by more than that on screen, at most
+Engine.field_heatmap_refresh_rate times per second.
+
+Usage:
+    from field_heatmap import FieldHeatmap
+
+    heatmap = FieldHeatmap()
+    heatmap.draw(engine.screen, frame, engine)   # in Engine.render_world, after the background
+"""
+
+import time
+from typing import Optional
+
+import numpy as np
+import pygame
+
+
+def _colormap(anchors: tuple, size: int = 256) -> np.ndarray:
+    """Lookup table (size, 3) of uint8 colors, linearly interpolated between evenly spaced anchors."""
+    anchors = np.asarray(anchors, dtype=np.float64)
+    positions = np.linspace(0.0, 1.0, len(anchors))
+    samples = np.linspace(0.0, 1.0, size)
+    return np.stack([np.interp(samples, positions, anchors[:, channel]) for channel in range(3)],
+                    axis=1).astype(np.uint8)
+
+
+class FieldHeatmap:
+    """
+    Cached, coarse-lattice heatmap of the gravitational field strength.
+    """
+
+    # Direct summation up to this many (lattice point, body) pairs, far-field aggregation beyond
+    EXACT_PAIRS = 500_000
+    # Pairs evaluated per NumPy chunk (bounds the temporary arrays to a few MB)
+    CHUNK_PAIRS = 250_000
+    # Far field: aggregation cells next to the view (lattice cells), then cell size / distance
+    AGGREGATE_CELLS = 2
+    OPENING_ANGLE = 0.5
+    # Particle mesh: extent around the lattice (fraction of its largest side)
+    MESH_MARGIN = 0.5
+    # Percentiles of log10(|g|) mapped to the top and (100 - it) to the bottom of the colormap
+    TOP_PERCENTILE = 99.0
+
+    # Colormap anchors (dark violet → orange → pale yellow), interpolated into LUT
+    _ANCHORS = ((0, 0, 4), (40, 11, 84), (101, 21, 110), (159, 42, 99),
+                (212, 72, 66), (245, 125, 21), (250, 193, 39), (252, 255, 164))
+    LUT = _colormap(_ANCHORS)
+
+    def __init__(self):
+        self.image: Optional[pygame.Surface] = None  # Upscaled heatmap (screen sized, opaque)
+        self._lattice: Optional[pygame.Surface] = None  # One pixel per lattice point
+        self._kernels: Optional[tuple] = None  # (lattice shape, kernel FFTs), see _kernel
+        self._key: Optional[tuple] = None  # (screen size, cell, zoom, selected, body count)
+        self._camera = (0.0, 0.0)  # Camera offset the image was computed for
+        self._x: Optional[np.ndarray] = None  # World positions the image was computed for
+        self._y: Optional[np.ndarray] = None
+        self._time = 0.0
+        self.computations = 0
+        self.last_sources = 0  # Sources (bodies or aggregated cells) of the last computation
+
+    def clear(self) -> None:
+        """Drop the cached image (recomputed on the next draw)."""
+        self._key = None
+
+    # ==================== CACHE ====================
+
+    def _outdated(self, frame, engine, key: tuple) -> bool:
+        """True if the cached image no longer matches the scene (see the module docstring)."""
+        if self.image is None or key != self._key:
+            return True
+        camera = engine.camera
+        tolerance = float(engine.field_heatmap_tolerance_px)
+        if max(abs(camera.cam_x - self._camera[0]), abs(camera.cam_y - self._camera[1])) > tolerance:
+            return True
+
+        # Bodies: rate-limited, then the largest on-screen displacement since the last computation
+        if time.perf_counter() - self._time < 1.0 / max(float(engine.field_heatmap_refresh_rate), 1e-3):
+            return False
+        if len(frame.x) == 0:
+            return False
+        moved = np.max(np.abs(frame.x - self._x) + np.abs(frame.y - self._y)) * camera.scale
+        return bool(moved > tolerance)
+
+    def draw(self, screen: pygame.Surface, frame, engine) -> None:
+        """
+        Blit the heatmap, recomputing it first if the scene changed beyond the thresholds.
+
+        Args:
+            screen: Target surface (drawn over the background, under the grid and bodies)
+            frame: FrameData of the current frame (interpolated world positions)
+            engine: Running engine (camera, gravity, heatmap settings)
+        """
+        cell = max(2, int(engine.setting("field_heatmap_cell_px")))
+        selected = np.flatnonzero(frame.selected)
+        key = (screen.get_size(), cell, engine.camera.scale,
+               int(selected[0]) if len(selected) else -1, len(frame.x))
+        if self._outdated(frame, engine, key):
+            self._compute(screen.get_size(), frame, engine, cell)
+            self._key = key
+
+        image = self.image
+        image.set_alpha(int(255 * min(max(float(engine.field_heatmap_opacity), 0.0), 1.0)))
+        # Small pans shift the cached image instead of recomputing it
+        offset = (round(engine.camera.cam_x - self._camera[0]), round(engine.camera.cam_y - self._camera[1]))
+        screen.blit(image, offset)
+
+    # ==================== COMPUTATION ====================
+
+    def _compute(self, size: tuple, frame, engine, cell: int) -> None:
+        """Evaluate the field on the lattice and rebuild the upscaled image."""
+        width, height = size
+        columns, rows = -(-width // cell), -(-height // cell)
+        camera = engine.camera
+        scale = camera.scale
+
+        # Lattice points at the center of each cell, in world coordinates
+        px = ((np.arange(columns) + 0.5) * cell - camera.cam_x) / scale
+        py = ((np.arange(rows) + 0.5) * cell - camera.cam_y) / scale
+        lattice_x = np.repeat(px, rows)  # Column-major: surfarray images are indexed [x, y]
+        lattice_y = np.tile(py, columns)
+
+        # Sources: every alive body but the selected one
+        keep = frame.alive & (frame.mass > 0) & ~frame.selected
+        sx, sy, mass = frame.x[keep], frame.y[keep], frame.mass[keep]
+        spacing = cell / scale  # Lattice spacing (world)
+        if len(mass) * len(lattice_x) <= FieldHeatmap.EXACT_PAIRS:
+            gx, gy = FieldHeatmap.field(lattice_x, lattice_y, sx, sy, mass, np.full(len(mass), 0.5 * spacing))
+            self.last_sources = len(mass)
+        else:
+            # Bodies over the lattice (and a margin): mass grid convolved by FFT; the others: aggregated far field
+            gx, gy, inside = self._mesh_field(sx, sy, mass, px[0], py[0], spacing, (columns, rows))
+            outside = ~inside
+            view = (px[0], px[-1], py[0], py[-1])
+            far = FieldHeatmap._aggregate(sx[outside], sy[outside], mass[outside], view,
+                                          FieldHeatmap.AGGREGATE_CELLS * spacing)
+            far_gx, far_gy = FieldHeatmap.field(lattice_x, lattice_y, *far)
+            gx += far_gx
+            gy += far_gy
+            self.last_sources = len(far[2])
+
+        strength = np.hypot(gx, gy) * abs(engine.gravity)
+        self._paint((columns, rows), strength, float(engine.field_heatmap_decades))
+        if self.image is None or self.image.get_size() != (columns * cell, rows * cell):
+            self.image = pygame.Surface((columns * cell, rows * cell))
+        pygame.transform.smoothscale(self._lattice, self.image.get_size(), self.image)
+
+        self._camera = (camera.cam_x, camera.cam_y)
+        self._x, self._y = frame.x.copy(), frame.y.copy()
+        self._time = time.perf_counter()
+        self.computations += 1
+
+    @staticmethod
+    def field(x: np.ndarray, y: np.ndarray, sx: np.ndarray, sy: np.ndarray,
+              mass: np.ndarray, softening: np.ndarray) -> tuple:
+        """
+        Σ m (s - p) / (|s - p|² + ε²)^(3/2) at each point p (multiply by G for the field).
+
+        Args:
+            x, y: Evaluation points
+            sx, sy, mass: Sources
+            softening: Softening length ε of each source
+
+        Returns:
+            (gx, gy) arrays, one value per point
+        """
+        gx, gy = np.zeros(len(x)), np.zeros(len(x))
+        if len(mass) == 0:
+            return gx, gy
+        soft2 = softening * softening
+        chunk = max(1, FieldHeatmap.CHUNK_PAIRS // len(mass))
+        for start in range(0, len(x), chunk):
+            dx = sx - x[start:start + chunk, None]
+            dy = sy - y[start:start + chunk, None]
+            r2 = dx * dx + dy * dy + soft2
+            weight = mass / (r2 * np.sqrt(r2))
+            gx[start:start + chunk] = (dx * weight).sum(axis=1)
+            gy[start:start + chunk] = (dy * weight).sum(axis=1)
+        return gx, gy
+
+    def _mesh_field(self, x: np.ndarray, y: np.ndarray, mass: np.ndarray, origin_x: float, origin_y: float,
+                    spacing: float, shape: tuple) -> tuple:
+        """
+        Field, on the lattice, of the bodies over the lattice extended by
+        MESH_MARGIN of its size on each side (the mesh).
+
+        Masses are spread over their four nearest mesh points (cloud in
+        cell), then convolved with the softened kernel (ε = half a lattice
+        cell) by FFT, on a grid padded to twice the mesh size (no
+        wrap-around). The kernel transform only depends on the mesh shape
+        and is cached.
+
+        Returns:
+            (gx, gy, inside): field on the lattice (flattened like the lattice
+            points) and the mask of the bodies that were deposited
+        """
+        margin = int(max(shape) * FieldHeatmap.MESH_MARGIN)
+        columns, rows = shape[0] + 2 * margin, shape[1] + 2 * margin
+        u = (x - origin_x) / spacing + margin
+        v = (y - origin_y) / spacing + margin
+        inside = (u >= 0) & (u < columns - 1) & (v >= 0) & (v < rows - 1)
+        u, v, m = u[inside], v[inside], mass[inside]
+        i, j = np.floor(u).astype(np.int64), np.floor(v).astype(np.int64)
+        fu, fv = u - i, v - j
+
+        padded = (2 * columns, 2 * rows)
+        grid = np.zeros(padded[0] * padded[1])
+        for di, dj, weight in ((0, 0, (1 - fu) * (1 - fv)), (1, 0, fu * (1 - fv)),
+                               (0, 1, (1 - fu) * fv), (1, 1, fu * fv)):
+            grid += np.bincount((i + di) * padded[1] + (j + dj), weights=m * weight, minlength=grid.size)
+        density = np.fft.rfft2(grid.reshape(padded))
+
+        kernel_x, kernel_y = self._kernel((columns, rows))
+        scale = 1.0 / (spacing * spacing)
+        lattice = (slice(margin, margin + shape[0]), slice(margin, margin + shape[1]))
+        gx = np.fft.irfft2(density * kernel_x, padded)[lattice].ravel() * scale
+        gy = np.fft.irfft2(density * kernel_y, padded)[lattice].ravel() * scale
+        return gx, gy, inside
+
+    def _kernel(self, shape: tuple) -> tuple:
+        """FFT of the softened field kernel -d / (|d|² + 1/4)^(3/2), in lattice units, for this mesh shape."""
+        if self._kernels is None or self._kernels[0] != shape:
+            columns, rows = shape
+            di = np.fft.fftfreq(2 * columns, 1.0 / (2 * columns))[:, None]  # Offsets in wrap-around order
+            dj = np.fft.fftfreq(2 * rows, 1.0 / (2 * rows))[None, :]
+            r2 = di * di + dj * dj + 0.25
+            inverse = 1.0 / (r2 * np.sqrt(r2))
+            self._kernels = (shape, np.fft.rfft2(-di * inverse), np.fft.rfft2(-dj * inverse))
+        return self._kernels[1], self._kernels[2]
+
+    @staticmethod
+    def _aggregate(x: np.ndarray, y: np.ndarray, mass: np.ndarray, view: tuple, size: float) -> tuple:
+        """
+        Merge the bodies into cells (mass, center of mass, softening of half a cell).
+
+        Cells are `size` wide next to the view and about OPENING_ANGLE times
+        their distance to it further away (sizes are powers of two of
+        `size`, so that cells of a level never straddle each other).
+
+        Returns:
+            (x, y, mass, softening) of the cells
+        """
+        left, right, top, bottom = view
+        center_x, center_y = (left + right) / 2, (top + bottom) / 2
+        distance = np.maximum(np.abs(x - center_x) - (right - left) / 2, np.abs(y - center_y) - (bottom - top) / 2)
+        ratio = np.maximum(distance * FieldHeatmap.OPENING_ANGLE / size, 1.0)
+        level = np.minimum(np.floor(np.log2(ratio)), 60).astype(np.int64)
+        cell = size * np.exp2(level)
+        # Cell indices relative to the view center stay small whatever the level
+        limit = (1 << 26) - 1
+        column = np.clip(np.floor((x - center_x) / cell), -limit, limit).astype(np.int64)
+        row = np.clip(np.floor((y - center_y) / cell), -limit, limit).astype(np.int64)
+        keys = (level << 54) + ((column + (1 << 26)) << 27) + (row + (1 << 26))
+        _, inverse = np.unique(keys, return_inverse=True)
+
+        total = np.bincount(inverse, weights=mass)
+        cx = np.bincount(inverse, weights=mass * x) / total
+        cy = np.bincount(inverse, weights=mass * y) / total
+        softening = np.bincount(inverse, weights=cell) / np.bincount(inverse) / 2
+        return cx, cy, total, softening
+
+    def _paint(self, shape: tuple, strength: np.ndarray, decades: float) -> None:
+        """Log-scale the field, map it through LUT and write it into the lattice surface."""
+        with np.errstate(divide="ignore"):
+            level = np.log10(strength)
+        finite = level[np.isfinite(level)]
+        if len(finite):
+            bottom, top = np.percentile(finite, (100.0 - FieldHeatmap.TOP_PERCENTILE, FieldHeatmap.TOP_PERCENTILE))
+        else:
+            bottom = top = 0.0
+        bottom = min(max(bottom, top - max(decades, 0.1)), top - 1e-3)
+        index = np.clip((np.nan_to_num(level, neginf=bottom) - bottom) / (top - bottom) * 255, 0, 255)
+        colors = FieldHeatmap.LUT[index.astype(np.intp)].reshape(shape + (3,))
+
+        if self._lattice is None or self._lattice.get_size() != shape:
+            self._lattice = pygame.Surface(shape)
+        pygame.surfarray.blit_array(self._lattice, colors)
@@ -0,0 +1,265 @@
+"""
+Per-frame preparation of the bodies for rendering.
+==================================================
+
+Interpolating, projecting and culling the bodies used to happen once per
+body and per consumer (drawing, visual collision check, lensing grid),
+each with its own Python loop. FrameData does it once per frame, for all
+bodies, with NumPy:
+
+    1. one pass gathers prev/current position and radius, mass, suicide flag
+    2. interpolation at alpha (world position and radius)
+    3. Camera transform (screen position and radius)
+    4. culling to the viewport (same margin as Circle.draw_interpolated)
+
+Consumers then read the arrays and the `visible` index set instead of
+re-deriving them per body.
+
+Level of detail: zoomed out, most bodies are smaller than a pixel. Below
+`splat_below` screen pixels, bodies are not drawn as circles but
+accumulated into a per-pixel density buffer (body count, or mass when
+mass-weighted), tone-mapped (log by default) and blended into the screen
+with a single surfarray write. The selected body is always a circle.
+
+Usage:
+    from frame import FrameData
+
+    frame = FrameData.build(engine, alpha)     # in Engine.render
+    if frame.has_visual_collision(): ...
+    frame.draw(screen, sprites)                 # visible bodies (see sprite_cache.py)
+    frame.draw(screen, sprites, splat_below=1.0)   # sub-pixel bodies as point splats
+"""
+
+from itertools import chain
+from operator import attrgetter
+from typing import Optional
+
+import numpy as np
+import pygame
+
+import state
+from circle import Circle
+from color import Display
+from sprite_cache import SpriteCache
+
+
+class FrameData:
+    """
+    Interpolated world / screen arrays of every body for one rendered frame.
+
+    Arrays are indexed like `bodies` (a copy of state.circles at build time).
+    """
+
+    # Culling margin around the viewport, in screen pixels (added to the screen radius)
+    CULL_MARGIN = 10
+
+    # Brightness of a pixel holding a single body under log tone mapping
+    SPLAT_MIN_INTENSITY = 0.35
+
+    # Candidate pairs tested per vectorized pass of the visual collision check (cache sized)
+    COLLISION_PAIRS_PER_PASS = 1 << 14
+    # Mean candidates per body along x above which the y axis is swept too
+    COLLISION_SWEEP_Y_ABOVE = 32
+
+    _FIELDS: tuple[str, ...] = ("prev_x", "x", "prev_y", "y", "prev_radius", "radius", "mass", "suicide",
+                                "is_selected")
+    _get_fields = attrgetter(*_FIELDS)
+
+    def __init__(self, bodies: list[Circle], alpha: float, camera, width: int, height: int):
+        """
+        Args:
+            bodies: Bodies to prepare (kept by reference, not copied)
+            alpha: Interpolation factor between the previous and current physics states
+            camera: Camera giving the world → screen transform
+            width, height: Viewport size in pixels
+        """
+        self.bodies = bodies
+        self.alpha = alpha
+        count = len(bodies)
+
+        width_fields = len(FrameData._FIELDS)
+        table = np.fromiter(chain.from_iterable(map(FrameData._get_fields, bodies)),
+                            np.float64, count * width_fields).reshape(count, width_fields)
+        prev_x, x, prev_y, y, prev_radius, radius, mass, suicide, selected = table.T
+
+        # World (interpolated)
+        self.x = prev_x + (x - prev_x) * alpha
+        self.y = prev_y + (y - prev_y) * alpha
+        self.radius = prev_radius + (radius - prev_radius) * alpha
+        self.physical_radius = radius  # Current (not interpolated) radius, used by collisions
+        self.mass = mass
+        self.alive = suicide == 0
+        self.selected = selected != 0
+
+        # Screen
+        scale = camera.scale
+        self.screen_x = self.x * scale + camera.cam_x
+        self.screen_y = self.y * scale + camera.cam_y
+        with np.errstate(invalid="ignore"):
+            self.screen_radius_exact = np.nan_to_num(self.radius * scale, nan=1.0, posinf=1.0, neginf=1.0)
+        self.screen_radius = np.maximum(1, self.screen_radius_exact.astype(np.int64))
+
+        # Culling
+        margin = self.screen_radius + FrameData.CULL_MARGIN
+        with np.errstate(invalid="ignore"):
+            inside = ((self.screen_x >= -margin) & (self.screen_x <= width + margin) &
+                      (self.screen_y >= -margin) & (self.screen_y <= height + margin))
+        self.visible = np.flatnonzero(inside)
+
+    @classmethod
+    def build(cls, engine, alpha: float) -> "FrameData":
+        """Prepare state.circles for the engine's camera and screen."""
+        width, height = engine.screen.get_size()
+        return cls(list(state.circles), alpha, engine.camera, width, height)
+
+    def __len__(self) -> int:
+        return len(self.bodies)
+
+    # ==================== CONSUMERS ====================
+
+    def draw(self, screen, sprites: Optional[SpriteCache] = None, splat_below: float = 0.0,
+             mass_weighted: bool = False, log_tone: bool = True) -> None:
+        """
+        Draw the visible bodies, in scene order.
+
+        Args:
+            screen: Target surface
+            sprites: Sprite cache: bodies up to SpriteCache.MAX_RADIUS are
+                blitted in batches (one Surface.blits call between two large
+                bodies) instead of drawn one by one
+            splat_below: Bodies with a smaller screen radius (px) are point
+                splats, drawn first (0 = every body is a circle)
+            mass_weighted: Splat brightness follows mass instead of body count
+            log_tone: Log tone mapping of the splat buffer (otherwise linear,
+                saturating at one body / the mean mass per pixel)
+        """
+        visible = self.visible
+        if splat_below > 0 and len(visible):
+            small = (self.screen_radius_exact[visible] < splat_below) & ~self.selected[visible]
+            self.splat(screen, visible[small], mass_weighted, log_tone)
+            visible = visible[~small]
+
+        bodies = self.bodies
+        items = zip(visible.tolist(),
+                    self.screen_x[visible].astype(np.int64).tolist(),
+                    self.screen_y[visible].astype(np.int64).tolist(),
+                    self.screen_radius[visible].tolist())
+        if sprites is None:
+            for i, sx, sy, radius in items:
+                bodies[i].draw_at(screen, sx, sy, radius)
+            return
+
+        max_radius = SpriteCache.MAX_RADIUS
+        get_sprite = sprites.get
+        batch = []
+        for i, sx, sy, radius in items:
+            body = bodies[i]
+            if radius > max_radius:
+                # Keep the drawing order: flush the sprites drawn below this body
+                screen.blits(batch, doreturn=False)
+                batch = []
+                body.draw_at(screen, sx, sy, radius)
+                continue
+            color, style = body.display_style()
+            sprite, half = get_sprite(radius, color.value, style)
+            batch.append((sprite, (sx - half, sy - half)))
+        screen.blits(batch, doreturn=False)
+
+    def splat(self, screen, indices: np.ndarray, mass_weighted: bool = False, log_tone: bool = True) -> None:
+        """
+        Accumulate bodies into a per-pixel buffer and blend it into the screen
+        (pixel = lerp(current color, body color, intensity)).
+        """
+        if len(indices) == 0:
+            return
+        width, height = screen.get_size()
+        px = self.screen_x[indices].astype(np.int64)
+        py = self.screen_y[indices].astype(np.int64)
+        on_screen = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        px, py = px[on_screen], py[on_screen]
+        if len(px) == 0:
+            return
+
+        weights = None
+        if mass_weighted:
+            mass = self.mass[indices][on_screen]
+            weights = mass / mass.mean()
+        density = np.bincount(px * height + py, weights=weights, minlength=width * height)
+        pixels = np.flatnonzero(density)
+        values = density[pixels]
+
+        if log_tone:
+            floor = FrameData.SPLAT_MIN_INTENSITY
+            top = np.log1p(values.max())
+            intensity = floor + (1.0 - floor) * np.log1p(values) / top if top > 0 else np.ones_like(values)
+            intensity = np.minimum(intensity, 1.0)
+        else:
+            intensity = np.minimum(values, 1.0)
+
+        color = np.array((Display.WHITE if state.engine.screen_mode == "dark" else Display.BLACK).rgb,
+                         dtype=np.float64)
+        # One locked view of the screen pixels, indexed [x, y, channel]
+        target = pygame.surfarray.pixels3d(screen)
+        try:
+            xs, ys = np.divmod(pixels, height)
+            current = target[xs, ys].astype(np.float64)
+            target[xs, ys] = (current + (color - current) * intensity[:, None]).astype(np.uint8)
+        finally:
+            del target
+
+    @staticmethod
+    def _sweep(lower: np.ndarray, upper: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sort the extents [lower, upper] of the bodies along one axis.
+
+        Returns:
+            (order, span): body i of the order overlaps the extents of the
+            bodies i+1 .. i+span[i] of the order, and of no later one
+        """
+        order = np.argsort(lower, kind="stable")
+        end = np.searchsorted(lower[order], upper[order], side="right")
+        return order, end - np.arange(len(order)) - 1
+
+    def has_visual_collision(self) -> bool:
+        """
+        True if two alive bodies overlap at their interpolated positions
+        (current radii). Sweep and prune along the axis where the extents
+        overlap least (bodies aligned along x are swept along y), then the
+        candidate pairs are tested in blocks of COLLISION_PAIRS_PER_PASS,
+        so the cost follows the number of candidate pairs, not the widest body.
+        """
+        alive = np.flatnonzero(self.alive)
+        if len(alive) < 2:
+            return False
+        x, y, radius = self.x[alive], self.y[alive], self.physical_radius[alive]
+
+        order, span = FrameData._sweep(x - radius, x + radius)
+        x, y, radius = x[order], y[order], radius[order]
+        # Nearest neighbors along x first: most overlaps are found by this single pass
+        i = np.flatnonzero(span > 0)
+        dx, dy, reach = x[i + 1] - x[i], y[i + 1] - y[i], radius[i] + radius[i + 1]
+        if np.any(dx * dx + dy * dy <= reach * reach):
+            return True
+        if span.sum() > FrameData.COLLISION_SWEEP_Y_ABOVE * len(span):
+            order_y, span_y = FrameData._sweep(y - radius, y + radius)
+            if span_y.sum() < span.sum():
+                x, y, radius, span = x[order_y], y[order_y], radius[order_y], span_y
+
+        # Blocks of consecutive bodies holding ~COLLISION_PAIRS_PER_PASS pairs (at least one body)
+        pairs_before = np.concatenate(([0], np.cumsum(span)))
+        start, count = 0, len(span)
+        while start < count:
+            stop = int(np.searchsorted(pairs_before, pairs_before[start] + FrameData.COLLISION_PAIRS_PER_PASS,
+                                       side="right")) - 1
+            stop = min(max(stop, start + 1), count)
+            spans, first = span[start:stop], pairs_before[start:stop] - pairs_before[start]
+            total = int(pairs_before[stop] - pairs_before[start])
+            if total:
+                # Pair k of body i is (i, i + 1 + rank of k among the pairs of i)
+                i = np.repeat(np.arange(start, stop), spans)
+                j = i + 1 + np.arange(total) - np.repeat(first, spans)
+                dx, dy, reach = x[j] - x[i], y[j] - y[i], radius[i] + radius[j]
+                if np.any(dx * dx + dy * dy <= reach * reach):
+                    return True
+            start = stop
+        return False
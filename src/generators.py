@@ -0,0 +1,340 @@
+"""
+Procedural initial conditions.
+==============================
+
+Seeded, vectorized generators of whole systems: every function draws all
+its bodies at once with NumPy and returns columns (x, y, vx, vy, mass,
+density) ready for BodyArrays.from_columns, so 10^5-10^6 bodies are
+generated in well under a second and inserted in bulk.
+
+The simulation is planar, so the 3D models are laid flat, not projected:
+the 3D radius and speed drawn from the model are used as the in-plane
+radius and speed, in a random direction of the plane (pressure supported
+models) or along circular orbits (rotating models). Such a system is
+close to, but not exactly in, equilibrium under the planar dynamics.
+
+Generators (name -> function, also usable as scenario directives, see
+scenario.py):
+    uniform        bodies spread over a rectangle (log-uniform masses)
+    plummer        Plummer sphere (Aarseth et al. 1974 velocity sampling)
+    disk           exponential disk in rotation equilibrium around a bulge
+    ring           Keplerian ring around a central mass
+    cold_collapse  uniform disk of bodies at rest
+    binaries       population of circular binaries
+
+Usage:
+    from generators import Generators
+
+    columns = Generators.plummer(100_000, center=(960, 540), radius=300, total_mass=1e10, seed=1)
+    Generators.spawn(engine, "disk")     # replaces the scene, sized to the view
+"""
+
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+import state
+from body_arrays import BodyArrays
+from logger import Logger
+
+G = 6.6743e-11
+
+
+class Generators:
+    """
+    Static vectorized generators of initial conditions.
+    """
+
+    DEFAULT_DENSITY = 5514.0
+
+    # Mass of a generated system of radius 400 m: ~0.5 s of real time per dynamical time
+    # at the default time acceleration. Scaled as radius**3 to keep that time scale.
+    REFERENCE_MASS = 1e10
+    REFERENCE_RADIUS = 400.0
+
+    # Min separation of a binary, in units of the sum of its two radii (no touching pairs)
+    BINARY_MIN_SEPARATION = 3.0
+
+    # ==================== HELPERS ====================
+
+    @staticmethod
+    def _columns(x, y, vx, vy, mass, density: float) -> dict[str, np.ndarray]:
+        return {
+            "x": np.asarray(x, dtype=np.float64),
+            "y": np.asarray(y, dtype=np.float64),
+            "vx": np.asarray(vx, dtype=np.float64),
+            "vy": np.asarray(vy, dtype=np.float64),
+            "mass": np.broadcast_to(np.asarray(mass, dtype=np.float64), np.shape(x)).copy(),
+            "density": np.full(np.shape(x), float(density)),
+        }
+
+    @staticmethod
+    def _check_count(count: int, minimum: int = 1) -> None:
+        if count < minimum:
+            raise ValueError(f"count must be >= {minimum} (got {count})")
+
+    @staticmethod
+    def _directions(count: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+        angle = rng.uniform(0.0, 2 * np.pi, count)
+        return np.cos(angle), np.sin(angle)
+
+    @staticmethod
+    def _concatenate(parts: list[dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+        return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+    # ==================== GENERATORS ====================
+
+    @staticmethod
+    def uniform(count: int, center=(0.0, 0.0), size=(1000.0, 1000.0), mass=(1e3, 1e7),
+                velocity: float = 0.0, density: float = DEFAULT_DENSITY, seed=None) -> dict[str, np.ndarray]:
+        """
+        Bodies spread uniformly over a rectangle.
+
+        Args:
+            count: Number of bodies
+            center: Center of the rectangle (m)
+            size: (width, height) of the rectangle (m)
+            mass: (min, max) mass, drawn log-uniformly (kg)
+            velocity: Max speed, random direction (m/s)
+            density: Density of every body (kg/m³)
+            seed: Seed or np.random.Generator
+        """
+        Generators._check_count(count)
+        rng = np.random.default_rng(seed)
+        (cx, cy), (width, height) = center, size
+        ux, uy = Generators._directions(count, rng)
+        speed = rng.uniform(0.0, velocity, count)
+        return Generators._columns(
+            cx + rng.uniform(-width / 2, width / 2, count),
+            cy + rng.uniform(-height / 2, height / 2, count),
+            speed * ux, speed * uy,
+            10 ** rng.uniform(np.log10(mass[0]), np.log10(mass[1]), count),
+            density,
+        )
+
+    @staticmethod
+    def plummer(count: int, center=(0.0, 0.0), radius: float = 400.0, total_mass: float = 1e10,
+                density: float = DEFAULT_DENSITY, max_radius: float = 5.0, seed=None) -> dict[str, np.ndarray]:
+        """
+        Plummer sphere laid in the plane (equal masses): radii and speeds of the 3D
+        model (Aarseth et al. 1974) used as in-plane radii and speeds, random directions.
+
+        Args:
+            radius: Plummer scale length a (m)
+            total_mass: Mass of the whole system (kg)
+            max_radius: Truncation radius in units of a (removes the few far outliers)
+        """
+        Generators._check_count(count)
+        rng = np.random.default_rng(seed)
+        # Radius from the inverse cumulative mass profile, truncated
+        u_max = max_radius ** 3 / (1 + max_radius ** 2) ** 1.5
+        u = rng.uniform(1e-10, u_max, count)
+        r = radius / np.sqrt(u ** (-2 / 3) - 1)
+
+        # Speed: q = v / v_escape with density g(q) = q² (1 - q²)^3.5, by vectorized rejection
+        q = np.empty(count)
+        todo = np.arange(count)
+        while len(todo):
+            candidates = rng.uniform(0.0, 1.0, len(todo))
+            accepted = rng.uniform(0.0, 0.1, len(todo)) < candidates ** 2 * (1 - candidates ** 2) ** 3.5
+            q[todo[accepted]] = candidates[accepted]
+            todo = todo[~accepted]
+        speed = q * np.sqrt(2 * G * total_mass / np.sqrt(r ** 2 + radius ** 2))
+
+        px, py = Generators._directions(count, rng)
+        ux, uy = Generators._directions(count, rng)
+        x, y = center[0] + r * px, center[1] + r * py
+        vx, vy = speed * ux, speed * uy
+        # Remove the sampling noise on the total momentum
+        return Generators._columns(x, y, vx - vx.mean(), vy - vy.mean(), total_mass / count, density)
+
+    @staticmethod
+    def disk(count: int, center=(0.0, 0.0), radius: float = 400.0, total_mass: float = 1e10,
+             bulge_fraction: float = 0.3, dispersion: float = 0.05, clockwise: bool = False,
+             density: float = DEFAULT_DENSITY, seed=None) -> dict[str, np.ndarray]:
+        """
+        Exponential disk (surface density ∝ exp(-R / Rd), Rd = radius / 4) on circular
+        orbits around a central bulge body.
+
+        Args:
+            radius: Truncation radius of the disk (m)
+            total_mass: Disk + bulge mass (kg)
+            bulge_fraction: Fraction of the mass in the central body
+            dispersion: Random velocity added, as a fraction of the local circular speed
+        """
+        Generators._check_count(count)
+        rng = np.random.default_rng(seed)
+        disk_count = max(count - 1, 0)
+        scale = radius / 4
+        # R * exp(-R / Rd) is a Gamma(2, Rd) distribution; redraw the few beyond the edge
+        r = rng.gamma(2.0, scale, disk_count)
+        outside = r > radius
+        while outside.any():
+            r[outside] = rng.gamma(2.0, scale, int(outside.sum()))
+            outside = r > radius
+        r = np.maximum(r, radius * 1e-3)
+
+        bulge_mass = total_mass * bulge_fraction
+        body_mass = (total_mass - bulge_mass) / max(disk_count, 1)
+        # Mass enclosed by each orbit (spherical approximation of the disk)
+        order = np.argsort(r)
+        enclosed = np.empty(disk_count)
+        enclosed[order] = np.arange(disk_count) * body_mass
+        circular = np.sqrt(G * (bulge_mass + enclosed) / r)
+
+        px, py = Generators._directions(disk_count, rng)
+        sign = -1.0 if clockwise else 1.0
+        vx = sign * -py * circular + rng.normal(0.0, dispersion, disk_count) * circular
+        vy = sign * px * circular + rng.normal(0.0, dispersion, disk_count) * circular
+
+        bulge = Generators._columns([center[0]], [center[1]], [0.0], [0.0], bulge_mass, density)
+        disk = Generators._columns(center[0] + r * px, center[1] + r * py, vx, vy, body_mass, density)
+        return Generators._concatenate([bulge, disk])
+
+    @staticmethod
+    def ring(count: int, center=(0.0, 0.0), radius: float = 400.0, width: float = 0.1,
+             central_mass: float = 1e10, ring_mass: float = 1e8,
+             density: float = DEFAULT_DENSITY, seed=None) -> dict[str, np.ndarray]:
+        """
+        Keplerian ring (circular orbits) around a central body.
+
+        Args:
+            radius: Mean radius of the ring (m)
+            width: Ring width as a fraction of the radius
+            central_mass: Mass of the central body (kg)
+            ring_mass: Total mass of the ring bodies (kg)
+        """
+        Generators._check_count(count)
+        rng = np.random.default_rng(seed)
+        ring_count = max(count - 1, 0)
+        r = radius * (1 + rng.uniform(-width / 2, width / 2, ring_count))
+        px, py = Generators._directions(ring_count, rng)
+        circular = np.sqrt(G * central_mass / r)
+
+        central = Generators._columns([center[0]], [center[1]], [0.0], [0.0], central_mass, density)
+        bodies = Generators._columns(center[0] + r * px, center[1] + r * py,
+                                     -py * circular, px * circular, ring_mass / max(ring_count, 1), density)
+        return Generators._concatenate([central, bodies])
+
+    @staticmethod
+    def cold_collapse(count: int, center=(0.0, 0.0), radius: float = 400.0, total_mass: float = 1e10,
+                      density: float = DEFAULT_DENSITY, seed=None) -> dict[str, np.ndarray]:
+        """Uniform disk of equal-mass bodies at rest (collapses under its own gravity)."""
+        Generators._check_count(count)
+        rng = np.random.default_rng(seed)
+        r = radius * np.sqrt(rng.uniform(0.0, 1.0, count))
+        px, py = Generators._directions(count, rng)
+        zeros = np.zeros(count)
+        return Generators._columns(center[0] + r * px, center[1] + r * py, zeros, zeros,
+                                   total_mass / count, density)
+
+    @staticmethod
+    def binaries(count: int, center=(0.0, 0.0), radius: float = 400.0, total_mass: float = 1e10,
+                 separation=(5.0, 40.0), density: float = DEFAULT_DENSITY, seed=None) -> dict[str, np.ndarray]:
+        """
+        Population of circular binaries (count // 2 pairs) spread uniformly over a disk.
+
+        Args:
+            separation: (min, max) separation of the pairs, drawn log-uniformly (m). Pairs whose
+                        bodies are too large for it are pushed apart (BINARY_MIN_SEPARATION),
+                        the range keeping its width
+        """
+        Generators._check_count(count, 2)
+        rng = np.random.default_rng(seed)
+        pairs = count // 2
+        r = radius * np.sqrt(rng.uniform(0.0, 1.0, pairs))
+        px, py = Generators._directions(pairs, rng)
+        cx, cy = center[0] + r * px, center[1] + r * py
+
+        # Pair mass log-uniform over a decade, mass ratio uniform in [0.1, 1]
+        pair_mass = 10 ** rng.uniform(0.0, 1.0, pairs)
+        pair_mass *= total_mass / pair_mass.sum()
+        ratio = rng.uniform(0.1, 1.0, pairs)
+        m1, m2 = pair_mass / (1 + ratio), pair_mass * ratio / (1 + ratio)
+        contact = BodyArrays.radius_from(m1, density) + BodyArrays.radius_from(m2, density)
+        low = np.maximum(separation[0], Generators.BINARY_MIN_SEPARATION * contact)
+        a = low * (separation[1] / separation[0]) ** rng.uniform(0.0, 1.0, pairs)
+
+        # Each star orbits the pair's center of mass on a circle, random phase
+        ux, uy = Generators._directions(pairs, rng)
+        relative_speed = np.sqrt(G * pair_mass / a)
+        r1, r2 = a * m2 / pair_mass, a * m1 / pair_mass
+        v1, v2 = relative_speed * m2 / pair_mass, relative_speed * m1 / pair_mass
+        first = Generators._columns(cx + r1 * ux, cy + r1 * uy, -uy * v1, ux * v1, m1, density)
+        second = Generators._columns(cx - r2 * ux, cy - r2 * uy, uy * v2, -ux * v2, m2, density)
+        return Generators._concatenate([first, second])
+
+    # Name -> generator (order of the O key cycle, uniform excluded)
+    REGISTRY: dict[str, Callable[..., dict[str, np.ndarray]]] = {
+        "plummer": plummer,
+        "disk": disk,
+        "ring": ring,
+        "cold_collapse": cold_collapse,
+        "binaries": binaries,
+        "uniform": uniform,
+    }
+    CYCLE: tuple[str, ...] = ("plummer", "disk", "ring", "cold_collapse", "binaries")
+
+    # ==================== SCENARIO DIRECTIVES ====================
+
+    @staticmethod
+    def from_directive(directive: dict[str, Any], rng: np.random.Generator) -> dict[str, np.ndarray]:
+        """
+        Run a scenario generator directive: {"type": name, "count": N, ...keyword arguments}.
+
+        Raises:
+            ValueError: on an unknown type or argument, or a count below the generator's minimum
+        """
+        arguments = {key: value for key, value in directive.items() if key not in ("type", "seed")}
+        generator = Generators.REGISTRY.get(directive.get("type"))
+        if generator is None:
+            raise ValueError(f"Unknown generator '{directive.get('type')}' (expected one of {sorted(Generators.REGISTRY)})")
+        try:
+            return generator(seed=rng, **arguments)
+        except TypeError as e:
+            raise ValueError(f"Invalid arguments for generator '{directive['type']}': {e}") from e
+
+    # ==================== ENGINE ====================
+
+    @staticmethod
+    def spawn(engine, name: str, count: Optional[int] = None, seed=None) -> int:
+        """
+        Replace the scene with a generated system centered in the view and sized to it.
+
+        Returns:
+            Number of bodies created
+        """
+        count = int(count or engine.generator_count)
+        width, height = engine.screen.get_size()
+        x0, y0 = engine.camera.screen_to_world(0, 0)
+        x1, y1 = engine.camera.screen_to_world(width, height)
+        center = ((x0 + x1) / 2, (y0 + y1) / 2)
+        radius = 0.4 * min(abs(x1 - x0), abs(y1 - y0))
+        mass = Generators.REFERENCE_MASS * (radius / Generators.REFERENCE_RADIUS) ** 3
+
+        if seed is None:
+            seed = int(engine.rng.getrandbits(32))
+        generator = Generators.REGISTRY[name]
+        if name == "ring":
+            columns = generator(count, center=center, radius=radius, central_mass=mass, ring_mass=mass / 100,
+                                density=engine.default_density, seed=seed)
+        elif name == "uniform":
+            # Log-uniform masses around the same total mass as the other systems
+            per_body = mass / max(count, 1)
+            columns = generator(count, center=center, size=(2 * radius, 2 * radius),
+                                mass=(per_body / 4, per_body * 4), density=engine.default_density, seed=seed)
+        else:
+            columns = generator(count, center=center, radius=radius, total_mass=mass,
+                                density=engine.default_density, seed=seed)
+
+        bodies = BodyArrays.from_columns(columns, keep_ids=False, keep_ages=False)
+        # Mutate in place: other modules hold references to state.circles
+        state.circles.clear()
+        state.circles.extend(bodies)
+        engine.history.clear()
+        if engine.rewind is not None:
+            engine.rewind.mark_dirty()
+        engine.temp_circle = None
+        engine.circle_selected = False
+        Logger.info(f"Generated '{name}': {len(bodies)} bodies (seed {seed}, radius {radius:.0f} m)")
+        return len(bodies)
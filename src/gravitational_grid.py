@@ -9,11 +9,20 @@
 from __future__ import annotations
 
 import math
-from typing import Any, List, Tuple
+from typing import Any, List, Optional, Tuple
 
+import numpy as np
 import pygame
 
 
+def _setting(engine: Any, name: str, default: Any) -> Any:
+    """Réglage de l'engine, tel qu'abaissé par le régulateur de qualité (voir quality.py)."""
+    overrides = getattr(getattr(engine, "quality", None), "overrides", {})
+    if name in overrides:
+        return overrides[name]
+    return getattr(engine, name, default)
+
+
 def _interpolated_xy(obj: Any, alpha: float) -> Tuple[float, float]:
     px = float(obj.prev_x) + (float(obj.x) - float(obj.prev_x)) * alpha
     py = float(obj.prev_y) + (float(obj.y) - float(obj.prev_y)) * alpha
@@ -60,6 +69,28 @@ def _gather_lens_sources(
     return sources
 
 
+def _frame_lens_sources(
+    engine: Any,
+    frame: Any,
+    visible_diagonal: float,
+) -> List[Tuple[float, float, float, float]]:
+    """
+    Même résultat que ``_gather_lens_sources``, calculé sur les tableaux déjà
+    interpolés de ``frame`` (voir frame.py) au lieu d'une boucle par corps.
+    """
+    keep = frame.alive & (frame.mass > 0)
+    rad = frame.physical_radius[keep]
+
+    diag = max(visible_diagonal, 1.0)
+    cfg_soft = float(getattr(engine, "grid_lens_softening_world", 0.0))
+    if cfg_soft > 0:
+        soft = np.maximum(np.maximum(rad * 0.5, cfg_soft), 1.0)
+    else:
+        soft = np.maximum(np.maximum(rad * 0.75, diag * 0.002), 8.0)
+
+    return list(zip(frame.x[keep].tolist(), frame.y[keep].tolist(), frame.mass[keep].tolist(), soft.tolist()))
+
+
 def _deflect(
     wx: float,
     wy: float,
@@ -145,8 +176,14 @@ def draw_gravitational_grid(
     engine: Any,
     alpha: float,
     circles: List[Any],
+    frame: Optional[Any] = None,
 ) -> None:
-    """Dessine la grille derrière les corps (appeler après le fond, avant les astres)."""
+    """
+    Dessine la grille derrière les corps (appeler après le fond, avant les astres).
+
+    Si ``frame`` (FrameData du rendu en cours) est fourni, les sources de la
+    lentille sont lues dans ses tableaux au lieu de réinterpoler ``circles``.
+    """
     if not getattr(engine, "gravitational_grid_enabled", False):
         return
 
@@ -184,7 +221,7 @@ def draw_gravitational_grid(
     rough_cell = target_px / scale
     cell_major = _nice_world_cell(rough_cell)
 
-    max_lines = int(getattr(engine, "grid_max_lines", 96))
+    max_lines = int(_setting(engine, "grid_max_lines", 96))
     n_vert = int((w_max - w_min) / cell_major) + 2
     n_horz = int((h_max - h_min) / cell_major) + 2
     if n_vert > max_lines or n_horz > max_lines:
@@ -207,7 +244,10 @@ def draw_gravitational_grid(
         half = max_lines // 2
         j0, j1 = mid - half, mid + half
 
-    sources = _gather_lens_sources(engine, alpha, circles, visible_diagonal)
+    if frame is not None:
+        sources = _frame_lens_sources(engine, frame, visible_diagonal)
+    else:
+        sources = _gather_lens_sources(engine, alpha, circles, visible_diagonal)
 
     dark = getattr(engine, "screen_mode", "dark") == "dark"
     if dark:
@@ -221,8 +261,9 @@ def draw_gravitational_grid(
     subdivide = major_px > float(getattr(engine, "grid_subdivide_px", 96.0))
     cell_minor = cell_major / 5.0 if subdivide else None
 
-    # Pas d'échantillonnage le long d'une ligne (monde) : ~8 px à l'écran
-    sample_world = max(8.0 / scale, cell_major * 0.08, 1.0)
+    # Pas d'échantillonnage le long d'une ligne (monde) : ~grid_sample_px (8) px à l'écran
+    sample_px = float(_setting(engine, "grid_sample_px", 8.0))
+    sample_world = max(sample_px / scale, cell_major * 0.08 * sample_px / 8.0, 1.0)
 
     def world_to_screen(wx: float, wy: float) -> Tuple[int, int]:
         px, py = _deflect(wx, wy, sources, engine, visible_diagonal, scale)
@@ -0,0 +1,147 @@
+"""
+Undo / redo of interactive edits.
+=================================
+
+Each edit (body deleted, body created, environment generated...) is
+stored as a small command holding frozen records (Circle.freeze) of the
+bodies it removed and added, nothing else: the untouched bodies of the
+scene are shared with the live state instead of being copied. Undo and
+redo cost one pass over state.circles plus the edited bodies, so they
+stay in the millisecond range in 50k-body scenes.
+
+Recording, undoing and redoing an edit all mark the rewind buffer dirty
+(see rewind.py): re-simulation must never cross an edit.
+
+Usage:
+    from history import EditHistory
+
+    engine.history.record("Delete body", removed=[(index, circle)])
+    engine.history.record("Generate environment", added=new_circles)
+    engine.history.undo()   # returns the label of the undone edit, or None
+    engine.history.redo()
+"""
+
+from collections import deque
+from typing import Optional
+
+import state
+from circle import Circle
+from logger import Logger
+
+
+class _Edit:
+    """One undoable edit: bodies removed (with their list index) and bodies added."""
+
+    __slots__ = ("label", "removed", "added")
+
+    def __init__(self, label: str, removed: list[tuple[int, dict]], added: list[dict]):
+        self.label = label
+        self.removed = removed
+        self.added = added
+
+
+class EditHistory:
+    """
+    Bounded undo / redo stacks of scene edits.
+    """
+
+    def __init__(self, max_depth: int = 100):
+        """
+        Args:
+            max_depth: Max number of undoable edits (oldest are forgotten)
+        """
+        self._undo: deque[_Edit] = deque(maxlen=max(1, int(max_depth)))
+        self._redo: list[_Edit] = []
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+
+    @staticmethod
+    def _scene_edited() -> None:
+        """Force a rewind keyframe before the next step (the edit may keep the body count)."""
+        engine = state.engine
+        if engine is not None and engine.rewind is not None:
+            engine.rewind.mark_dirty()
+
+    # ==================== RECORDING ====================
+
+    def record(self, label: str,
+               removed: Optional[list[tuple[int, Circle]]] = None,
+               added: Optional[list[Circle]] = None) -> None:
+        """
+        Store an edit that was just applied to state.circles.
+
+        Args:
+            label: Short description shown on undo / redo
+            removed: (index in state.circles before the edit, body) of every removed body
+            added: Bodies appended by the edit
+        """
+        edit = _Edit(
+            label,
+            sorted(((index, circle.freeze()) for index, circle in removed or ()), key=lambda item: item[0]),
+            [circle.freeze() for circle in added or ()],
+        )
+        self._undo.append(edit)
+        self._redo.clear()
+        self._scene_edited()
+
+    # ==================== UNDO / REDO ====================
+
+    @staticmethod
+    def _take(numbers: set[int]) -> list[tuple[int, dict]]:
+        """Remove bodies from state.circles by number, returning (index, record) of each one (ascending)."""
+        circles = state.circles
+        remaining = set(numbers)
+        taken = []
+        # Edited bodies are usually near the end (appended): scan backwards and stop early
+        for index in range(len(circles) - 1, -1, -1):
+            if not remaining:
+                break
+            number = circles[index].number
+            if number in remaining:
+                remaining.discard(number)
+                taken.append((index, circles[index].freeze()))
+                del circles[index]
+        taken.reverse()
+        return taken
+
+    @staticmethod
+    def _insert(removed: list[tuple[int, dict]]) -> None:
+        # Ascending indices: every body goes back where it was
+        for index, record in removed:
+            state.circles.insert(min(index, len(state.circles)), Circle.thaw(record))
+
+    def undo(self) -> Optional[str]:
+        """Revert the last edit. Returns its label, or None if there is nothing to undo."""
+        if not self._undo:
+            return None
+        edit = self._undo.pop()
+        # Keep the current state of the bodies taken out (redo brings them back as they are now;
+        # bodies fused away since the edit are gone for good)
+        edit.added = [record for _, record in self._take({record["number"] for record in edit.added})]
+        self._insert(edit.removed)
+        self._redo.append(edit)
+        self._scene_edited()
+        Logger.info(f"Undo: {edit.label}")
+        return edit.label
+
+    def redo(self) -> Optional[str]:
+        """Re-apply the last undone edit. Returns its label, or None if there is nothing to redo."""
+        if not self._redo:
+            return None
+        edit = self._redo.pop()
+        edit.removed = self._take({record["number"] for _, record in edit.removed})
+        state.circles.extend(Circle.thaw(record) for record in edit.added)
+        self._undo.append(edit)
+        self._scene_edited()
+        Logger.info(f"Redo: {edit.label}")
+        return edit.label
@@ -0,0 +1,187 @@
+"""
+Idle render throttling.
+=======================
+
+While the simulation is paused and nothing moves, the main loop used to
+clear and redraw every body, the lensing grid and the HUD at FPS_TARGET.
+IdleRenderer detects unchanged frames and stops doing that work:
+
+    - change detection: a full frame is drawn only when the scene
+      signature changed (camera, selection, body count, simulation time,
+      help overlay, panel visibility, rewind / replay position, window
+      size...) or an input / window event arrived; after an event, a few
+      more frames are drawn so that panel animations can settle
+    - dirty HUD regions: otherwise, the HUD is laid out without drawing
+      (empty clip) and only the texts that changed (FPS, expiring
+      notifications...) are redrawn, over a copy of the last world pass,
+      and pushed with pygame.display.update(rects)
+    - idle wait: the loop blocks on pygame.event.wait with a timeout
+      (Engine.idle_wait_ms, shortened to the next notification expiry)
+      instead of ticking at FPS_TARGET
+
+Idle means: Engine.idle_throttling set, simulation (or replay) paused, no
+body being created and no camera drag.
+
+Usage:
+    from idle import IdleRenderer
+
+    idle = IdleRenderer()
+    if idle.needs_render(engine, events):   # once per frame, before rendering
+        engine.render(alpha)                # captures the world pass while idle
+    else:
+        idle.redraw_hud(engine)
+    idle.wait(engine)                       # instead of clock.tick while idle
+"""
+
+import time
+from typing import Optional
+
+import pygame
+
+import state
+
+
+class IdleRenderer:
+    """
+    Dirty tracking of paused frames and idle event waiting.
+    """
+
+    # Full frames drawn after an event (panel hover / checkbox animations)
+    SETTLE_FRAMES = 30
+    # Beyond this many dirty HUD rectangles, their union is redrawn once
+    MAX_DIRTY_RECTS = 4
+
+    def __init__(self):
+        self.active = False  # Idle during the current frame
+        self.world: Optional[pygame.Surface] = None  # Copy of the last world pass (no HUD)
+        self._signature: Optional[tuple] = None
+        self._hud: Optional[list] = None  # HUD texts of the last drawn frame
+        self._settle = 0
+        self.skipped_frames = 0
+        self.partial_frames = 0
+
+    @staticmethod
+    def is_idle(engine) -> bool:
+        """Paused simulation (or replay) and no interaction in progress."""
+        if not engine.idle_throttling:
+            return False
+        paused = engine.is_paused if engine.replay is None else not engine.replay.playing
+        return (paused and not engine.mouse_down and engine.temp_circle is None
+                and not engine.camera.is_panning)
+
+    @staticmethod
+    def signature(engine) -> tuple:
+        """Everything the world pass depends on that can change without an event."""
+        camera = engine.camera
+        selected = next((circle.number for circle in state.circles if circle.is_selected), None)
+        panel = engine.config_panel
+        return (engine.screen.get_size(), camera.scale, camera.cam_x, camera.cam_y,
+                len(state.circles), selected, engine.simulation_time, engine.show_help,
+                engine.screen_mode, panel is not None and panel.visible,
+                engine.rewind.offset_steps if engine.rewind is not None else 0,
+                engine.replay.time if engine.replay is not None else None)
+
+    @staticmethod
+    def _wakes(engine, event: pygame.event.Event) -> bool:
+        """True if the event may change the picture (mouse motion only does over the panel)."""
+        if event.type == pygame.MOUSEMOTION:
+            panel = engine.config_panel
+            return (panel is not None and panel.visible) or engine.camera.is_panning
+        return True
+
+    # ==================== FRAME ====================
+
+    def needs_render(self, engine, events: list) -> bool:
+        """
+        Decide, once per frame, whether the frame must be fully rendered.
+
+        Args:
+            engine: Running engine
+            events: Events handled this frame
+        """
+        was_active = self.active
+        self.active = self.is_idle(engine)
+        if not self.active:
+            self.world = None
+            self._signature = None
+            self._settle = 0
+            return True
+
+        if any(self._wakes(engine, event) for event in events):
+            self._settle = self.SETTLE_FRAMES
+        signature = self.signature(engine)
+        changed = signature != self._signature
+        self._signature = signature
+
+        if self._settle:
+            self._settle -= 1
+            return True
+        return not was_active or changed or self.world is None or self._hud is None
+
+    def capture_world(self, screen: pygame.Surface) -> None:
+        """Keep a copy of the world pass (called by Engine.render before the HUD, while idle)."""
+        if not self.active:
+            return
+        if self.world is None or self.world.get_size() != screen.get_size():
+            self.world = screen.copy()
+        else:
+            self.world.blit(screen, (0, 0))
+
+    def capture_hud(self, engine) -> None:
+        """Keep the texts of the HUD just drawn (called by Engine.render after the HUD)."""
+        self._hud = engine.hud_record if self.active else None
+
+    def redraw_hud(self, engine) -> None:
+        """Redraw and present only the HUD texts that changed since the last frame."""
+        screen = engine.screen
+        # Layout pass: texts are recorded, nothing is drawn
+        screen.set_clip(pygame.Rect(0, 0, 0, 0))
+        try:
+            engine.render_hud()
+        finally:
+            screen.set_clip(None)
+        entries = engine.hud_record
+        previous = self._hud
+        if entries == previous:
+            self.skipped_frames += 1
+            return
+
+        # Entries are (text, color, rect): a text that moved, changed or vanished dirties its rectangles
+        dirty = ([entry[2] for entry in previous if entry not in entries] +
+                 [entry[2] for entry in entries if entry not in previous])
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+        if len(dirty) > self.MAX_DIRTY_RECTS:
+            dirty = [dirty[0].unionall(dirty[1:])]
+
+        # Texts can overlap: restore the world under each dirty rectangle and draw everything clipped to it
+        for rect in dirty:
+            screen.set_clip(rect)
+            try:
+                screen.blit(self.world, rect, rect)
+                engine.render_hud()
+                if engine.config_panel is not None:
+                    engine.config_panel.draw()
+            finally:
+                screen.set_clip(None)
+        self._hud = engine.hud_record
+        pygame.display.update(dirty)
+        self.partial_frames += 1
+
+    def wait(self, engine) -> None:
+        """
+        Block until an event arrives, Engine.idle_wait_ms elapses or the next
+        notification expires (the event is put back in the queue).
+        """
+        timeout = max(1, int(engine.idle_wait_ms))
+        now = time.time()
+        for text in engine.temp_texts:
+            remaining = text.birth_time + text.duration - now
+            timeout = min(timeout, max(1, int(remaining * 1000) + 1))
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
+
+    @property
+    def settling(self) -> bool:
+        """True while frames are still drawn at full rate after an event."""
+        return self._settle > 0
@@ -33,6 +33,18 @@
     Right click : Move the camera
     Mouse wheel (optional) : Zoom in and Zoom out
     B : Toggle gravitational lensing grid (background)
+    F5/F9 : Save simulation / Load last saved simulation
+    F8 : Import the newest .npz/.npy/.csv file of user_data/imports/
+    N : Load the next scenario preset
+    O : Generate the next procedural system (Plummer, disk, ring, cold collapse, binaries)
+    U : Cycle the escape policy (off, remove, freeze, aggregate)
+    X : Start/stop telemetry CSV export
+    L : Toggle orbit trails
+    F : Toggle the attraction-field heatmap
+    F6 : Start/stop trajectory recording
+    F7 : Replay the last recording / back to the simulation
+    , / . : Rewind / forward the recent history (pauses the simulation)
+    Ctrl+Z / Ctrl+Y : Undo / redo body creation, deletion and generation
 
 CONFIGURATION (in state.engine.__init__()) (Main parameters):
     time_acceleration     : Simulation speed (default: 4e6)
@@ -60,7 +72,7 @@
 
 
 # Required external modules for the simulation
-EXTERNAL_REQUIRED_MODULES: set[str] = {"pygame", "matplotlib"}
+EXTERNAL_REQUIRED_MODULES: set[str] = {"pygame", "matplotlib", "numpy"}
 
 for module in EXTERNAL_REQUIRED_MODULES:
     if importlib.util.find_spec(module) is None:
@@ -100,6 +112,21 @@
 from gravitational_grid import draw_gravitational_grid
 from atlas import FileManager
 from debugger import Debugger
+from telemetry import TelemetryExporter
+from trails import TrailBuffer
+from field_heatmap import FieldHeatmap
+from trajectory import TrajectoryRecorder
+from replay import ReplayPlayer
+from rewind import RewindBuffer
+from escape import EscapeMonitor
+from frame import FrameData
+from sprite_cache import SpriteCache
+from quality import QualityGovernor
+from idle import IdleRenderer
+from text_cache import TextCache
+from vectors import VectorOverlay
+from history import EditHistory
+from checkpoint import CheckpointManager
 
 # Référence globale attendue par Circle, TempText, ActionManager, Utils, etc.
 engine: Optional["Engine"] = None
@@ -112,11 +139,8 @@
     - add a focus mode
     - add a "define as referential button"
     - add collision epsilon
-    - add a color field which shows the attract field of the selected body
     - consider quadtree system for forces
     - mass transfer on collision without fusion
-    - add senarios in json
-    - add .csv export method
 
 For my NSI projects:
     - advanced data system with curves (choice between pygame and tkinter) [using matplotlib + tkinter in the same window]
@@ -134,9 +158,14 @@
 # class Engine
 # -----------------
 class Engine:
-    def __init__(self):
+    def __init__(self, headless: bool = False, seed: Optional[int] = None):
         """
         Initialize the Gravity Engine simulation.
+
+        Args:
+            headless: If True, no window is opened and rendering targets an
+                      offscreen surface (used by batch runs such as sweep.py)
+            seed: Seed of the engine random stream (None = seeded from the OS)
         
         Controls:
             - Space -> pause/unpause
@@ -174,21 +203,27 @@ def __init__(self):
         # ==================== DISPLAY SETTINGS ====================
         self.FULLSCREEN = True
         self.screen_mode: str = "dark"  # "dark" or "light"
+        self.headless = headless
+        self.headless_screen_size: tuple[int, int] = (1920, 1080)  # Virtual view used when headless
         
         WIDTH: int = 0
         HEIGHT: int = 0
         
         # Initialize screen
-        self.info = pygame.display.Info()
-        screen_size: tuple[int, int] = (self.info.current_w, self.info.current_h)
-        available_screen_modes: list[tuple[int, int]] = pygame.display.list_modes()
-        
-        if self.FULLSCREEN:
-            self.screen = pygame.display.set_mode(available_screen_modes[0], pygame.FULLSCREEN)
+        if self.headless:
+            # No window: everything is drawn on an offscreen surface
+            self.screen = pygame.Surface(self.headless_screen_size)
         else:
-            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        
-        pygame.display.set_caption(f'Gravity Engine {self.project_version} by {self.author_first_name} {self.author_last_name}')
+            self.info = pygame.display.Info()
+            screen_size: tuple[int, int] = (self.info.current_w, self.info.current_h)
+            available_screen_modes: list[tuple[int, int]] = pygame.display.list_modes()
+            
+            if self.FULLSCREEN:
+                self.screen = pygame.display.set_mode(available_screen_modes[0], pygame.FULLSCREEN)
+            else:
+                self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            
+            pygame.display.set_caption(f'Gravity Engine {self.project_version} by {self.author_first_name} {self.author_last_name}')
 
         # ==================== TIMESTEP SETTINGS ====================
         # FPS number targeted
@@ -219,8 +254,18 @@ def __init__(self):
         self.used_font = self.fm.resource_path('assets/fonts/main_font.ttf')
         self.txt_size = 30
         self.txt_gap: int = 15
-        self.font = pygame.font.Font(self.used_font, self.txt_size)
+        self.text_cache_size: int = 256  # Max cached text surfaces (LRU)
+        self.text = TextCache(capacity=self.text_cache_size)
+        self.font = self.text.font(self.used_font, self.txt_size)
         self.info_y: int = 20
+
+        # HUD layer (composited once, rebuilt at hud_refresh_rate or when its layout changes)
+        self.hud_refresh_rate: float = 10.0  # Rebuilds per second of the numeric fields
+        self.hud_layer: Optional[pygame.Surface] = None
+        self._hud_layer_record: list = []  # hud_record entries written into the layer
+        self._hud_layer_regions: list[pygame.Rect] = []  # Areas of the layer holding pixels (blitted each frame)
+        self._hud_layer_key: Optional[tuple] = None
+        self._hud_layer_time: float = 0.0
         
         # Temporary texts
         self.temp_texts: list[TempText] = []
@@ -245,12 +290,63 @@ def __init__(self):
         self.cardinal_vectors = False
         self.vectors_in_front = True
         self.vector_scale = 1
+        self.vector_arrowheads: bool = True  # Barbs at the end of the vectors (see VectorOverlay)
+        self.vector_antialiasing: bool = False  # Antialiased 1 px vectors (aalines)
+
+        # Orbit trails (fixed-memory ring buffer, see TrailBuffer)
+        self.trails: Optional[TrailBuffer] = None  # Created when trails are toggled on
+        self.trail_length: int = 240  # Points per trail
+        self.trail_max_bodies: int = 2048  # Bodies with a trail (slots)
+        self.trail_sample_every: int = 1  # Physics steps between two trail points (higher = longer trails)
+        self.trail_min_spacing_px: float = 2.0  # Decimation: min screen distance between drawn points
+
+        # Attraction-field heatmap (coarse lattice, cached, see FieldHeatmap)
+        self.field_heatmap_enabled: bool = False
+        self.field_heatmap_cell_px: int = 16  # Lattice spacing (screen pixels)
+        self.field_heatmap_opacity: float = 0.6
+        self.field_heatmap_decades: float = 4.0  # Max field range shown (log10 decades)
+        self.field_heatmap_tolerance_px: float = 4.0  # Camera / body motion before a recomputation
+        self.field_heatmap_refresh_rate: float = 15.0  # Max recomputations per second for moving bodies
+        self.field_heatmap = FieldHeatmap()
+
+        # Bodies are blitted from pre-rendered sprites (see SpriteCache)
+        self.sprite_cache_size: int = 512  # Max cached sprites (LRU)
+        self.sprite_antialiasing: bool = False  # Smooth body edges
+        self.sprites = SpriteCache(capacity=self.sprite_cache_size, antialias=self.sprite_antialiasing)
+        # Render scale: the world is drawn at this fraction of the screen size, then upscaled
+        self.render_scale: float = 1.0  # 0.25 to 1 (1 = native resolution)
+        self.render_scale_dynamic: bool = False  # Lower the scale while frames overrun their budget
+        self.render_scale_min: float = 0.5  # Lowest dynamic scale
+        self.render_scale_smooth: bool = True  # Bilinear upscaling (smoothscale), else nearest (~4x cheaper)
+        self.render_scale_current: float = 1.0  # Scale in use in dynamic mode
+        self.world_layer: Optional[pygame.Surface] = None  # Offscreen world surface (render scale < 1)
+        self._busy_time_average: float = 0.0
+
+        # Adaptive quality: degrade the rendering to hold the frame budget (see QualityGovernor)
+        self.quality_governor: bool = False
+        self.quality_degrade_ratio: float = 0.95  # Degrade above this fraction of the frame budget...
+        self.quality_degrade_frames: int = 10  # ...for this many consecutive frames
+        self.quality_restore_ratio: float = 0.7  # Restore below this fraction of the frame budget...
+        self.quality_restore_frames: int = 60  # ...for this many consecutive frames
+        self.quality = QualityGovernor()
+
+        # Idle throttling (paused and unchanged frames are not redrawn, see IdleRenderer)
+        self.idle_throttling: bool = True
+        self.idle_wait_ms: int = 250  # Max time blocked waiting for an event while idle
+        self.idle = IdleRenderer()
+        self.hud_record: list = []  # (text, color, rect) written by the last HUD pass
+
+        # Level of detail: smaller bodies are point splats in a density buffer (see FrameData.splat)
+        self.lod_splat_radius: float = 1.0  # Screen radius (px) below which bodies are splatted, 0 = off
+        self.lod_mass_weighted: bool = False  # Splat brightness from mass instead of body count
+        self.lod_log_tone: bool = True  # Log tone mapping of the splat buffer
 
         # Grille de fond (lentille gravitationnelle, infinie, sensible à la caméra)
         self.gravitational_grid_enabled: bool = False
         self.grid_lens_amount: float = 3.5  # intensité de la déformation (0 = pas d'effet)
         self.grid_target_spacing_px: float = 72.0  # espacement cible à l'écran (px)
         self.grid_max_lines: int = 64
+        self.grid_sample_px: float = 8.0  # pas d'échantillonnage le long d'une ligne (px écran)
         self.grid_subdivide_px: float = 96.0  # au-delà, sous-grille 1/5 du pas majeur
         self.grid_lens_softening_world: float = 0.0  # 0 = auto (rayon + fraction de la vue)
         # When enabled, each fixed physics step can be subdivided into
@@ -262,9 +358,15 @@ def __init__(self):
 
         # ==================== RENDERING STATE ====================
         self.current_alpha = 1.0  # Current interpolation alpha (for selection)
+        self.frame: Optional[FrameData] = None  # Bodies interpolated / projected / culled for the last rendered frame
         
         # ==================== RANDOM GENERATION SETTINGS ====================
         self.random_mode = False
+
+        # Engine-owned random stream (never the global `random` module), so that
+        # every run can be reproduced from its seed and parallel runs stay independent
+        self.random_seed: Optional[int] = seed
+        self.rng = random.Random(seed)
         
         # Define max random energy in Joules
         self.random_energy_per_kg = 1e-8  # J/kg
@@ -273,7 +375,47 @@ def __init__(self):
         self.random_mass_field = 1e7  # (for camera.scale = 1.0)
 
         self.random_environment_number: int = 20
-        
+
+        # ==================== SCENARIOS ====================
+        self.scenario_index: int = -1  # Last preset loaded with N (see ScenarioLoader.presets)
+        self.scenario_name: Optional[str] = None
+        self.generator_index: int = -1  # Last system generated with O (see Generators.CYCLE)
+        self.generator_count: int = 2000  # Bodies per generated system
+        
+        # ==================== DATA EXPORT SETTINGS ====================
+        self.telemetry: Optional[TelemetryExporter] = None  # Created when export is toggled on
+        self.telemetry_sample_every: int = 10  # Physics steps between two samples
+        self.telemetry_policy: str = "drop_oldest"  # See TelemetryExporter.POLICIES
+        self.trajectory_recorder: Optional[TrajectoryRecorder] = None  # Created when recording is toggled on
+        self.recording_sample_every: int = 1  # Physics steps between two recorded frames
+        self.recording_codec: str = "zlib"  # "raw" (float64, no loss), "zlib" or "lzma" (see StateCodec)
+        self.recording_compression_level: int = 6  # zlib 1-9 / lzma 0-9
+        self.recording_position_error: float = 1e-3  # Max error on recorded positions (m)
+        self.recording_velocity_error: float = 1e-7  # Max error on recorded velocities (m/s)
+        self.recording_tolerance: float = 0.0  # Decimation: max linear prediction error (m), 0 = off
+        self.recording_background_every: int = 1  # Max frames between two samples of a body out of view
+        self.recording_region_of_interest: bool = True  # Selected body + bodies in view at full rate
+        self.replay: Optional[ReplayPlayer] = None  # Set while a recording is played back (physics off)
+
+        # ==================== REWIND SETTINGS ====================
+        self.rewind_memory_mb: float = 64  # Hard memory budget of the rewind history
+        self.rewind_scrub_steps: int = 30  # Physics steps per rewind key press
+        self.rewind: Optional[RewindBuffer] = RewindBuffer(budget_bytes=int(self.rewind_memory_mb * 2 ** 20))
+
+        # ==================== ESCAPE SETTINGS ====================
+        self.escape_policy: str = "off"  # "off", "remove", "freeze" or "aggregate" (see EscapeMonitor.POLICIES)
+        self.escape_distance_factor: float = 10.0  # Escape distance, in half-mass radii of the system
+        self.escape_check_every: int = 60  # Physics steps between two escape checks
+        self.escape = EscapeMonitor()
+
+        # ==================== UNDO / REDO ====================
+        self.undo_depth: int = 100  # Max number of undoable edits
+        self.history = EditHistory(max_depth=self.undo_depth)
+
+        # ==================== AUTOSAVE ====================
+        self.checkpoint_interval: float = 60.0  # Wall-clock seconds between two checkpoints (0 = disabled)
+        self.checkpoints = CheckpointManager(self.fm, interval=self.checkpoint_interval)
+
         # ==================== AUDIO SETTINGS ====================
         self.music = False
         self.music_volume = 1
@@ -394,6 +536,8 @@ def pause(self):
         """
         if not self.is_paused:
             self._pause_wall_clock_start = time.time()
+            if self.rewind is not None:
+                self.rewind.on_pause(self)
         self.is_paused = True
 
     def unpause(self):
@@ -406,6 +550,8 @@ def unpause(self):
         if self._pause_wall_clock_start is not None:
             self.simulation_time_in_pause += time.time() - self._pause_wall_clock_start
             self._pause_wall_clock_start = None
+        if self.rewind is not None:
+            self.rewind.on_resume(self)
         self.is_paused = False
 
     def net_simulation_time(self) -> float:
@@ -492,13 +638,44 @@ def print_global_info(self, y):
                           self.screen.get_height() - 20 - 3 * self.txt_size - 2 * self.txt_gap), Display.BLUE, 0)
 
         # Display pause status (bottom right)
-        if self.is_paused:
+        if self.replay is not None:
+            text = self.replay.status()
+        elif self.is_paused and self.rewind is not None and self.rewind.offset_steps:
+            text = f"Pause : Enabled (rewind -{self.rewind.offset_seconds() * self.time_acceleration:.2e} s)"
+        elif self.is_paused:
             text = f"Pause : Enabled"
         else:
             text = f"Pause : Disabled"
         Utils.write_screen(text, (self.screen.get_width() - 20 - (self.font.size(text)[0]),
                           self.screen.get_height() - 20 - self.txt_size), Display.BLUE, 0)
 
+        # Display telemetry export status (bottom right, above the zoom)
+        if self.telemetry is not None and self.telemetry.running:
+            text = f"Telemetry : {self.telemetry.written_rows} rows ({self.telemetry.dropped_rows} dropped)"
+            Utils.write_screen(text, (self.screen.get_width() - 20 - (self.font.size(text)[0]),
+                              self.screen.get_height() - 20 - 4 * self.txt_size - 3 * self.txt_gap), Display.BLUE, 0)
+
+        # Display trajectory recording status (bottom right, above the telemetry)
+        if self.trajectory_recorder is not None:
+            recorder = self.trajectory_recorder
+            text = f"Recording : {recorder.frames_recorded} frames ({recorder.bytes_written / 1e6:.1f} MB)"
+            if recorder.sampler is not None:
+                text += f", {recorder.sampler.kept_ratio:.0%} of samples kept"
+            Utils.write_screen(text, (self.screen.get_width() - 20 - (self.font.size(text)[0]),
+                              self.screen.get_height() - 20 - 5 * self.txt_size - 4 * self.txt_gap), Display.RED, 0)
+
+        # Display escape policy counters (bottom right, above the recording)
+        if self.escape_policy != "off" or self.escape.total:
+            text = f"Escapes ({self.escape_policy}) : {self.escape.describe()}"
+            Utils.write_screen(text, (self.screen.get_width() - 20 - (self.font.size(text)[0]),
+                              self.screen.get_height() - 20 - 6 * self.txt_size - 5 * self.txt_gap), Display.BLUE, 0)
+
+        # Display adaptive quality level (bottom right, above the escapes)
+        if self.quality.level:
+            text = f"Quality : {self.quality.describe()}"
+            Utils.write_screen(text, (self.screen.get_width() - 20 - (self.font.size(text)[0]),
+                              self.screen.get_height() - 20 - 7 * self.txt_size - 6 * self.txt_gap), Display.RED, 0)
+
         # Display body count (top left)
         text = f"Number of bodies : {len(state.circles)}"
         Utils.write_screen(text, (20, y), Display.BLUE, 0)
@@ -533,6 +710,10 @@ def print_global_info(self, y):
 
         # Display FPS (bottom center)
         text = f"FPS : {round(self.displayed_FPS)}"
+        if self.effective_render_scale() < 1.0:
+            text += f" (render {self.effective_render_scale():.0%})"
+        if self.idle.active:
+            text += " (idle)"
         Utils.write_screen(text, (int((self.screen.get_width() / 2) - (self.font.size(text)[0] / 2)),
                           int(self.screen.get_height() - 20 - state.engine.txt_size)), Display.BLUE, 0)
 
@@ -545,8 +726,8 @@ def show_help_overlay(self):
         
         Uses Utils.write_screen() for consistent text rendering with smaller font size.
         """
-        # Create semi-transparent overlay
-        self.screen.fill((20, 20, 20, 200))
+        # Cover the world
+        self.screen.fill((20, 20, 20, 255))
         
         # ===== SAVE CURRENT FONT AND CREATE SMALLER FONT =====
         original_font = self.font
@@ -555,7 +736,7 @@ def show_help_overlay(self):
         
         self.txt_size = 20  # Smaller text for help overlay
         self.txt_gap = 5    # Smaller gap for compact display
-        self.font = pygame.font.Font(self.used_font, self.txt_size)
+        self.font = self.text.font(self.used_font, self.txt_size)
         
         # Calculate positions
         center_x = self.screen.get_width() // 2
@@ -567,8 +748,7 @@ def show_help_overlay(self):
         
         # ===== TITLE =====
         title = "GRAVITY ENGINE - CONTROLS GUIDE"
-        title_font = pygame.font.Font(self.used_font, 32)
-        title_surface = title_font.render(title, True, Display.DUCKY_GREEN)
+        title_surface = self.text.render(title, self.text.font(self.used_font, 32), Display.DUCKY_GREEN)
         title_rect = title_surface.get_rect(center=(center_x, start_y))
         self.screen.blit(title_surface, title_rect)
         
@@ -603,7 +783,20 @@ def show_help_overlay(self):
                     ("G", "Toggle reversed gravity (repulsion)"),
                     ("P", f"Generate random environment ({self.random_environment_number} bodies, zoom-adaptive)"),
                     ("S", "Take a screenshot"), ("", f"Saved in {self.screenshots_folder_path}"),
+                    (", / .", "Rewind / forward the recent history (pauses)"),
+                    ("F5 / F9", "Save simulation / Load last saved simulation"),
+                    ("F8", "Import bodies from the newest file in imports/ (.npz / .npy / .csv)"),
+                    ("N", "Load the next scenario preset (assets/scenarios/, then scenarios/)"),
+                    ("O", "Generate the next system: Plummer, disk, ring, cold collapse, binaries"),
+                    ("U", "Cycle the escape policy for unbound bodies: off, remove, freeze, aggregate"),
+                    ("L", "Toggle orbit trails"),
+                    ("F", "Toggle the attraction-field heatmap (field felt by the selected body)"),
+                    ("X", "Start / stop telemetry CSV export"),
+                    ("F6", "Start / stop trajectory recording"),
+                    ("F7", "Replay the last recording / back to the simulation"),
+                    ("", "Replay: Space play/pause, , . scrub, [ ] speed, Backspace reverse"),
                     ("Delete", "Delete selected body"),
+                    ("Ctrl+Z / Ctrl+Y", "Undo / redo body creation, deletion and generation"),
                     ("H / I", "Toggle this help overlay"),
                     ("C", "Toggle the config panel"),
                     ("Escape/Alt+F4", "Exit program"),
@@ -634,15 +827,15 @@ def show_help_overlay(self):
                     continue
                 
                 # Key (green, left column)
-                key_surface = self.font.render(key, True, Display.DUCKY_GREEN)
+                key_surface = self.text.render(key, self.font, Display.DUCKY_GREEN)
                 self.screen.blit(key_surface, (key_col_x, y_pos))
                 
                 # Separator arrow (grey)
-                sep_surface = self.font.render("→", True, Display.DARK_GREY)
+                sep_surface = self.text.render("→", self.font, Display.DARK_GREY)
                 self.screen.blit(sep_surface, (sep_col_x, y_pos))
                 
                 # Description (white, right column)
-                desc_surface = self.font.render(description, True, Display.WHITE)
+                desc_surface = self.text.render(description, self.font, Display.WHITE)
                 self.screen.blit(desc_surface, (desc_col_x, y_pos))
             
             # Spacing between sections
@@ -702,16 +895,17 @@ def generate_environment(self, count: int = 50, temptext: bool = False):
         max_mass = self.random_mass_field * mass_multiplier
         
         # ===== GENERATE BODIES =====
+        generated = []
         for _ in range(count):
             # Random position in the visible world space
-            world_x = random.uniform(world_x_min, world_x_max)
-            world_y = random.uniform(world_y_min, world_y_max)
+            world_x = self.rng.uniform(world_x_min, world_x_max)
+            world_y = self.rng.uniform(world_y_min, world_y_max)
             
             # Random mass adapted to the zoom
             # Masse selon distribution logarithmique
             log_min = log10(min_mass)
             log_max = log10(max_mass)
-            log_mass = random.uniform(log_min, log_max)
+            log_mass = self.rng.uniform(log_min, log_max)
             mass = 10 ** log_mass
             
             new = Circle(
@@ -721,6 +915,8 @@ def generate_environment(self, count: int = 50, temptext: bool = False):
                 mass=mass
             )
             state.circles.append(new)
+            generated.append(new)
+        self.history.record("Generate environment", added=generated)
         
         # ===== USER FEEDBACK =====
         if temptext:
@@ -796,6 +992,14 @@ def physics_step(self, dt):
         Args:
             dt: Fixed timestep duration (always self.physics_timestep)
         """
+        # Escape policy first: its edits are then covered by the rewind keyframe
+        if self.escape is not None:
+            self.escape.on_physics_step(self)
+
+        # Rewind history: keyframe if needed + this step's delta
+        if self.rewind is not None:
+            self.rewind.before_step(self, dt)
+
         # Simulated duration (including time acceleration factor)
         dt_sim = dt * self.time_acceleration
         # Remove bodies marked for deletion (after fusion)
@@ -803,10 +1007,13 @@ def physics_step(self, dt):
         for circle in circles_to_remove:
             state.circles.remove(circle)
         
+        # Frozen bodies (escape policy) neither attract nor move
+        active = [circle for circle in state.circles if not circle.escaped_frozen]
+
         # Calculate gravitational forces between all body pairs
-        for circle in state.circles:
+        for circle in active:
             circle.attract_forces.clear()  # Reset force list
-            for other_circle in state.circles:
+            for other_circle in active:
                 if circle != other_circle:
                     # Calculate and store attraction force
                     circle.attract_forces.append(circle.attract(other_circle))
@@ -814,12 +1021,22 @@ def physics_step(self, dt):
                     circle.update_fusion(other_circle, dt_sim)
         
         # Update all bodies (position, velocity, age, etc.)
-        for circle in state.circles:
+        for circle in active:
             circle.physics_update(dt)
 
         # IMPORTANT: Increment simulation time
         self.simulation_time += dt
 
+        # Data export hooks (sampling only, disk I/O happens on background threads)
+        if self.telemetry is not None:
+            self.telemetry.on_physics_step(self)
+        if self.trajectory_recorder is not None:
+            self.trajectory_recorder.on_physics_step(self)
+        if self.trails is not None:
+            self.trails.on_physics_step(self)
+        if self.rewind is not None:
+            self.rewind.after_step(self)
+
     def physics_step_with_substeps(self, dt: float) -> None:
         """
         Execute a physics step, optionally subdivided into adaptive substeps.
@@ -837,7 +1054,7 @@ def physics_step_with_substeps(self, dt: float) -> None:
         max_ratio = 0.0
         if len(state.circles) > 0:
             for c in state.circles:
-                if c.radius <= 0:
+                if c.radius <= 0 or c.escaped_frozen:
                     continue
                 # Speed already computed (m/s) or recomputed if missing
                 speed = getattr(c, "speed", sqrt(c.vx ** 2 + c.vy ** 2))
@@ -866,24 +1083,98 @@ def render(self, alpha):
         
         Uses interpolation between previous and current physics states
         to ensure smooth rendering even when physics runs at fixed timestep.
+
+        Below a render scale of 1, the world (grid, vectors, bodies) is drawn
+        to an offscreen layer of that fraction of the screen size, with the
+        camera scaled to it, then upscaled (smoothscale, or nearest-neighbor
+        scale). The HUD is always drawn at native resolution.
         
         Args:
             alpha: Interpolation factor (0 to 1) between physics states
                 0 = exactly at previous state
                 1 = exactly at current state
         """
-        if self.use_interpolation and self._check_visual_collisions(alpha):
+        start = time.perf_counter()
+        scale = self.effective_render_scale()
+        if scale >= 1.0:
+            self.render_world(alpha)
+        else:
+            screen, camera = self.screen, self.camera
+            width, height = screen.get_size()
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            if self.world_layer is None or self.world_layer.get_size() != size:
+                self.world_layer = pygame.Surface(size, 0, screen)
+
+            # Every world drawing targets state.engine.screen through the camera:
+            # point both at the layer for the duration of the world pass
+            saved_camera = (camera.scale, camera.cam_x, camera.cam_y)
+            self.screen = self.world_layer
+            camera.scale, camera.cam_x, camera.cam_y = (value * scale for value in saved_camera)
+            try:
+                self.render_world(alpha)
+            finally:
+                self.screen = screen
+                camera.scale, camera.cam_x, camera.cam_y = saved_camera
+            upscale = pygame.transform.smoothscale if self.render_scale_smooth else pygame.transform.scale
+            upscale(self.world_layer, (width, height), screen)
+
+        hud_start = time.perf_counter()
+        self.quality.record("world", hud_start - start)
+        self.idle.capture_world(self.screen)
+        self.render_hud()
+        self.idle.capture_hud(self)
+        self.quality.record("hud", time.perf_counter() - hud_start)
+
+    def setting(self, name: str):
+        """Value of a rendering setting, as lowered by the quality governor if it is active."""
+        return self.quality.overrides.get(name, getattr(self, name))
+
+    def effective_render_scale(self) -> float:
+        """Render scale of the world layer: the setting, or its dynamic value (0.25 to 1)."""
+        scale = self.render_scale_current if self.render_scale_dynamic else self.render_scale
+        scale = min(scale, self.setting("render_scale"))  # Quality governor
+        return min(1.0, max(0.25, float(scale)))
+
+    def update_render_scale(self, busy_time: float) -> None:
+        """
+        Dynamic render scale: lower it while frames overrun their budget,
+        raise it back (up to render_scale) once there is room again.
+
+        Args:
+            busy_time: Time spent on the last frame before waiting for the next one (s)
+        """
+        if not self.render_scale_dynamic:
+            self.render_scale_current = self.render_scale
+            return
+        budget = 1.0 / self.FPS_TARGET
+        self._busy_time_average += (busy_time - self._busy_time_average) * 0.1
+        # Dead band between the two thresholds: no oscillation around the budget
+        if self._busy_time_average > 0.95 * budget:
+            self.render_scale_current = max(self.render_scale_min, self.render_scale_current - 0.02)
+        elif self._busy_time_average < 0.7 * budget:
+            self.render_scale_current = min(self.render_scale, self.render_scale_current + 0.02)
+
+    def render_world(self, alpha):
+        """
+        Draw the world: background, field heatmap, lensing grid, trails, vectors and bodies.
+
+        Args:
+            alpha: Interpolation factor (0 to 1) between physics states
+        """
+        # Clear screen
+        if self.screen_mode == "dark":
+            self.screen.fill(Display.BLACK)
+        else:
+            self.screen.fill(Display.WHITE)
+
+        # Interpolate, project and cull every body once for all the consumers below
+        frame = FrameData.build(self, alpha)
+
+        if self.use_interpolation and self.replay is None and frame.has_visual_collision():
             # Visual collision detected!
         
-            # STEP 1: Save the current VISUAL positions
-            for circle in state.circles:
-                # Position where the body is CURRENTLY visually displayed
-                visual_x = circle.prev_x + (circle.x - circle.prev_x) * alpha
-                visual_y = circle.prev_y + (circle.y - circle.prev_y) * alpha
-                
-                # Temporarily store
-                circle._visual_x = visual_x
-                circle._visual_y = visual_y
+            # STEP 1: Save the current VISUAL positions (where the bodies are CURRENTLY displayed)
+            visual_positions = list(zip(frame.bodies, frame.x.tolist(), frame.y.tolist()))
             
             self.skip_prev_update = True
 
@@ -895,82 +1186,99 @@ def render(self, alpha):
             self.skip_prev_update = False
             
             # STEP 3: Use the visual positions as new "prev"
-            for circle in state.circles:
-                if hasattr(circle, '_visual_x'):
-                    circle.prev_x = circle._visual_x
-                    circle.prev_y = circle._visual_y
-                    # Clean up
-                    delattr(circle, '_visual_x')
-                    delattr(circle, '_visual_y')
+            for circle, visual_x, visual_y in visual_positions:
+                circle.prev_x = visual_x
+                circle.prev_y = visual_y
+
+            # prev_* edited outside the physics: the next step cannot be re-simulated from the last keyframe
+            if self.rewind is not None:
+                self.rewind.mark_dirty()
         
             # STEP 4: Reset alpha to 0 (start again from the saved visual position)
             alpha = 0
+            frame = FrameData.build(self, alpha)
+        self.frame = frame
+        self.sprites.antialias = bool(self.sprite_antialiasing)
 
-        draw_gravitational_grid(self.screen, self, alpha, state.circles)
+        if self.field_heatmap_enabled:
+            self.field_heatmap.draw(self.screen, frame, self)
+        draw_gravitational_grid(self.screen, self, alpha, state.circles, frame)
+        if self.trails is not None:
+            self.trails.draw(self.screen, frame, self)
 
         # Render vectors if enabled
         if self.vectors_in_front:
             # Bodies first, then vectors on top
-            for circle in state.circles:
-                circle.draw_interpolated(self.screen, alpha)
-            if self.vectors_printed:
-                for circle in state.circles:
-                    circle.print_global_speed_vector(False, alpha)
-                    if self.force_vectors:
-                        circle.print_force_vector(False, alpha)
+            frame.draw(self.screen, self.sprites, self.setting("lod_splat_radius"), self.lod_mass_weighted,
+                       self.lod_log_tone)
+            if self.setting("vectors_printed"):
+                VectorOverlay.draw(self.screen, frame, self)
                     
         else:
             # Vectors first, then bodies on top
-            if self.vectors_printed:
-                for circle in state.circles:
-                    circle.print_global_speed_vector(False ,alpha)
-                    if self.force_vectors:
-                        circle.print_force_vector(False, alpha)
+            if self.setting("vectors_printed"):
+                VectorOverlay.draw(self.screen, frame, self)
                     
-            for circle in state.circles:
-                circle.draw_interpolated(self.screen, alpha)
+            frame.draw(self.screen, self.sprites, self.setting("lod_splat_radius"), self.lod_mass_weighted,
+                       self.lod_log_tone)
         
         # Draw temporary body being created
         if self.temp_circle:
             self.temp_circle.draw_interpolated(self.screen, alpha, interpolate_radius=False)
-        
-        # Display UI information
-        if not self.show_help:
-            self.print_global_info(self.info_y)
-            for circle in state.circles:
-                if circle.is_selected:
-                    circle.print_info(circle.info_y)
-        else:
-            self.show_help_overlay()
 
-    def _check_visual_collisions(self, alpha):
-        """Check if any bodies collide at interpolated positions."""
-        for i, circle in enumerate(state.circles):
-            if circle.suicide:
-                continue
-            
-            # Position interpolée
-            x1 = circle.prev_x + (circle.x - circle.prev_x) * alpha
-            y1 = circle.prev_y + (circle.y - circle.prev_y) * alpha
-            
-            for other in state.circles[i+1:]:
-                if other.suicide:
-                    continue
-                
-                # Position interpolée de l'autre
-                x2 = other.prev_x + (other.x - other.prev_x) * alpha
-                y2 = other.prev_y + (other.y - other.prev_y) * alpha
-                
-                # Distance
-                dx = x2 - x1
-                dy = y2 - y1
-                dist = sqrt(dx*dx + dy*dy)
-                
-                # Collision ?
-                if dist <= circle.radius + other.radius:
-                    return True
-        
-        return False
+    def render_hud(self):
+        """Draw the HUD (notifications, information texts or help overlay) at native resolution."""
+        self.hud_record = []
+
+        # Update and filter expired temporary texts (drawn over the world)
+        self.temp_texts = [text for text in self.temp_texts if text.update()]
+
+        # Information texts or help overlay, from the HUD layer
+        if self.hud_layer_outdated():
+            self.build_hud_layer()
+        layer = self.hud_layer
+        self.screen.blits([(layer, region.topleft, region) for region in self._hud_layer_regions], doreturn=False)
+        self.hud_record.extend(self._hud_layer_record)
+
+    def hud_layer_outdated(self) -> bool:
+        """
+        True if the HUD layer must be rebuilt: its layout changed (screen
+        size, help, selection, pause, replay, counters shown...) or its
+        numeric fields are older than 1 / hud_refresh_rate.
+        """
+        selected = next((circle.number for circle in state.circles if circle.is_selected), None)
+        key = (self.screen.get_size(), self.show_help, selected, self.is_paused, self.replay is None,
+               len(state.circles), self.time_acceleration, self.camera.scale, self.escape_policy,
+               self.quality.level, self.idle.active, self.effective_render_scale(),
+               self.telemetry is not None and self.telemetry.running, self.trajectory_recorder is None)
+        if self.hud_layer is None or key != self._hud_layer_key:
+            self._hud_layer_key = key
+            return True
+        return time.time() - self._hud_layer_time >= 1.0 / max(self.hud_refresh_rate, 1e-3)
+
+    def build_hud_layer(self) -> None:
+        """Draw the information texts (or the help overlay) into the transparent HUD layer."""
+        size = self.screen.get_size()
+        if self.hud_layer is None or self.hud_layer.get_size() != size:
+            self.hud_layer = pygame.Surface(size, pygame.SRCALPHA)
+        self.hud_layer.fill((0, 0, 0, 0))
+
+        # Every HUD drawing targets state.engine.screen: point it at the layer for the rebuild
+        screen, record = self.screen, self.hud_record
+        self.screen, self.hud_record = self.hud_layer, []
+        try:
+            if not self.show_help:
+                self.print_global_info(self.info_y)
+                for circle in state.circles:
+                    if circle.is_selected:
+                        circle.print_info(circle.info_y)
+            else:
+                self.show_help_overlay()
+        finally:
+            self.screen = screen
+            self._hud_layer_record, self.hud_record = self.hud_record, record
+        self._hud_layer_regions = Utils.drawn_regions(self.hud_layer)
+        self._hud_layer_time = time.time()
 
     def show_splash_screen(self):
         """
@@ -988,9 +1296,9 @@ def show_splash_screen(self):
         start_time = time.time()
         
         # Create a larger font for the splash screen
-        splash_font_large = pygame.font.Font(self.splash_screen_font, 60)
-        splash_font_medium = pygame.font.Font(self.splash_screen_font, 40)
-        splash_font_small = pygame.font.Font(self.splash_screen_font, 30)
+        splash_font_large = self.text.font(self.splash_screen_font, 60)
+        splash_font_medium = self.text.font(self.splash_screen_font, 40)
+        splash_font_small = self.text.font(self.splash_screen_font, 30)
         
         # Main splash screen loop
         running = True
@@ -1015,18 +1323,18 @@ def show_splash_screen(self):
             
             # Render author name (first name + last name)
             author_text = f"{self.author_first_name} {self.author_last_name}"
-            author_surface = splash_font_large.render(author_text, True, Display.BLUE)
+            author_surface = self.text.render(author_text, splash_font_large, Display.BLUE)
             author_rect = author_surface.get_rect(center=(screen_width // 2, screen_height // 2 - 80))
             self.screen.blit(author_surface, author_rect)
             
             # Render project description
-            desc_surface = splash_font_medium.render(self.project_description, True, Display.BLUE)
+            desc_surface = self.text.render(self.project_description, splash_font_medium, Display.BLUE)
             desc_rect = desc_surface.get_rect(center=(screen_width // 2, screen_height // 2))
             self.screen.blit(desc_surface, desc_rect)
             
             # Render copyright/version info (optional)
             version_text = "Copyright (c) 2026"
-            version_surface = splash_font_small.render(version_text, True, Display.DARK_GREY)
+            version_surface = self.text.render(version_text, splash_font_small, Display.DARK_GREY)
             version_rect = version_surface.get_rect(center=(screen_width // 2, screen_height // 2 + 60))
             self.screen.blit(version_surface, version_rect)
             
@@ -1051,6 +1359,57 @@ def show_splash_screen(self):
             self.screen.fill(Display.WHITE)
         pygame.display.flip()
 
+    def offer_checkpoint_resume(self) -> None:
+        """
+        Offer to resume the checkpoint left by a session that did not exit cleanly.
+
+        Blocks on a small prompt: Enter / Y resumes, Escape / N starts a new simulation.
+        """
+        path = self.checkpoints.latest()
+        if path is None:
+            return
+
+        saved = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(os.path.getmtime(path)))
+        Logger.info(f"Checkpoint found from a previous session: {path} ({saved})")
+
+        font_medium = self.text.font(self.splash_screen_font, 40)
+        font_small = self.text.font(self.splash_screen_font, 30)
+        clock = pygame.time.Clock()
+
+        while True:
+            self.screen.fill(Display.BLACK if self.screen_mode == "dark" else Display.WHITE)
+            center_x = self.screen.get_width() // 2
+            center_y = self.screen.get_height() // 2
+
+            lines = [
+                (font_medium, f"The last session did not exit cleanly (autosave: {saved})", Display.BLUE),
+                (font_small, "Enter / Y : resume it        Escape / N : start a new simulation", Display.DARK_GREY),
+            ]
+            for i, (font, text, color) in enumerate(lines):
+                surface = self.text.render(text, font, color)
+                self.screen.blit(surface, surface.get_rect(center=(center_x, center_y - 30 + i * 60)))
+            pygame.display.flip()
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    # Not answered: the checkpoint is still offered at the next launch
+                    self.checkpoints.keep_on_exit = True
+                    ActionManager.quit_engine()
+                elif event.type == pygame.KEYDOWN:
+                    if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_y):
+                        try:
+                            count = self.checkpoints.restore(self, path)
+                            self.notify(f"Resumed autosaved simulation ({count} bodies)", duration=3.0)
+                        except (OSError, ValueError, KeyError) as e:
+                            Logger.exception(f"Checkpoint restore failed: {e}")
+                            self.notify(f"Could not resume the autosave : {e}", duration=4.0)
+                        return
+                    if event.key in (pygame.K_ESCAPE, pygame.K_n):
+                        Logger.info("Checkpoint resume declined")
+                        return
+
+            clock.tick(30)
+
     def run(self):
         """
         Launch the main simulation loop.
@@ -1086,6 +1445,9 @@ def run(self):
         # Initialize selection state
         self.circle_selected = False
 
+        # Resume the autosave of a crashed session (if any)
+        self.offer_checkpoint_resume()
+
         # Map keyboard keys to actions
         self.KEY_MAP = {
             pygame.K_SPACE: ActionManager.toggle_pause,
@@ -1108,7 +1470,57 @@ def run(self):
             pygame.K_UP: lambda: ActionManager.pan_camera(0, self.camera_speed),
             pygame.K_DOWN: lambda: ActionManager.pan_camera(0, -self.camera_speed),
             # Take screenshots
-            pygame.K_s: ActionManager.save_screenshot
+            pygame.K_s: ActionManager.save_screenshot,
+            # Rewind / forward the recent history
+            pygame.K_COMMA: lambda: ActionManager.rewind(-self.rewind_scrub_steps),
+            pygame.K_PERIOD: lambda: ActionManager.rewind(self.rewind_scrub_steps),
+            # Save / load the whole simulation
+            pygame.K_F5: ActionManager.save_snapshot,
+            pygame.K_F9: ActionManager.load_snapshot,
+            # Bulk import of external initial conditions
+            pygame.K_F8: ActionManager.import_bodies,
+            # Scenario presets
+            pygame.K_n: ActionManager.next_scenario,
+            # Procedural systems
+            pygame.K_o: ActionManager.next_generator,
+            # Escape policy
+            pygame.K_u: ActionManager.cycle_escape_policy,
+            # Orbit trails
+            pygame.K_l: ActionManager.toggle_trails,
+            # Attraction-field heatmap
+            pygame.K_f: ActionManager.toggle_field_heatmap,
+            # Telemetry CSV export
+            pygame.K_x: ActionManager.toggle_telemetry,
+            # Trajectory recording
+            pygame.K_F6: ActionManager.toggle_recording,
+            pygame.K_F7: ActionManager.toggle_replay,
+            # Undo / redo (Ctrl is checked by the actions)
+            pygame.K_z: lambda: ActionManager.redo() if pygame.key.get_mods() & pygame.KMOD_SHIFT else ActionManager.undo(),
+            pygame.K_y: ActionManager.redo,
+        }
+
+        # Keys overridden while a recording is replayed (None = disabled: they would edit the scene)
+        self.REPLAY_KEY_MAP = {
+            pygame.K_SPACE: lambda: self.replay.toggle_play(),
+            pygame.K_COMMA: lambda: self.replay.scrub(-1),
+            pygame.K_PERIOD: lambda: self.replay.scrub(1),
+            pygame.K_LEFTBRACKET: lambda: self.replay.slower(),
+            pygame.K_RIGHTBRACKET: lambda: self.replay.faster(),
+            pygame.K_BACKSPACE: lambda: self.replay.reverse(),
+            pygame.K_p: None,
+            pygame.K_r: None,
+            pygame.K_g: None,
+            pygame.K_DELETE: None,
+            pygame.K_F5: None,
+            pygame.K_F9: None,
+            pygame.K_F8: None,
+            pygame.K_n: None,
+            pygame.K_o: None,
+            pygame.K_u: None,
+            pygame.K_x: None,
+            pygame.K_F6: None,
+            pygame.K_z: None,
+            pygame.K_y: None,
         }
         
         # Map mouse events to actions
@@ -1172,7 +1584,10 @@ def run(self):
                     if action:
                         action(event)
                 elif event.type == pygame.KEYDOWN:
-                    action = self.KEY_MAP.get(event.key)
+                    if self.replay is not None and event.key in self.REPLAY_KEY_MAP:
+                        action = self.REPLAY_KEY_MAP[event.key]
+                    else:
+                        action = self.KEY_MAP.get(event.key)
                     if action:
                         action()
 
@@ -1243,13 +1658,15 @@ def run(self):
                 
                 if self.collision_detected:
                     state.circles.append(self.temp_circle)
+                    self.history.record("Create body", added=[self.temp_circle])
                     self.temp_circle = None
                     self.mouse_down = False
                     self.mouse_down_start_time = None
             
             # ===== PHYSICS (fixed timestep - precise only, with optional substeps) =====
             # Do as many physics steps as needed to catch up
-            if not self.is_paused:
+            physics_start = time.perf_counter()
+            if not self.is_paused and self.replay is None:
                 # Precise mode: original behavior (regular calculations)
                 self.time_accumulator += frame_time
                 
@@ -1273,6 +1690,12 @@ def run(self):
                 if physics_steps >= max_steps_per_frame:
                     self.time_accumulator = 0.0
             
+            self.quality.record("physics", time.perf_counter() - physics_start)
+
+            # ===== AUTOSAVE (copy on this thread, compression + disk on a background thread) =====
+            if self.replay is None:
+                self.checkpoints.tick(self)
+
             # ===== RENDERING =====
             # Calculate interpolation alpha for smooth rendering
             # alpha = how far we are between current and next physics state
@@ -1280,31 +1703,37 @@ def run(self):
                 alpha = self.time_accumulator / self.physics_timestep
             else:
                 alpha = 1.0
+
+            # Replay: the recording drives the bodies instead of the physics
+            if self.replay is not None:
+                alpha = self.replay.update(frame_time)
             
             self.current_alpha = alpha
             
-            # Clear screen
-            if self.screen_mode == "dark":
-                self.screen.fill(Display.BLACK)
-            else:
-                self.screen.fill(Display.WHITE)
-            
-            # Update and filter expired temporary texts
-            self.temp_texts = [text for text in self.temp_texts if text.update()]
-            
             # Handle background music
             self.handle_music()
             
-            # Render with interpolation
-            self.render(alpha)
+            # Paused and unchanged: only the HUD texts that changed are redrawn
+            if self.idle.needs_render(self, events_list):
+                # Render with interpolation
+                self.render(alpha)
 
-            # ===== DRAW CONFIG PANEL (OVERLAY) =====
-            if hasattr(self, 'config_panel') and self.config_panel:
-                self.config_panel.draw()
-            
-            # Update display and maintain target FPS
-            pygame.display.flip()
-            clock.tick(self.FPS_TARGET)
+                # ===== DRAW CONFIG PANEL (OVERLAY) =====
+                if hasattr(self, 'config_panel') and self.config_panel:
+                    self.config_panel.draw()
+
+                pygame.display.flip()
+            else:
+                self.idle.redraw_hud(self)
+
+            # Update display and maintain target FPS (or sleep until something happens while idle)
+            self.update_render_scale(time.time() - current_time)
+            self.quality.end_frame(self)
+            if self.idle.active and not self.idle.settling:
+                self.idle.wait(self)
+                clock.tick()
+            else:
+                clock.tick(self.FPS_TARGET)
         
         # Clean exit
         ActionManager.quit_engine()
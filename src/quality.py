@@ -0,0 +1,138 @@
+"""
+Adaptive quality governor.
+==========================
+
+When frames overrun their budget (1 / FPS_TARGET), the engine used to
+only drop physics time. The governor measures the cost of each phase of
+a frame (physics, world drawing, HUD) and, while rendering is what makes
+frames late, degrades the rendering one level at a time, then restores
+it when headroom returns:
+
+    level 1   lensing grid sampled every 16 px instead of 8
+    level 2   half as many grid lines
+    level 3   bodies below 3 px drawn as point splats
+    level 4   velocity / force vectors hidden
+    level 5   render scale 75 %
+    level 6   render scale 50 %
+
+Each level only lowers the user's setting (a user setting already below
+it is kept). Settings are never modified: the governor publishes
+`overrides`, read through Engine.setting(name).
+
+Hysteresis: a level is added after `quality_degrade_frames` consecutive
+frames above `quality_degrade_ratio` x budget, and removed after
+`quality_restore_frames` consecutive frames below `quality_restore_ratio`
+x budget (frame cost = exponential average of physics + world + HUD).
+
+Usage:
+    from quality import QualityGovernor
+
+    governor = QualityGovernor()
+    governor.record("world", seconds)     # per phase, during the frame
+    governor.end_frame(engine)            # once per frame
+    engine.setting("grid_max_lines")      # overridden value or user setting
+"""
+
+from typing import Any, Callable
+
+from logger import Logger
+
+
+class QualityGovernor:
+    """
+    Frame-time budget controller publishing setting overrides.
+    """
+
+    PHASES: tuple[str, ...] = ("physics", "world", "hud")
+
+    # (label, engine attribute, degraded value from the current one)
+    LEVELS: tuple[tuple[str, str, Callable[[Any], Any]], ...] = (
+        ("grid sampled every 16 px", "grid_sample_px", lambda value: max(value, 16.0)),
+        ("grid lines halved", "grid_max_lines", lambda value: max(8, int(value) // 2)),
+        ("point splats below 3 px", "lod_splat_radius", lambda value: max(value, 3.0)),
+        ("vectors hidden", "vectors_printed", lambda value: False),
+        ("render scale 75 %", "render_scale", lambda value: min(value, 0.75)),
+        ("render scale 50 %", "render_scale", lambda value: min(value, 0.5)),
+    )
+
+    # Only degrade the rendering when it is at least this share of the frame cost
+    # (a physics-bound frame does not get faster with a blurrier picture)
+    MIN_RENDER_SHARE = 0.3
+    # Weight of the last frame in the averaged costs
+    SMOOTHING = 0.1
+
+    def __init__(self):
+        self.level = 0
+        self.overrides: dict[str, Any] = {}
+        self.averages: dict[str, float] = {phase: 0.0 for phase in self.PHASES}
+        self._frame: dict[str, float] = {phase: 0.0 for phase in self.PHASES}
+        self._over = 0
+        self._under = 0
+
+    @property
+    def frame_cost(self) -> float:
+        """Averaged cost of a frame (s)."""
+        return sum(self.averages.values())
+
+    def describe(self) -> str:
+        if self.level == 0:
+            return "full"
+        return f"level {self.level}/{len(self.LEVELS)} ({self.LEVELS[self.level - 1][0]})"
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Add the time spent in a phase of the current frame."""
+        self._frame[phase] += seconds
+
+    def reset(self) -> None:
+        """Back to full quality (governor disabled)."""
+        if self.level:
+            Logger.info("Quality governor off: full quality restored")
+        self.level = 0
+        self.overrides.clear()
+        self._over = self._under = 0
+
+    # ==================== CONTROL ====================
+
+    def end_frame(self, engine) -> None:
+        """Fold the frame's phase costs into the averages and move the level if needed."""
+        for phase in self.PHASES:
+            self.averages[phase] += (self._frame[phase] - self.averages[phase]) * self.SMOOTHING
+            self._frame[phase] = 0.0
+
+        if not engine.quality_governor:
+            if self.level or self.overrides:
+                self.reset()
+            return
+
+        budget = 1.0 / engine.FPS_TARGET
+        cost = self.frame_cost
+        render_share = (self.averages["world"] + self.averages["hud"]) / cost if cost > 0 else 0.0
+
+        if cost > engine.quality_degrade_ratio * budget and render_share >= self.MIN_RENDER_SHARE:
+            self._over += 1
+            self._under = 0
+        elif cost < min(engine.quality_restore_ratio, engine.quality_degrade_ratio) * budget:
+            self._under += 1
+            self._over = 0
+        else:
+            # Inside the dead band: hold the current level
+            self._over = self._under = 0
+
+        if self._over >= engine.quality_degrade_frames and self.level < len(self.LEVELS):
+            self.level += 1
+            self._over = 0
+            Logger.info(f"Quality degraded to {self.describe()}: frame cost {cost * 1e3:.1f} ms "
+                        f"for a {budget * 1e3:.1f} ms budget")
+        elif self._under >= engine.quality_restore_frames and self.level > 0:
+            self.level -= 1
+            self._under = 0
+            Logger.info(f"Quality restored to {self.describe()}: frame cost {cost * 1e3:.1f} ms")
+
+        self._apply(engine)
+
+    def _apply(self, engine) -> None:
+        """Rebuild the overrides from the user's current settings (they may change at any time)."""
+        overrides = {}
+        for _, name, degrade in self.LEVELS[:self.level]:
+            overrides[name] = degrade(overrides.get(name, getattr(engine, name)))
+        self.overrides = overrides
@@ -0,0 +1,236 @@
+"""
+Replay of recorded trajectories.
+================================
+
+Plays a .getraj recording (see trajectory.py) through the normal render
+path with physics fully off. For each displayed frame the player picks
+the two recorded frames around the playback time, loads them into proxy
+bodies as their prev_* / current state, and lets Engine.render()
+interpolate between them (Circle.draw_interpolated, vectors, HUD).
+
+The live scene is put aside while replaying and restored on exit.
+
+Usage:
+    from replay import ReplayPlayer
+
+    engine.replay = ReplayPlayer(engine, path)   # enter replay mode
+    alpha = engine.replay.update(frame_time)     # once per frame, before render
+    engine.replay.close()                        # back to the live simulation
+"""
+
+from typing import Optional
+
+import numpy as np
+
+import state
+from circle import Circle
+from logger import Logger
+from trajectory import TrajectoryReader
+
+
+class ReplayPlayer:
+    """
+    Streams recorded states into proxy Circles, with scrubbing, variable speed and reverse play.
+    """
+
+    # Playback speed steps (x recorded engine clock)
+    SPEEDS: tuple[float, ...] = (0.125, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+    # Scrub step, as a fraction of the recording duration
+    SCRUB_FRACTION = 0.01
+
+    def __init__(self, engine, path: str):
+        """
+        Args:
+            engine: The Engine whose scene is replaced during the replay
+            path: Recording to play
+
+        Raises:
+            ValueError: if the file is not a recording or contains no chunk
+        """
+        self.engine = engine
+        self.path = path
+        self.reader = TrajectoryReader(path)
+        if self.reader.chunk_count == 0:
+            raise ValueError(f"Empty recording: {path}")
+
+        self.time = self.reader.t_min
+        self.speed_index = self.SPEEDS.index(1.0)
+        self.direction = 1
+        self.playing = True
+
+        self._proxies: dict[int, Circle] = {}
+        self._pair: Optional[tuple] = None
+        self._alpha = 0.0
+
+        # Put the live scene aside (restored by close())
+        self._live_circles = list(state.circles)
+        self._live_time = engine.simulation_time
+        self._live_circle_number = engine.circle_number
+        self._live_temp_circle = engine.temp_circle
+        engine.temp_circle = None
+        state.circles.clear()
+
+        Logger.info(f"Replay started: {path} ({self.reader.chunk_count} chunks, "
+                    f"t = {self.reader.t_min:.2f} .. {self.reader.t_max:.2f})")
+
+    # ==================== CONTROLS ====================
+
+    @property
+    def speed(self) -> float:
+        return self.SPEEDS[self.speed_index]
+
+    @property
+    def duration(self) -> float:
+        return self.reader.t_max - self.reader.t_min
+
+    def toggle_play(self) -> None:
+        # Restart from the other end when playing past the last frame
+        if not self.playing:
+            if self.direction > 0 and self.time >= self.reader.t_max:
+                self.time = self.reader.t_min
+            elif self.direction < 0 and self.time <= self.reader.t_min:
+                self.time = self.reader.t_max
+        self.playing = not self.playing
+
+    def reverse(self) -> None:
+        self.direction = -self.direction
+
+    def faster(self) -> None:
+        self.speed_index = min(self.speed_index + 1, len(self.SPEEDS) - 1)
+
+    def slower(self) -> None:
+        self.speed_index = max(self.speed_index - 1, 0)
+
+    def seek(self, t: float) -> None:
+        """Jump to a recorded time (clamped to the recording)."""
+        self.time = min(max(t, self.reader.t_min), self.reader.t_max)
+
+    def scrub(self, steps: int) -> None:
+        """Move by steps * SCRUB_FRACTION of the recording (negative = backwards)."""
+        self.seek(self.time + steps * self.SCRUB_FRACTION * self.duration)
+
+    # ==================== FRAME UPDATE ====================
+
+    def update(self, frame_time: float) -> float:
+        """
+        Advance the playback clock and load the surrounding recorded frames.
+
+        Args:
+            frame_time: Wall-clock duration of the last frame (s)
+
+        Returns:
+            Interpolation alpha to pass to Engine.render()
+        """
+        if self.playing:
+            self.seek(self.time + frame_time * self.speed * self.direction)
+            at_end = self.time >= self.reader.t_max if self.direction > 0 else self.time <= self.reader.t_min
+            if at_end:
+                self.playing = False
+
+        chunk_index, frame = self.reader.locate(self.time)
+        next_index, next_frame = chunk_index, frame + 1
+        if next_frame >= len(self.reader.chunk(chunk_index).times):
+            next_index, next_frame = chunk_index + 1, 0
+        if next_index >= self.reader.chunk_count:
+            next_index, next_frame = chunk_index, frame
+
+        pair = (chunk_index, frame, next_index, next_frame)
+        if pair != self._pair:
+            self._load(pair)
+            self._pair = pair
+
+        t0 = self.reader.chunk(chunk_index).times[frame]
+        t1 = self.reader.chunk(next_index).times[next_frame]
+        alpha = (self.time - t0) / (t1 - t0) if t1 > t0 else 1.0
+        self._alpha = min(max(float(alpha), 0.0), 1.0)
+
+        # The HUD clock follows the playback
+        self.engine.simulation_time = self.time
+        return self._alpha
+
+    def _load(self, pair: tuple) -> None:
+        """Fill the proxies with frame A as previous state and frame B as current state."""
+        chunk_index, frame, next_index, next_frame = pair
+        _, ids_a, values_a = self.reader.chunk(chunk_index).frame(frame)
+        _, ids_b, values_b = self.reader.chunk(next_index).frame(next_frame)
+
+        # Align both frames on the union of their IDs: bodies present in a
+        # single frame (fused, created) stay still at their only known state
+        ids = np.union1d(ids_a, ids_b)
+        pos_a = np.searchsorted(ids, ids_a)
+        pos_b = np.searchsorted(ids, ids_b)
+
+        def aligned(name):
+            a = np.full(len(ids), np.nan)
+            b = np.full(len(ids), np.nan)
+            a[pos_a] = values_a[name]
+            b[pos_b] = values_b[name]
+            a = np.where(np.isnan(a), b, a)
+            b = np.where(np.isnan(b), a, b)
+            return a.tolist(), b.tolist()
+
+        columns = {name: aligned(name) for name in ("x", "y", "vx", "vy", "fx", "fy", "radius")}
+        mass = aligned("mass")[1]
+        density = aligned("density")[1]
+        id_list = ids.tolist()
+
+        missing = [i for i, body_id in enumerate(id_list) if body_id not in self._proxies]
+        if missing:
+            new_bodies = Circle.bulk_create(
+                x=[columns["x"][1][i] for i in missing],
+                y=[columns["y"][1][i] for i in missing],
+                vx=[columns["vx"][1][i] for i in missing],
+                vy=[columns["vy"][1][i] for i in missing],
+                mass=[mass[i] for i in missing],
+                density=[density[i] for i in missing],
+                radius=[columns["radius"][1][i] for i in missing],
+                numbers=[id_list[i] for i in missing],
+            )
+            for body in new_bodies:
+                self._proxies[body.number] = body
+
+        x0, x1 = columns["x"]
+        y0, y1 = columns["y"]
+        vx0, vx1 = columns["vx"]
+        vy0, vy1 = columns["vy"]
+        fx0, fx1 = columns["fx"]
+        fy0, fy1 = columns["fy"]
+        r0, r1 = columns["radius"]
+        bodies = []
+        for i, body_id in enumerate(id_list):
+            body = self._proxies[body_id]
+            body.prev_x, body.x = x0[i], x1[i]
+            body.prev_y, body.y = y0[i], y1[i]
+            body.prev_vx, body.vx = vx0[i], vx1[i]
+            body.prev_vy, body.vy = vy0[i], vy1[i]
+            body.prev_force, body.force = [fx0[i], fy0[i]], [fx1[i], fy1[i]]
+            body.prev_radius, body.radius = r0[i], r1[i]
+            body.mass, body.density = mass[i], density[i]
+            body.speed = (vx1[i] ** 2 + vy1[i] ** 2) ** 0.5
+            body._interpolated_cache['alpha'] = -1.0
+            bodies.append(body)
+
+        # Mutate in place: other modules hold references to state.circles
+        state.circles[:] = bodies
+
+    # ==================== EXIT ====================
+
+    def close(self) -> None:
+        """Leave replay mode and restore the live scene."""
+        engine = self.engine
+        state.circles[:] = self._live_circles
+        engine.simulation_time = self._live_time
+        engine.circle_number = self._live_circle_number
+        engine.temp_circle = self._live_temp_circle
+        engine.circle_selected = False
+        # Live bodies restored outside the physics: keyframe before the next step
+        if engine.rewind is not None:
+            engine.rewind.mark_dirty()
+        engine.time_accumulator = 0.0
+        Logger.info(f"Replay closed: {self.path}")
+
+    def status(self) -> str:
+        """One-line HUD description of the playback state."""
+        arrow = ">" if self.direction > 0 else "<"
+        state_text = f"{arrow} x{self.speed:g}" if self.playing else "||"
+        return f"Replay {state_text} : {self.time - self.reader.t_min:.1f} / {self.duration:.1f} s"
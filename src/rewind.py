@@ -0,0 +1,267 @@
+"""
+In-memory rewind.
+=================
+
+Keeps the recent history of the running simulation so that it can be
+scrubbed backwards (and forwards again) while paused.
+
+History = periodic keyframes (exact copy of every body, see Circle.freeze,
+plus the engine clock, parameters and random state) + one compact delta
+per physics step (its dt and the render alpha used by the fusion check)
+in a fixed-size ring buffer. Seeking to step s restores the last keyframe
+at or before s and re-runs Engine.physics_step deterministically up to s.
+
+Edits made outside the physics force a keyframe before the next step,
+so re-simulation never crosses them. Every path that edits the scene
+calls mark_dirty() (EditHistory for undoable edits, the snapshot,
+scenario, import and generator loaders, escape policies...); the body
+count / clock / parameter signature checked before each step only
+catches parameter changes, an edit keeping the body count is invisible
+to it.
+
+Memory is bounded: the delta ring has a fixed capacity, and the oldest
+keyframes are dropped when their estimated size exceeds the budget.
+
+Usage:
+    from rewind import RewindBuffer
+
+    engine.rewind = RewindBuffer(budget_bytes=64 << 20)
+    engine.rewind.before_step(engine, dt)   # called by Engine.physics_step
+    engine.rewind.scrub(engine, -60)        # 60 steps back (while paused)
+    engine.rewind.on_resume(engine)         # history after the cursor is discarded
+"""
+
+import sys
+from collections import deque
+from typing import Any
+
+import numpy as np
+
+import state
+from circle import Circle
+from logger import Logger
+
+
+class _Keyframe:
+    """Exact scene state before physics step `step`."""
+
+    __slots__ = ("step", "bodies", "engine", "rng_state", "nbytes")
+
+    def __init__(self, step: int, bodies: list[dict], engine: dict[str, Any], rng_state: tuple, nbytes: int):
+        self.step = step
+        self.bodies = bodies
+        self.engine = engine
+        self.rng_state = rng_state
+        self.nbytes = nbytes
+
+
+class RewindBuffer:
+    """
+    Keyframes + per-step delta ring buffer under a hard memory budget.
+    """
+
+    # Engine attributes that influence physics_step (restored with each keyframe)
+    ENGINE_KEYS: tuple[str, ...] = (
+        "simulation_time", "circle_number", "time_acceleration", "gravity", "G",
+        "fusions", "reversed_gravity", "random_mode", "random_energy_per_kg",
+    )
+
+    DELTA_DTYPE = np.dtype([("dt", "<f8"), ("alpha", "<f8")])
+
+    def __init__(self,
+                 budget_bytes: int = 64 << 20,
+                 keyframe_interval: int = 240,
+                 delta_capacity: int = 1 << 16):
+        """
+        Args:
+            budget_bytes: Max memory used by keyframes + deltas (estimated)
+            keyframe_interval: Physics steps between two periodic keyframes
+                (= max number of steps re-simulated by a seek)
+            delta_capacity: Size of the delta ring (max history length, in steps)
+        """
+        self.budget_bytes = int(budget_bytes)
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self._deltas = np.zeros(max(1, int(delta_capacity)), dtype=self.DELTA_DTYPE)
+        self._keyframes: deque[_Keyframe] = deque()
+
+        self.head = 0            # Number of steps recorded (next step index)
+        self.cursor = 0          # Step the scene currently shows (== head unless rewound)
+        self._signature = None   # Expected scene signature before the next step
+        self._dirty = True       # Force a keyframe before the next step
+        self._resimulating = False
+        self._too_large = 0      # Body count whose keyframe did not fit in the budget (0 = none)
+
+    # ==================== PROPERTIES ====================
+
+    @property
+    def earliest(self) -> int:
+        """First step that can be restored."""
+        return self._keyframes[0].step if self._keyframes else self.head
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._deltas.nbytes + sum(keyframe.nbytes for keyframe in self._keyframes)
+
+    @property
+    def offset_steps(self) -> int:
+        """How many steps the scene is behind the recorded present."""
+        return self.head - self.cursor
+
+    def offset_seconds(self) -> float:
+        """Engine clock difference between the present and the cursor."""
+        if self.head == self.cursor:
+            return 0.0
+        steps = np.arange(self.cursor, self.head) % len(self._deltas)
+        return float(self._deltas["dt"][steps].sum())
+
+    # ==================== RECORDING ====================
+
+    def mark_dirty(self) -> None:
+        """Force a keyframe before the next step (scene edited outside the physics)."""
+        self._dirty = True
+
+    @staticmethod
+    def _scene_signature(engine) -> tuple:
+        return (len(state.circles), engine.simulation_time,
+                *(getattr(engine, key, None) for key in RewindBuffer.ENGINE_KEYS[2:]))
+
+    def before_step(self, engine, dt: float) -> None:
+        """Record the step about to run (called at the start of Engine.physics_step)."""
+        if self._resimulating:
+            return
+        if self._too_large and len(state.circles) >= self._too_large:
+            return  # Scene too large for the budget: no history
+        if self.cursor != self.head:
+            # Stepping from a rewound state: the old future is gone
+            self._truncate()
+
+        if (self._dirty or not self._keyframes or self._signature != self._scene_signature(engine)
+                or self.head - self._keyframes[-1].step >= self.keyframe_interval):
+            self._add_keyframe(engine)
+
+        self._deltas[self.head % len(self._deltas)] = (dt, engine.current_alpha)
+        self.head += 1
+        self.cursor = self.head
+
+    def after_step(self, engine) -> None:
+        """Remember the scene signature right after a step (called at the end of Engine.physics_step)."""
+        if not self._resimulating:
+            self._signature = self._scene_signature(engine)
+
+    def _add_keyframe(self, engine) -> None:
+        bodies = [circle.freeze() for circle in state.circles]
+        keyframe = _Keyframe(
+            step=self.head,
+            bodies=bodies,
+            engine={key: getattr(engine, key) for key in self.ENGINE_KEYS if hasattr(engine, key)},
+            rng_state=engine.rng.getstate(),
+            nbytes=self._estimate_bytes(bodies),
+        )
+        self._dirty = False
+
+        if keyframe.nbytes + self._deltas.nbytes > self.budget_bytes:
+            # A single keyframe does not fit: no history can be kept for this scene
+            self._keyframes.clear()
+            self._too_large = len(bodies)
+            Logger.warning(f"Rewind disabled for this scene: keyframe of {keyframe.nbytes / 1e6:.1f} MB "
+                           f"exceeds the {self.budget_bytes / 1e6:.0f} MB budget")
+            return
+
+        self._too_large = 0
+        self._keyframes.append(keyframe)
+        self._trim()
+
+    @staticmethod
+    def _estimate_bytes(bodies: list[dict]) -> int:
+        """Estimated size of a keyframe (first record measured, assumed for all)."""
+        if not bodies:
+            return 256
+        record = bodies[0]
+        per_body = sys.getsizeof(record) + sum(
+            sys.getsizeof(value) for value in record.values() if isinstance(value, (float, list, dict, tuple))
+        )
+        return 256 + len(bodies) * (per_body + 8)
+
+    def _trim(self) -> None:
+        """Drop the oldest keyframes that are over budget or whose deltas were overwritten."""
+        oldest_delta = self.head - len(self._deltas)
+        while len(self._keyframes) > 1 and (self._keyframes[0].step < oldest_delta
+                                            or self.memory_bytes > self.budget_bytes):
+            self._keyframes.popleft()
+        if self._keyframes and self._keyframes[0].step < oldest_delta:
+            self._keyframes.clear()
+
+    def _truncate(self) -> None:
+        """Discard the history after the cursor."""
+        while self._keyframes and self._keyframes[-1].step > self.cursor:
+            self._keyframes.pop()
+        self.head = self.cursor
+
+    # ==================== SEEKING ====================
+
+    def seek(self, engine, step: int) -> int:
+        """
+        Put the scene in the exact state it had before physics step `step`.
+
+        Returns:
+            The step actually reached (clamped to the available history)
+        """
+        step = min(max(step, self.earliest), self.head)
+        if step == self.cursor or not self._keyframes:
+            return self.cursor
+
+        keyframe = self._keyframes[0]
+        for candidate in self._keyframes:
+            if candidate.step > step:
+                break
+            keyframe = candidate
+
+        # Restore the keyframe
+        state.circles[:] = [Circle.thaw(record) for record in keyframe.bodies]
+        for key, value in keyframe.engine.items():
+            setattr(engine, key, value)
+        engine.rng.setstate(keyframe.rng_state)
+        engine.temp_circle = None
+        engine.circle_selected = False
+        engine.time_accumulator = 0.0
+
+        # Re-simulate up to the requested step (exports and trails are not fed
+        # twice, nor is the escape policy: its edits happened before a keyframe)
+        telemetry, recorder, escape = engine.telemetry, engine.trajectory_recorder, engine.escape
+        trails = engine.trails
+        engine.telemetry = engine.trajectory_recorder = engine.escape = engine.trails = None
+        self._resimulating = True
+        try:
+            for index in range(keyframe.step, step):
+                dt, alpha = self._deltas[index % len(self._deltas)]
+                engine.current_alpha = float(alpha)
+                engine.physics_step(float(dt))
+        finally:
+            self._resimulating = False
+            engine.telemetry, engine.trajectory_recorder, engine.escape = telemetry, recorder, escape
+            engine.trails = trails
+        # The trails describe the abandoned timeline
+        if trails is not None:
+            trails.clear()
+
+        self.cursor = step
+        self._signature = self._scene_signature(engine)
+        return step
+
+    def scrub(self, engine, steps: int) -> int:
+        """Move the cursor by `steps` physics steps (negative = backwards)."""
+        return self.seek(engine, self.cursor + steps)
+
+    # ==================== PAUSE HOOKS ====================
+
+    def on_pause(self, engine) -> None:
+        """Called by Engine.pause(): keyframe the present so that scrubbing can come back to it exactly."""
+        if self.cursor == self.head and (not self._keyframes or self._keyframes[-1].step != self.head):
+            self._add_keyframe(engine)
+            self._signature = self._scene_signature(engine)
+
+    def on_resume(self, engine) -> None:
+        """Called by Engine.unpause(): continue from the cursor, dropping the rewound future."""
+        if self.cursor != self.head:
+            Logger.info(f"Rewind: resumed {self.head - self.cursor} steps in the past")
+            self._truncate()
@@ -0,0 +1,149 @@
+"""
+Adaptive sampling of trajectory recordings.
+===========================================
+
+Decides, for every recorded frame, which bodies are actually stored.
+
+Rules (a body is kept when any of them applies):
+    - region of interest: the selected body and the bodies inside the
+      camera view (plus a margin) are recorded at full rate
+    - background rate: every other body is kept at least once every
+      `background_every` frames
+    - error-bounded decimation: a body is kept when the linear prediction
+      from its last kept sample (position + velocity * elapsed simulated
+      time) is off by more than `tolerance` meters, or when its mass /
+      radius changed (fusion: the frame before is kept too, as the position
+      jumps to the center of mass)
+
+Skipped samples are stored as NaN. Within a chunk, the first frame and the
+last frame where a body exists are always kept, so the reader can tell a
+skipped sample (NaN between two kept ones, rebuilt by linear interpolation,
+see TrajectoryReader) from a body that no longer exists (trailing NaN).
+
+Usage:
+    from sampling import AdaptiveSampler
+
+    sampler = AdaptiveSampler(tolerance=0.5, background_every=16)
+    recorder = TrajectoryRecorder(path, sampler=sampler)
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class AdaptiveSampler:
+    """
+    Per-body keep / skip decisions for TrajectoryRecorder.
+    """
+
+    def __init__(self,
+                 tolerance: Optional[float] = None,
+                 background_every: int = 1,
+                 region_of_interest: bool = True,
+                 view_margin: float = 0.1):
+        """
+        Args:
+            tolerance: Max prediction error in meters before a sample is kept (None = no decimation)
+            background_every: Max frames between two kept samples of a body outside the region of interest
+            region_of_interest: Record the selected body and the bodies in view at full rate
+            view_margin: Extra border around the view, as a fraction of its size
+        """
+        if tolerance is not None and not tolerance > 0:
+            raise ValueError("tolerance must be > 0 (or None to disable decimation)")
+        self.tolerance = tolerance
+        self.background_every = max(1, int(background_every))
+        self.region_of_interest = region_of_interest
+        self.view_margin = view_margin
+
+        # State of the chunk being filled, per slot
+        self._last_frame = np.empty(0, dtype=np.int64)    # Frame of the last kept sample (-1 = none)
+        self._last_time = np.empty(0, dtype=np.float64)
+        self._last = np.empty((0, 0), dtype=np.float64)   # (x, y, vx, vy, mass, radius) of the last kept sample
+
+        # Bodies of the last select() whose previous frame must be kept too (fusion)
+        self.keep_previous = np.empty(0, dtype=bool)
+
+        # Statistics (read by the HUD / logs)
+        self.samples_seen = 0
+        self.samples_kept = 0
+
+    @property
+    def active(self) -> bool:
+        """False when every sample would be kept anyway (full-rate recording)."""
+        return self.tolerance is not None or self.background_every > 1
+
+    @property
+    def kept_ratio(self) -> float:
+        return self.samples_kept / self.samples_seen if self.samples_seen else 1.0
+
+    def describe(self) -> dict:
+        """JSON-serializable settings, stored in the recording header."""
+        return {
+            "tolerance": self.tolerance,
+            "background_every": self.background_every,
+            "region_of_interest": self.region_of_interest,
+        }
+
+    def begin_chunk(self, slots: int) -> None:
+        """Reset the per-slot state (every chunk starts with all bodies kept)."""
+        self._last_frame = np.full(slots, -1, dtype=np.int64)
+        self._last_time = np.zeros(slots, dtype=np.float64)
+        self._last = np.zeros((6, slots), dtype=np.float64)
+
+    # ==================== REGION OF INTEREST ====================
+
+    def _in_view(self, engine, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        width, height = engine.screen.get_size()
+        x0, y0 = engine.camera.screen_to_world(0, 0)
+        x1, y1 = engine.camera.screen_to_world(width, height)
+        margin_x = abs(x1 - x0) * self.view_margin
+        margin_y = abs(y1 - y0) * self.view_margin
+        return ((x >= min(x0, x1) - margin_x) & (x <= max(x0, x1) + margin_x)
+                & (y >= min(y0, y1) - margin_y) & (y <= max(y0, y1) + margin_y))
+
+    # ==================== DECISION ====================
+
+    def select(self, engine, bodies: list, frame: int, sim_time: float,
+               slots: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        Return the keep mask of one frame.
+
+        Args:
+            engine: Running engine (camera and screen give the view)
+            bodies: Bodies of the frame, in the order of `slots`
+            frame: Frame index in the current chunk
+            sim_time: Engine clock of the frame (Engine.simulation_time, scaled by
+                      engine.time_acceleration for the prediction)
+            slots: Chunk slot of every body
+            values: (len(FIELDS), bodies) state, rows x, y, vx, vy, fx, fy, mass, radius, density
+
+        Returns:
+            bool[bodies]
+        """
+        x, y, vx, vy, mass, radius = values[(0, 1, 2, 3, 6, 7), :]
+        last_frame = self._last_frame[slots]
+        last = self._last[:, slots]
+
+        keep = (last_frame < 0) | (frame - last_frame >= self.background_every)
+        self.keep_previous = np.zeros(len(slots), dtype=bool)
+        if self.region_of_interest:
+            keep |= self._in_view(engine, x, y)
+            keep |= np.fromiter((c.is_selected for c in bodies), bool, len(bodies))
+        if self.tolerance is not None:
+            # The engine clock is unaccelerated: velocities are in m per simulated second
+            elapsed = (sim_time - self._last_time[slots]) * engine.time_acceleration
+            error = np.hypot(last[0] + last[2] * elapsed - x, last[1] + last[3] * elapsed - y)
+            changed = (mass != last[4]) | (radius != last[5])
+            keep |= (error > self.tolerance) | changed
+            # Interpolating across the jump would smear it over the whole gap
+            self.keep_previous = changed & (last_frame >= 0) & (last_frame < frame - 1)
+
+        kept_slots = slots[keep]
+        self._last_frame[kept_slots] = frame
+        self._last_time[kept_slots] = sim_time
+        self._last[:, kept_slots] = np.stack((x, y, vx, vy, mass, radius))[:, keep]
+
+        self.samples_seen += len(slots)
+        self.samples_kept += len(kept_slots) + int(np.count_nonzero(self.keep_previous))
+        return keep
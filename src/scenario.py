@@ -0,0 +1,286 @@
+"""
+Scenario files and presets.
+===========================
+
+A scenario describes a whole starting scene: engine parameters, camera,
+procedural generator directives and an explicit body list. It is a JSON
+Lines file (.jsonl), so large body lists are parsed incrementally:
+
+    line 1   header object
+             {"name": "...", "description": "...",
+              "engine": {"time_acceleration": 2e4, ...},     (any ConfigPanel.CONFIG_KEYS)
+              "camera": {"center": [x, y], "scale": 1.0},
+              "columns": ["x", "y", "vx", "vy", "mass", "density"],   (order of array rows)
+              "generators": [{"type": "plummer", "count": 2000, "seed": 1, ...}]}
+                                                    (see generators.py for the types and their keys)
+    line 2+  one body per line, either an array following "columns"
+             [960.0, 540.0, 0.0, 0.0, 1e9, 5514]
+             or an object {"x": 960.0, "y": 540.0, "mass": 1e9}
+             (missing vx / vy = 0, missing density = Engine.default_density)
+
+Body lines are decoded BATCH_LINES at a time by a single json.loads call
+and converted to columns; nothing per body is kept but its numbers.
+
+The first load of a scenario compiles it (bodies + generated bodies) into
+a binary sidecar in user_data/cache/scenarios/, in the snapshot format
+(see snapshot.py), named after the SHA-256 of the file content. Later
+loads of the same content only hash the file and memory-map the sidecar;
+editing the file changes its hash, so a stale cache is never used.
+
+Presets are the scenarios shipped in assets/scenarios/ plus the user's
+own in user_data/scenarios/.
+
+Usage:
+    from scenario import ScenarioLoader
+
+    count = ScenarioLoader.load(engine, "assets/scenarios/sun_and_planets.jsonl")
+    path = ScenarioLoader.next_preset(engine)   # cycles through the presets (N key)
+"""
+
+import hashlib
+import json
+import os
+import time
+from itertools import islice
+from typing import Any, Optional
+
+import numpy as np
+
+import state
+from body_arrays import BodyArrays
+from body_import import BodyImporter
+from config_panel import ConfigPanel
+from generators import Generators
+from logger import Logger
+from snapshot import Snapshot
+
+
+class ScenarioLoader:
+    """
+    Static parser / compiler / loader of .jsonl scenarios.
+    """
+
+    EXTENSION = ".jsonl"
+    PRESET_FOLDER = "assets/scenarios"
+    USER_FOLDER = "scenarios"
+    CACHE_FOLDER = "cache/scenarios"
+    # Bump when the compiled output of a same file changes (new generator behavior...)
+    COMPILER_VERSION = 2
+    BATCH_LINES = 1 << 16
+    DEFAULT_COLUMNS: tuple[str, ...] = ("x", "y", "vx", "vy", "mass", "density")
+
+    # ==================== PARSING ====================
+
+    @staticmethod
+    def content_hash(path: str) -> str:
+        """SHA-256 of the file content and of the compiler version (cache key)."""
+        digest = hashlib.sha256(f"scenario-v{ScenarioLoader.COMPILER_VERSION}".encode())
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _rows_to_columns(rows: list, names: tuple[str, ...]) -> dict[str, np.ndarray]:
+        """
+        Convert one batch of decoded body lines to columns: array lines first,
+        then object lines (a value missing from a line is NaN).
+        """
+        arrays = [row for row in rows if isinstance(row, list)]
+        objects = [row for row in rows if isinstance(row, dict)]
+        if len(arrays) + len(objects) != len(rows):
+            raise ValueError("Body lines must be JSON arrays or objects")
+
+        table = np.array(arrays, dtype=np.float64) if arrays else None
+        if arrays and (table.ndim != 2 or table.shape[1] != len(names)):
+            raise ValueError(f"Body arrays must have {len(names)} values {names}")
+        keys = set().union(*objects) & set(BodyImporter.COLUMNS)
+
+        columns = {}
+        for name in (set(names) if arrays else set()) | keys:
+            column = np.full(len(rows), np.nan)
+            if arrays and name in names:
+                column[:len(arrays)] = table[:, names.index(name)]
+            if name in keys:
+                column[len(arrays):] = [row.get(name, np.nan) for row in objects]
+            columns[name] = column
+        return columns
+
+    @staticmethod
+    def parse(path: str) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+        """
+        Parse a scenario file (bodies incrementally) and run its generator directives.
+
+        Returns:
+            (header, columns) with columns ready for BodyImporter.validate
+
+        Raises:
+            ValueError: if the file is not a valid scenario
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            header_line = f.readline()
+            try:
+                header = json.loads(header_line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid scenario header: {e}") from e
+            if not isinstance(header, dict):
+                raise ValueError("The first line of a scenario must be a JSON object")
+            names = tuple(header.get("columns", ScenarioLoader.DEFAULT_COLUMNS))
+
+            parts = []
+            while True:
+                batch = list(islice(f, ScenarioLoader.BATCH_LINES))
+                if not batch:
+                    break
+                lines = [line for line in batch if line.strip()]
+                if not lines:
+                    continue
+                try:
+                    rows = json.loads("[" + ",".join(lines) + "]")
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Invalid body line in scenario: {e}") from e
+                parts.append(ScenarioLoader._rows_to_columns(rows, names))
+
+        for index, directive in enumerate(header.get("generators", [])):
+            rng = np.random.default_rng(directive.get("seed", index))
+            parts.append(Generators.from_directive(directive, rng))
+
+        return header, ScenarioLoader._merge(parts)
+
+    @staticmethod
+    def _merge(parts: list[dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+        """Concatenate column batches (a column missing from a batch is NaN there)."""
+        names = set().union(*parts) if parts else set(BodyImporter.REQUIRED)
+        merged = {}
+        for name in names:
+            merged[name] = np.concatenate(
+                [part[name] if name in part else np.full(len(next(iter(part.values()))), np.nan)
+                 for part in parts]) if parts else np.empty(0)
+        # Defaults of partially given optional columns
+        for name, default in (("vx", 0.0), ("vy", 0.0)):
+            if name in merged:
+                merged[name] = np.where(np.isnan(merged[name]), default, merged[name])
+        return merged
+
+    # ==================== COMPILED CACHE ====================
+
+    @staticmethod
+    def cache_path(engine, path: str, digest: str) -> str:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return engine.fm.user_data_path(f"{ScenarioLoader.CACHE_FOLDER}/{stem}_{digest[:16]}{Snapshot.EXTENSION}")
+
+    @staticmethod
+    def compile(engine, path: str, digest: str) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+        """Parse a scenario and write its compiled sidecar. Returns (header, columns) as cached."""
+        header, columns = ScenarioLoader.parse(path)
+        if "density" in columns:
+            columns["density"] = np.where(np.isnan(columns["density"]), engine.default_density, columns["density"])
+        columns, skipped = BodyImporter.validate(columns, engine.default_density)
+        if skipped:
+            Logger.warning(f"Scenario {path}: {skipped} invalid body line(s) skipped")
+
+        count = len(columns["x"])
+        compiled = {
+            "number": np.arange(1, count + 1, dtype=np.int64),
+            "x": columns["x"], "y": columns["y"],
+            "vx": columns["vx"], "vy": columns["vy"],
+            "mass": columns["mass"],
+            "radius": columns["radius"] if "radius" in columns else BodyArrays.radius_from(columns["mass"],
+                                                                                          columns["density"]),
+            "density": columns["density"],
+            "age": np.zeros(count),
+            "escaped_frozen": np.zeros(count, dtype=bool),
+        }
+        metadata = {"scenario": header, "source": os.path.basename(path), "sha256": digest}
+
+        cache_path = ScenarioLoader.cache_path(engine, path, digest)
+        try:
+            engine.fm.create_folder(ScenarioLoader.CACHE_FOLDER)
+            Snapshot.write(cache_path + ".tmp", compiled, metadata)
+            engine.fm.replace_file(cache_path + ".tmp", cache_path)
+        except OSError as e:
+            Logger.warning(f"Scenario cache not written ({e}): the next load will parse {path} again")
+        return header, compiled
+
+    # ==================== LOADING ====================
+
+    @staticmethod
+    def apply(engine, header: dict[str, Any], columns: dict[str, np.ndarray]) -> int:
+        """Replace the current scene with a compiled scenario. Returns the number of bodies."""
+        for key, value in header.get("engine", {}).items():
+            if key in ConfigPanel.CONFIG_KEYS and hasattr(engine, key):
+                setattr(engine, key, value)
+
+        camera = header.get("camera", {})
+        if "scale" in camera:
+            engine.camera.scale = float(camera["scale"])
+        if "center" in camera:
+            cx, cy = camera["center"]
+            engine.camera.cam_x = engine.screen.get_width() / 2 - cx * engine.camera.scale
+            engine.camera.cam_y = engine.screen.get_height() / 2 - cy * engine.camera.scale
+
+        # New IDs and ages: the compiled "number" / "age" columns only fill the format
+        bodies = BodyArrays.from_columns(columns, keep_ids=False, keep_ages=False)
+
+        # Mutate in place: other modules hold references to state.circles
+        state.circles.clear()
+        state.circles.extend(bodies)
+        engine.history.clear()
+        if engine.rewind is not None:
+            engine.rewind.mark_dirty()
+        engine.temp_circle = None
+        engine.circle_selected = False
+        engine.time_accumulator = 0.0
+        return len(bodies)
+
+    @staticmethod
+    def load(engine, path: str) -> int:
+        """
+        Load a scenario, from its compiled cache when the content did not change.
+
+        Returns:
+            Number of bodies in the scene
+        """
+        start = time.perf_counter()
+        digest = ScenarioLoader.content_hash(path)
+        cache_path = ScenarioLoader.cache_path(engine, path, digest)
+
+        header = columns = None
+        if os.path.isfile(cache_path):
+            try:
+                metadata, columns = Snapshot.read(cache_path)
+                header = metadata["scenario"]
+                source = "cache"
+            except (OSError, ValueError, KeyError) as e:
+                Logger.warning(f"Scenario cache unreadable ({e}), recompiling {path}")
+        if header is None:
+            header, columns = ScenarioLoader.compile(engine, path, digest)
+            source = "compiled"
+
+        count = ScenarioLoader.apply(engine, header, columns)
+        engine.scenario_name = header.get("name", os.path.splitext(os.path.basename(path))[0])
+        Logger.info(f"Scenario loaded: {path} ({count} bodies, {source}, {time.perf_counter() - start:.2f} s)")
+        return count
+
+    # ==================== PRESETS ====================
+
+    @staticmethod
+    def presets(engine) -> list[str]:
+        """Shipped presets then user scenarios, sorted by file name."""
+        shipped_folder = engine.fm.resource_path(ScenarioLoader.PRESET_FOLDER)
+        shipped = sorted(os.path.join(shipped_folder, name) for name in os.listdir(shipped_folder)
+                         if name.endswith(ScenarioLoader.EXTENSION)) if os.path.isdir(shipped_folder) else []
+        user = sorted(engine.fm.list_files(ScenarioLoader.USER_FOLDER, extension=ScenarioLoader.EXTENSION,
+                                           absolute_paths=True))
+        return shipped + user
+
+    @staticmethod
+    def next_preset(engine) -> Optional[str]:
+        """Load the preset after the last loaded one (wraps around). Returns its path, or None if none exist."""
+        presets = ScenarioLoader.presets(engine)
+        if not presets:
+            return None
+        engine.scenario_index = (engine.scenario_index + 1) % len(presets)
+        path = presets[engine.scenario_index]
+        ScenarioLoader.load(engine, path)
+        return path
@@ -0,0 +1,237 @@
+"""
+Binary simulation snapshots.
+============================
+
+Versioned, columnar save format for a whole simulation state: bodies,
+engine parameters, simulation clock and camera.
+
+File layout (little-endian):
+    0   8 bytes   magic b"GESNAP\\x00\\x00"
+    8   uint32    format version
+    12  uint32    metadata length (bytes)
+    16  uint64    body count
+    24  ...       metadata (UTF-8 JSON: engine, camera, column table)
+    ...           one contiguous array per column (BodyArrays.FIELDS order),
+                  each starting on a 64-byte boundary
+
+Loading memory-maps the file: columns are read straight from the page
+cache, without parsing or copying, then turned into bodies in bulk.
+
+Usage:
+    from snapshot import Snapshot
+
+    path = Snapshot.save(engine)                  # saves/snapshot_<timestamp in ms>.gesnap
+    Snapshot.load(engine, path)                    # replaces the current scene
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+import state
+from body_arrays import BodyArrays
+from config_panel import ConfigPanel
+from logger import Logger
+
+
+class Snapshot:
+    """
+    Static reader / writer for .gesnap files.
+    """
+
+    MAGIC = b"GESNAP\x00\x00"
+    VERSION = 1
+    EXTENSION = ".gesnap"
+    ALIGNMENT = 64
+
+    # magic, version, metadata length, body count
+    _HEADER = struct.Struct("<8sIIQ")
+
+    @staticmethod
+    def _align(offset: int) -> int:
+        return (offset + Snapshot.ALIGNMENT - 1) // Snapshot.ALIGNMENT * Snapshot.ALIGNMENT
+
+    @staticmethod
+    def engine_metadata(engine) -> dict[str, Any]:
+        """Collect the engine parameters, clock and camera stored next to the bodies."""
+        return {
+            "engine_version": getattr(engine, "project_version", "unknown"),
+            "created": time.time(),
+            "engine": {k: getattr(engine, k) for k in ConfigPanel.CONFIG_KEYS if k != "camera_zoom"},
+            "clock": {
+                "simulation_time": engine.simulation_time,
+                "circle_number": engine.circle_number,
+            },
+            "camera": {
+                "cam_x": engine.camera.cam_x,
+                "cam_y": engine.camera.cam_y,
+                "scale": engine.camera.scale,
+            },
+        }
+
+    @staticmethod
+    def encode_parts(columns: dict[str, np.ndarray], metadata: dict[str, Any]) -> list:
+        """
+        Lay out a snapshot as a list of buffers (header, padding, columns).
+
+        The list can be written piece by piece (no full copy in memory)
+        or joined with b"".join() to get the file content.
+        """
+        count = len(columns["x"])
+        column_table = []
+
+        # Column offsets depend on the metadata length, which contains them:
+        # reserve the table first, then grow the data start until it fits.
+        data_start = Snapshot._align(Snapshot._HEADER.size + 1024)
+        while True:
+            offset = data_start
+            column_table.clear()
+            for name in BodyArrays.FIELDS:
+                dtype = np.dtype(BodyArrays.DTYPES[name])
+                column_table.append({"name": name, "dtype": dtype.str, "offset": offset})
+                offset = Snapshot._align(offset + count * dtype.itemsize)
+            meta_bytes = json.dumps({**metadata, "columns": column_table}).encode("utf-8")
+            if Snapshot._HEADER.size + len(meta_bytes) <= data_start:
+                break
+            data_start = Snapshot._align(Snapshot._HEADER.size + len(meta_bytes))
+
+        parts = [Snapshot._HEADER.pack(Snapshot.MAGIC, Snapshot.VERSION, len(meta_bytes), count), meta_bytes]
+        position = Snapshot._HEADER.size + len(meta_bytes)
+        for entry in column_table:
+            parts.append(b"\x00" * (entry["offset"] - position))
+            array = np.ascontiguousarray(columns[entry["name"]], dtype=np.dtype(entry["dtype"]))
+            parts.append(memoryview(array).cast("B"))
+            position = entry["offset"] + array.nbytes
+        return parts
+
+    @staticmethod
+    def read_buffer(buffer) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+        """
+        Parse a snapshot held in any buffer (bytes, mmap, ...).
+
+        Columns are zero-copy views on the buffer.
+
+        Returns:
+            (metadata, columns)
+
+        Raises:
+            ValueError: if the buffer is not a snapshot or has a newer version
+        """
+        if len(buffer) < Snapshot._HEADER.size:
+            raise ValueError("Not a GravityEngine snapshot (file too short)")
+        magic, version, meta_length, count = Snapshot._HEADER.unpack_from(buffer, 0)
+        if magic != Snapshot.MAGIC:
+            raise ValueError("Not a GravityEngine snapshot (bad magic)")
+        if version > Snapshot.VERSION:
+            raise ValueError(f"Snapshot format v{version} is newer than supported v{Snapshot.VERSION}")
+
+        start = Snapshot._HEADER.size
+        metadata = json.loads(bytes(buffer[start:start + meta_length]).decode("utf-8"))
+
+        columns = {}
+        for entry in metadata["columns"]:
+            columns[entry["name"]] = np.frombuffer(buffer, dtype=np.dtype(entry["dtype"]),
+                                                   count=count, offset=entry["offset"])
+        return metadata, columns
+
+    @staticmethod
+    def write(path: str, columns: dict[str, np.ndarray], metadata: dict[str, Any]) -> None:
+        """Write columns and metadata to path (parent folder must exist)."""
+        with open(path, "wb") as f:
+            for part in Snapshot.encode_parts(columns, metadata):
+                f.write(part)
+
+    @staticmethod
+    def read(path: str) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+        """Memory-map a snapshot file and return (metadata, columns)."""
+        with open(path, "rb") as f:
+            # The mapping stays alive as long as the column arrays reference it
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return Snapshot.read_buffer(buffer)
+
+    @staticmethod
+    def apply(engine, metadata: dict[str, Any], columns: dict[str, np.ndarray]) -> int:
+        """
+        Replace the current scene with a parsed snapshot.
+
+        Returns:
+            Number of restored bodies
+        """
+        for key, value in metadata.get("engine", {}).items():
+            if hasattr(engine, key):
+                setattr(engine, key, value)
+
+        clock = metadata.get("clock", {})
+        engine.simulation_time = clock.get("simulation_time", engine.simulation_time)
+
+        camera = metadata.get("camera", {})
+        engine.camera.cam_x = camera.get("cam_x", engine.camera.cam_x)
+        engine.camera.cam_y = camera.get("cam_y", engine.camera.cam_y)
+        engine.camera.scale = camera.get("scale", engine.camera.scale)
+
+        bodies = BodyArrays.from_columns(columns)
+        engine.circle_number = max(engine.circle_number, clock.get("circle_number", 0))
+
+        # Mutate in place: other modules hold references to state.circles
+        state.circles.clear()
+        state.circles.extend(bodies)
+        # Undo records and rewind keyframes describe the replaced scene
+        engine.history.clear()
+        if engine.rewind is not None:
+            engine.rewind.mark_dirty()
+        engine.temp_circle = None
+        engine.circle_selected = False
+        engine.time_accumulator = 0.0
+        return len(bodies)
+
+    @staticmethod
+    def save(engine, path: Optional[str] = None) -> str:
+        """
+        Save the current simulation to saves/ (or to an explicit path).
+
+        Returns:
+            Path of the written file
+        """
+        if path is None:
+            engine.fm.create_folder("saves")
+            # Millisecond timestamp, plus a counter if two saves still share it (never overwrite)
+            stem = engine.fm.user_data_path(f"saves/snapshot_{int(time.time() * 1000)}")
+            path, counter = f"{stem}{Snapshot.EXTENSION}", 1
+            while os.path.exists(path):
+                path, counter = f"{stem}_{counter}{Snapshot.EXTENSION}", counter + 1
+
+        columns = BodyArrays.to_columns()
+        Snapshot.write(path, columns, Snapshot.engine_metadata(engine))
+        Logger.info(f"Snapshot saved: {path} ({len(columns['x'])} bodies)")
+        return path
+
+    @staticmethod
+    def load(engine, path: Optional[str] = None) -> Optional[str]:
+        """
+        Load a snapshot (default: the most recent one in saves/).
+
+        Returns:
+            Path of the loaded file, or None if no snapshot exists
+        """
+        if path is None:
+            path = Snapshot.latest(engine)
+            if path is None:
+                return None
+
+        metadata, columns = Snapshot.read(path)
+        count = Snapshot.apply(engine, metadata, columns)
+        Logger.info(f"Snapshot loaded: {path} ({count} bodies)")
+        return path
+
+    @staticmethod
+    def latest(engine) -> Optional[str]:
+        """Return the most recent snapshot in saves/, or None."""
+        files = engine.fm.list_files("saves", extension=Snapshot.EXTENSION, absolute_paths=True)
+        if not files:
+            return None
+        return max(files, key=os.path.getmtime)
@@ -0,0 +1,118 @@
+"""
+Pre-rendered body sprites.
+==========================
+
+Drawing a body costs two pygame.draw.circle calls (outline or selection
+ring, then the body). Bodies of the same screen radius, color and outline
+style look exactly the same, so SpriteCache renders each combination once
+(with Circle.paint, the same code as the direct path) and FrameData.draw
+pushes all visible bodies to the screen with one Surface.blits call.
+
+Sprites are keyed by (screen radius, color, outline style, antialiasing)
+and evicted least recently used beyond `capacity`. Screen radii are
+integers already (Circle.draw_at truncates them), so every radius is its
+own bucket; bodies larger than MAX_RADIUS are drawn directly instead of
+caching big surfaces.
+
+Without antialiasing, sprites are colorkeyed and pixel-identical to the
+direct path. With antialiasing, they are per-pixel alpha surfaces whose
+circle edges are smoothed (pygame.gfxdraw).
+
+Usage:
+    from sprite_cache import SpriteCache
+
+    sprites = SpriteCache(capacity=512)
+    frame.draw(screen, sprites)          # in Engine.render
+    sprite, half = sprites.get(5, (255, 255, 255), "shadow")
+"""
+
+from collections import OrderedDict
+
+import pygame
+import pygame.gfxdraw
+
+from circle import Circle
+from color import Display
+
+
+class SpriteCache:
+    """
+    LRU cache of pre-rendered body surfaces.
+    """
+
+    # Larger bodies are few and their sprites would be big: drawn directly
+    MAX_RADIUS = 64
+    # Transparent color of non-antialiased sprites (replaced if a body uses it)
+    COLORKEY: tuple[int, int, int] = (255, 0, 255)
+    _FALLBACK_COLORKEY: tuple[int, int, int] = (1, 2, 3)
+
+    def __init__(self, capacity: int = 512, antialias: bool = False):
+        """
+        Args:
+            capacity: Max number of cached sprites
+            antialias: Smooth the circle edges (per-pixel alpha sprites)
+        """
+        self.capacity = capacity
+        self.antialias = antialias
+        self._sprites: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def clear(self) -> None:
+        self._sprites.clear()
+
+    def get(self, radius: int, color: tuple, style: str) -> tuple[pygame.Surface, int]:
+        """
+        Return (sprite, half size): blit the sprite at (x - half, y - half)
+        to draw a body centered on (x, y).
+
+        Args:
+            radius: Screen radius of the body (1..MAX_RADIUS)
+            color: Body color as a tuple (Color.value)
+            style: Outline style, see Circle.display_style
+        """
+        key = (radius, color, style, self.antialias)
+        entry = self._sprites.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = self._render(radius, color, style)
+        self._sprites[key] = entry
+        if len(self._sprites) > self.capacity:
+            self._sprites.popitem(last=False)
+        return entry
+
+    def _render(self, radius: int, color: tuple, style: str) -> tuple[pygame.Surface, int]:
+        half = Circle.outline_radius(radius, style) + 1
+        size = 2 * half + 1
+        display_ready = pygame.display.get_surface() is not None
+
+        if self.antialias:
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            Circle.paint(sprite, half, half, radius, color, style)
+            outline = Circle.outline_radius(radius, style)
+            if style == "ring":
+                pygame.gfxdraw.aacircle(sprite, half, half, outline, Display.DUCKY_GREEN)
+            elif style == "shadow":
+                pygame.gfxdraw.aacircle(sprite, half, half, outline, Display.DARK_GREY)
+            pygame.gfxdraw.aacircle(sprite, half, half, radius, color)
+            if display_ready:
+                sprite = sprite.convert_alpha()
+            return sprite, half
+
+        colorkey = SpriteCache.COLORKEY
+        if colorkey in (tuple(color[:3]), Display.DUCKY_GREEN.rgb, Display.DARK_GREY.rgb):
+            colorkey = SpriteCache._FALLBACK_COLORKEY
+        sprite = pygame.Surface((size, size))
+        if display_ready:
+            sprite = sprite.convert()
+        sprite.fill(colorkey)
+        Circle.paint(sprite, half, half, radius, color, style)
+        sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+        return sprite, half
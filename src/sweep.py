@@ -0,0 +1,243 @@
+"""
+Parameter sweep runner for GravityEngine.
+=========================================
+
+Expands a grid of engine parameters (x seeds x scenarios) and runs every
+combination as a headless simulation in a process pool, one simulation per
+worker at a time. Each run owns its engine random stream (``Engine.rng``),
+seeded from the run's seed, so results are reproducible and independent of
+scheduling. Per-run summary metrics are appended to a single CSV table in
+``user_data/sweeps/`` as soon as each run finishes.
+
+Usage:
+    python src/sweep.py --steps 2000 --seeds 0-7 \\
+        --param time_acceleration=1e4,2e4 --param default_density=1e3,5.514e3
+
+    from sweep import SweepRunner
+    runner = SweepRunner({"time_acceleration": [1e4, 2e4]}, seeds=range(8), steps=2000)
+    table_path = runner.run()
+"""
+
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Optional
+
+from atlas import FileManager
+
+
+# Scenario name -> function populating a freshly created engine.
+# Functions receive the engine and must only append to state.circles.
+SCENARIOS: dict[str, Callable[[Any], None]] = {
+    "random_environment": lambda engine: engine.generate_environment(),
+}
+
+# Columns written before the swept parameters and after them
+_LEADING_COLUMNS = ["run_id", "scenario", "seed"]
+_METRIC_COLUMNS = [
+    "steps", "simulated_seconds", "bodies_initial", "bodies_final", "fusions",
+    "total_mass", "kinetic_energy", "heaviest_mass", "wall_seconds", "error",
+]
+
+
+def _run_single(run: dict) -> dict:
+    """
+    Execute one headless simulation and return its summary metrics.
+
+    Runs inside a worker process: the engine, the body list and the random
+    stream are all private to this process.
+
+    Args:
+        run: Dict with keys run_id, scenario, seed, steps and params
+    """
+    # No window and no audio device in workers
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    import pygame
+    import state
+    from main import Engine
+
+    if not pygame.get_init():
+        pygame.init()
+
+    row = {"run_id": run["run_id"], "scenario": run["scenario"], "seed": run["seed"]}
+    row.update(run["params"])
+
+    start = time.perf_counter()
+    try:
+        engine = Engine(headless=True, seed=run["seed"])
+        state.circles.clear()
+
+        for key, value in run["params"].items():
+            if not hasattr(engine, key):
+                raise AttributeError(f"Unknown engine parameter '{key}'")
+            setattr(engine, key, value)
+
+        SCENARIOS[run["scenario"]](engine)
+        bodies_initial = len(state.circles)
+
+        for _ in range(run["steps"]):
+            engine.physics_step_with_substeps(engine.physics_timestep)
+
+        # Bodies absorbed during the last step are only removed at the next one
+        alive = [circle for circle in state.circles if not circle.suicide]
+        row.update({
+            "steps": run["steps"],
+            "simulated_seconds": engine.net_simulation_time() * engine.time_acceleration,
+            "bodies_initial": bodies_initial,
+            "bodies_final": len(alive),
+            "fusions": bodies_initial - len(alive),
+            "total_mass": sum(circle.mass for circle in alive),
+            "kinetic_energy": sum(circle.kinetic_energy() for circle in alive),
+            "heaviest_mass": max((circle.mass for circle in alive), default=0.0),
+            "error": "",
+        })
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+
+    row["wall_seconds"] = time.perf_counter() - start
+    return row
+
+
+class SweepRunner:
+    """
+    Expands a parameter grid and runs it on a process pool.
+
+    Attributes:
+        grid: Engine attribute name -> list of values to sweep
+        seeds: Seeds of the runs (each grid point is run once per seed)
+        scenarios: Names from SCENARIOS (each grid point is run once per scenario)
+        steps: Number of fixed physics steps per run
+        workers: Process count (default: every core of the machine)
+    """
+
+    def __init__(self,
+                 grid: dict[str, list],
+                 seeds: Iterable[int] = (0,),
+                 scenarios: Iterable[str] = ("random_environment",),
+                 steps: int = 1000,
+                 workers: Optional[int] = None,
+                 fm: Optional[FileManager] = None):
+        self.grid = dict(grid)
+        self.seeds = list(seeds)
+        self.scenarios = list(scenarios)
+        self.steps = int(steps)
+        self.workers = workers or os.cpu_count() or 1
+        self.fm = fm or FileManager(project_name="GravityEngine", dev_data_folder="user_data", use_documents=True)
+
+        for name in self.scenarios:
+            if name not in SCENARIOS:
+                raise ValueError(f"Unknown scenario '{name}' (available: {', '.join(SCENARIOS)})")
+
+    def expand(self) -> list[dict]:
+        """Return the list of runs (cartesian product of grid, scenarios and seeds)."""
+        names = list(self.grid)
+        runs = []
+        for values in itertools.product(*(self.grid[name] for name in names)):
+            for scenario in self.scenarios:
+                for seed in self.seeds:
+                    runs.append({
+                        "run_id": len(runs),
+                        "scenario": scenario,
+                        "seed": seed,
+                        "steps": self.steps,
+                        "params": dict(zip(names, values)),
+                    })
+        return runs
+
+    def run(self, output: Optional[str] = None) -> str:
+        """
+        Run the whole sweep and write the results table.
+
+        Rows are flushed as runs complete, so an interrupted sweep keeps
+        every finished result.
+
+        Args:
+            output: CSV path (default: user_data/sweeps/sweep_<timestamp>.csv)
+
+        Returns:
+            Path of the results table
+        """
+        runs = self.expand()
+        if output is None:
+            folder = self.fm.create_folder("sweeps")
+            output = os.path.join(folder, f"sweep_{int(time.time())}.csv")
+
+        columns = _LEADING_COLUMNS + list(self.grid) + _METRIC_COLUMNS
+        # "spawn" gives every worker a clean interpreter (no inherited SDL state)
+        context = multiprocessing.get_context("spawn")
+
+        with open(output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            with ProcessPoolExecutor(max_workers=min(self.workers, max(1, len(runs))), mp_context=context) as pool:
+                futures = [pool.submit(_run_single, run) for run in runs]
+                for done, future in enumerate(as_completed(futures), start=1):
+                    row = future.result()
+                    writer.writerow(row)
+                    f.flush()
+                    status = "failed" if row["error"] else f"{row['wall_seconds']:.1f} s"
+                    print(f"[{done}/{len(runs)}] run {row['run_id']} {status}")
+
+        print(f"✓ Sweep results: {output}")
+        return output
+
+
+def _parse_value(text: str) -> Any:
+    """Parse a command line value: bool, int, float, or raw string."""
+    lowered = text.strip().lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _parse_seeds(text: str) -> list[int]:
+    """Parse "0-7" or "1,5,9" into a list of seeds."""
+    if "-" in text and "," not in text:
+        first, last = text.split("-", 1)
+        return list(range(int(first), int(last) + 1))
+    return [int(seed) for seed in text.split(",")]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a headless GravityEngine parameter sweep.")
+    parser.add_argument("--param", action="append", default=[],
+                        help="name=v1,v2,... engine attribute to sweep (repeatable)")
+    parser.add_argument("--seeds", default="0", help='seed list: "0-7" or "1,5,9"')
+    parser.add_argument("--scenario", action="append", default=None,
+                        help=f"scenario to run (repeatable, available: {', '.join(SCENARIOS)})")
+    parser.add_argument("--steps", type=int, default=1000, help="physics steps per run")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", default=None, help="results CSV path")
+    args = parser.parse_args(argv)
+
+    grid = {}
+    for spec in args.param:
+        name, _, values = spec.partition("=")
+        if not values:
+            parser.error(f"--param expects name=v1,v2,... (got '{spec}')")
+        grid[name.strip()] = [_parse_value(v) for v in values.split(",")]
+
+    runner = SweepRunner(
+        grid,
+        seeds=_parse_seeds(args.seeds),
+        scenarios=args.scenario or ["random_environment"],
+        steps=args.steps,
+        workers=args.workers,
+    )
+    runner.run(args.output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+Streaming CSV telemetry export.
+===============================
+
+Samples per-body state every K physics steps and streams it to CSV files
+in user_data/telemetry/. The frame loop only copies a few floats per body
+into a bounded queue; a background thread formats the rows and writes them
+in large buffered chunks, rotating files when they grow too big.
+
+When the writer cannot keep up, the queue policy decides what happens:
+    "drop_oldest"  : discard the oldest queued sample (default, never blocks)
+    "drop_newest"  : discard the sample being pushed (never blocks)
+    "block"        : wait up to block_timeout for room (backpressure), then drop
+Every discarded body row is counted in dropped_rows.
+
+Usage:
+    from telemetry import TelemetryExporter
+
+    exporter = TelemetryExporter(engine.fm.create_folder("telemetry"), sample_every=10)
+    exporter.start()
+    exporter.on_physics_step(engine)   # called by Engine.physics_step
+    exporter.stop()
+"""
+
+import csv
+import io
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+import state
+from logger import Logger
+
+
+class TelemetryExporter:
+    """
+    Bounded-queue CSV exporter with a background writer thread.
+    """
+
+    COLUMNS: tuple[str, ...] = ("time", "id", "x", "y", "vx", "vy", "mass", "fx", "fy")
+    POLICIES: tuple[str, ...] = ("drop_oldest", "drop_newest", "block")
+
+    def __init__(self,
+                 folder: str,
+                 sample_every: int = 10,
+                 policy: str = "drop_oldest",
+                 queue_size: int = 256,
+                 block_timeout: float = 0.005,
+                 chunk_bytes: int = 1 << 20,
+                 rotate_bytes: int = 256 << 20,
+                 flush_interval: float = 1.0):
+        """
+        Args:
+            folder: Output folder (created by the FileManager)
+            sample_every: Sample once every K physics steps
+            policy: Queue-full policy, one of POLICIES
+            queue_size: Max number of queued samples (one sample = all bodies at one step)
+            block_timeout: Max wait of the "block" policy, in seconds
+            chunk_bytes: Formatted rows are written once this many bytes are buffered
+            rotate_bytes: A new file is started once the current one reaches this size
+            flush_interval: Max delay before buffered rows reach the disk, in seconds
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown telemetry policy '{policy}' (expected one of {self.POLICIES})")
+
+        self.folder = folder
+        self.sample_every = max(1, int(sample_every))
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.chunk_bytes = chunk_bytes
+        self.rotate_bytes = rotate_bytes
+        self.flush_interval = flush_interval
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._steps = 0
+
+        # Statistics (read by the HUD)
+        self.sampled_rows = 0
+        self.dropped_rows = 0
+        self.written_rows = 0
+        self.files: list[str] = []
+
+        self._session = time.strftime("%Y%m%d_%H%M%S")
+        self._file = None
+        self._file_bytes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background writer."""
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._writer_loop, name="TelemetryWriter", daemon=True)
+        self._thread.start()
+        Logger.info(f"Telemetry export started (every {self.sample_every} steps, policy={self.policy})")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush pending samples and stop the writer (blocks up to timeout)."""
+        if not self.running:
+            return
+        # The sentinel must get in even if the queue is full
+        while True:
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                if not self.running:
+                    break
+        self._thread.join(timeout)
+        Logger.info(f"Telemetry export stopped ({self.written_rows} rows written, "
+                    f"{self.dropped_rows} dropped, files: {len(self.files)})")
+
+    # ==================== MAIN THREAD ====================
+
+    def on_physics_step(self, engine) -> None:
+        """Count a physics step and push a sample every sample_every steps."""
+        self._steps += 1
+        if self._steps % self.sample_every != 0 or not self.running:
+            return
+
+        sim_time = engine.net_simulation_time() * engine.time_acceleration
+        # Plain tuples: cheap to build here, formatted on the writer thread
+        rows = [
+            (c.number, c.x, c.y, c.vx, c.vy, c.mass, c.printed_force[0], c.printed_force[1])
+            for c in state.circles if not c.suicide
+        ]
+        self.sampled_rows += len(rows)
+        self._push((sim_time, rows))
+
+    def _push(self, sample) -> None:
+        if self.policy == "block":
+            try:
+                self._queue.put(sample, timeout=self.block_timeout)
+            except queue.Full:
+                self.dropped_rows += len(sample[1])
+            return
+
+        try:
+            self._queue.put_nowait(sample)
+            return
+        except queue.Full:
+            pass
+
+        if self.policy == "drop_newest":
+            self.dropped_rows += len(sample[1])
+            return
+
+        # drop_oldest: make room by discarding the head of the queue
+        try:
+            oldest = self._queue.get_nowait()
+            if oldest is not None:
+                self.dropped_rows += len(oldest[1])
+        except queue.Empty:
+            pass
+        try:
+            self._queue.put_nowait(sample)
+        except queue.Full:
+            self.dropped_rows += len(sample[1])
+
+    # ==================== WRITER THREAD ====================
+
+    def _open_next_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        path = os.path.join(self.folder, f"telemetry_{self._session}_{len(self.files):03d}.csv")
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        header = ",".join(self.COLUMNS) + "\n"
+        self._file.write(header)
+        self._file_bytes = len(header)
+        self.files.append(path)
+
+    def _write_chunk(self, text: str) -> None:
+        if self._file is None or self._file_bytes >= self.rotate_bytes:
+            self._open_next_file()
+        self._file.write(text)
+        self._file.flush()
+        self._file_bytes += len(text)
+
+    def _writer_loop(self) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        pending_rows = 0
+        last_flush = time.monotonic()
+        running = True
+
+        try:
+            while running:
+                try:
+                    sample = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    sample = ...  # timeout: only flush
+
+                if sample is None:
+                    running = False
+                elif sample is not ...:
+                    sim_time, rows = sample
+                    writer.writerows((sim_time, *row) for row in rows)
+                    pending_rows += len(rows)
+
+                now = time.monotonic()
+                if buffer.tell() >= self.chunk_bytes or (pending_rows and (not running or now - last_flush >= self.flush_interval)):
+                    self._write_chunk(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+                    self.written_rows += pending_rows
+                    pending_rows = 0
+                    last_flush = now
+        except OSError as e:
+            Logger.exception(f"Telemetry writer failed: {e}")
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
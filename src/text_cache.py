@@ -0,0 +1,83 @@
+"""
+Cached text rendering.
+======================
+
+Rasterizing a string (Font.render) costs far more than blitting it, and
+the HUD, the help overlay and the notifications draw mostly the same
+strings every frame. TextCache keeps:
+
+    - one pygame.font.Font per (path, size): fonts are no longer
+      constructed on the fly by the help overlay, splash screen or prompts
+    - the rendered surfaces, keyed by (text, font, color, antialias), with
+      least recently used eviction beyond `capacity`
+
+Changing strings (FPS, ages, counters) still miss the cache; the HUD
+refresh rate (Engine.hud_refresh_rate) bounds how often they are
+rendered.
+
+Usage:
+    from text_cache import TextCache
+
+    texts = TextCache(capacity=256)
+    font = texts.font(engine.used_font, 30)
+    surface = texts.render("Pause : Enabled", font, Display.BLUE)
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """
+    Font objects by (path, size) and LRU cache of rendered text surfaces.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Args:
+            capacity: Max number of cached text surfaces
+        """
+        self.capacity = capacity
+        self._fonts: dict[tuple, pygame.font.Font] = {}
+        self._surfaces: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+
+    def font(self, path: str, size: int) -> pygame.font.Font:
+        """Font of this file and size (loaded once)."""
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.Font(path, size)
+        return font
+
+    def render(self, text: str, font: pygame.font.Font, color, antialias: bool = True) -> pygame.Surface:
+        """
+        Rendered text surface (do not draw on it: it is shared).
+
+        Args:
+            text: String to render
+            font: Font to render with (fonts are keyed by identity)
+            color: RGB(A) tuple or Color
+            antialias: Smooth glyph edges
+        """
+        key = (text, font, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
@@ -0,0 +1,247 @@
+"""
+Fixed-memory orbit trails.
+==========================
+
+Every trail lives in one preallocated NumPy ring buffer of shape
+(max bodies, trail length, 2): memory is fixed when the buffer is created,
+whatever the session length. Every Engine.trail_sample_every physics steps,
+the world position of each tracked body is written at the shared ring
+cursor (one vectorized write for all bodies).
+
+Slots are assigned on first sample (the selected body first) and recycled
+as soon as a body is marked `suicide` by Circle.fusion or leaves
+state.circles (deletion, escape policy, undo, rewind...). Beyond
+`max_bodies` tracked bodies, the others have no trail until a slot frees.
+
+Rendering (only bodies visible in the frame, plus the selected body):
+    - ring order → time order and world → screen transform, into a
+      preallocated scratch buffer of the same size as the ring
+    - distance-based decimation: points closer than
+      Engine.trail_min_spacing_px (along the trail) to the previous kept
+      point are skipped (computed in preallocated scratch buffers too)
+    - fading: each trail is drawn in FADE_BANDS pygame.draw.lines calls,
+      from the background color (oldest) to the body color (newest)
+    - the trail ends at the interpolated position of the body
+
+Usage:
+    from trails import TrailBuffer
+
+    trails = TrailBuffer(max_bodies=2048, length=240)
+    trails.on_physics_step(engine)         # at the end of Engine.physics_step
+    trails.draw(engine.screen, frame, engine)   # in Engine.render_world
+"""
+
+from itertools import chain
+from operator import attrgetter
+from typing import Optional
+
+import numpy as np
+import pygame
+
+import state
+from circle import Circle
+from color import Display
+
+
+class TrailBuffer:
+    """
+    Ring buffer of the recent world positions of up to `max_bodies` bodies.
+    """
+
+    # Color steps from the oldest to the newest part of a trail
+    FADE_BANDS = 4
+    # Screen coordinates are clamped to this range before drawing (far off-screen points)
+    SCREEN_LIMIT = 1e6
+
+    _get_position = attrgetter("x", "y")
+    _get_selected = attrgetter("is_selected")
+    _get_suicide = attrgetter("suicide")
+
+    def __init__(self, max_bodies: int = 2048, length: int = 240):
+        """
+        Args:
+            max_bodies: Max number of bodies with a trail (slots)
+            length: Points per trail
+        """
+        self.max_bodies = max_bodies
+        self.length = length
+        self.points = np.zeros((max_bodies, length, 2), dtype=np.float64)
+        self.filled = np.zeros(max_bodies, dtype=np.int64)  # Valid points per slot
+        self.cursor = -1  # Ring index of the newest sample (-1 = nothing sampled yet)
+        self._slots: dict[int, int] = {}  # id(body) -> slot
+        self._free: list[int] = list(range(max_bodies - 1, -1, -1))
+        self._keys: list[int] = []  # ids of the bodies at the last sample (unchanged list = same slots)
+        self._tracked: list[Circle] = []  # Bodies with a slot, in the order of _indices
+        self._indices = np.empty(0, dtype=np.int64)
+        self._steps = 0
+
+        # Drawing scratch (time-ordered screen coordinates, decimation), allocated once
+        self._screen = np.empty_like(self.points)
+        self._index = np.empty((max_bodies, length), dtype=np.int64)
+        self._step = np.empty((2, max_bodies, max(length - 1, 0)), dtype=np.float64)  # Segment length, distance along
+        self._keep = np.empty((2, max_bodies, length), dtype=bool)  # Kept points, filled points
+        self._columns = np.arange(length)
+        # Kept points, float32 is exact enough for pixels (coordinates are clamped to SCREEN_LIMIT)
+        self._kept = np.empty((max_bodies * length, 2), dtype=np.float32)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the ring and the drawing scratch (bytes)."""
+        return sum(array.nbytes for array in (self.points, self.filled, self._screen, self._index,
+                                              self._step, self._keep, self._kept))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def clear(self) -> None:
+        """Forget every trail (slots are all freed, memory is kept)."""
+        self._slots.clear()
+        self._keys, self._tracked, self._indices = [], [], np.empty(0, dtype=np.int64)
+        self._free = list(range(self.max_bodies - 1, -1, -1))
+        self.filled[:] = 0
+        self.cursor = -1
+
+    def slot(self, body: Circle) -> Optional[int]:
+        return self._slots.get(id(body))
+
+    # ==================== SAMPLING ====================
+
+    def on_physics_step(self, engine) -> None:
+        """Sample the bodies every Engine.trail_sample_every physics steps."""
+        self._steps += 1
+        if self._steps % max(1, int(engine.trail_sample_every)):
+            return
+        self.sample(state.circles)
+
+    def sample(self, bodies: list[Circle]) -> None:
+        """Write the current position of the bodies at the next ring index."""
+        keys = list(map(id, bodies))
+        selected = next(filter(TrailBuffer._get_selected, bodies), None)
+        if (keys != self._keys or any(map(TrailBuffer._get_suicide, bodies))
+                or (selected is not None and id(selected) not in self._slots)):
+            self._assign(bodies, selected)
+            self._keys = keys
+        tracked = self._tracked
+        if not tracked:
+            return
+
+        self.cursor = (self.cursor + 1) % self.length
+        indices = self._indices
+        self.points[indices, self.cursor] = np.fromiter(
+            chain.from_iterable(map(TrailBuffer._get_position, tracked)), np.float64, 2 * len(tracked)
+        ).reshape(-1, 2)
+        self.filled[indices] = np.minimum(self.filled[indices] + 1, self.length)
+
+    def _assign(self, bodies: list[Circle], selected: Optional[Circle]) -> None:
+        """Give a slot to the new bodies (selected first) and recycle those of merged / removed ones."""
+        slots, free, filled = self._slots, self._free, self.filled
+        if selected is not None and id(selected) not in slots and not free and slots:
+            # Every slot is taken: the selected body gets the slot of another body
+            free.append(slots.pop(next(iter(slots))))
+        live: dict[int, int] = {}
+        tracked: list[Circle] = []
+        for body in chain((selected,) if selected is not None else (), bodies):
+            key = id(body)
+            if body.suicide or key in live:
+                continue  # Merged bodies: their slot is recycled below
+            slot = slots.get(key)
+            if slot is None:
+                if not free:
+                    continue
+                slot = free.pop()
+                filled[slot] = 0
+            live[key] = slot
+            tracked.append(body)
+
+        # Slots of the bodies gone since the last sample are recycled
+        for key in slots.keys() - live.keys():
+            free.append(slots[key])
+        # Tracked bodies stay referenced, so their ids cannot be reused by new bodies
+        self._slots, self._tracked = live, tracked
+        self._indices = np.fromiter(live.values(), np.int64, len(live))
+
+    # ==================== RENDERING ====================
+
+    def draw(self, screen: pygame.Surface, frame, engine) -> None:
+        """
+        Draw the trails of the visible bodies of the frame (and of the selected body).
+
+        Args:
+            screen: Target surface
+            frame: FrameData of the current frame (trails end at the interpolated positions)
+            engine: Running engine (camera, trail settings, screen mode)
+        """
+        if self.cursor < 0 or not self._slots:
+            return
+        slots, bodies = self._slots, frame.bodies
+        candidates = np.union1d(frame.visible, np.flatnonzero(frame.selected)).tolist()
+        drawn = [(i, slot) for i, slot in zip(candidates, (slots.get(id(bodies[i])) for i in candidates))
+                 if slot is not None]
+        if not drawn:
+            return
+        count = len(drawn)
+        length = self.length
+        bodies_index = np.fromiter((i for i, _ in drawn), np.int64, count)
+        slot_index = np.fromiter((slot for _, slot in drawn), np.int64, count)
+
+        # Time order (oldest first) and screen transform, in the scratch buffers
+        order = np.arange(self.cursor + 1, self.cursor + 1 + length) % length
+        index = self._index[:count]
+        np.add((slot_index * length)[:, None], order[None, :], out=index)
+        points = self._screen[:count]
+        np.take(self.points.reshape(-1, 2), index, axis=0, out=points)
+        camera = engine.camera
+        points *= camera.scale
+        points[..., 0] += camera.cam_x
+        points[..., 1] += camera.cam_y
+        np.clip(points, -TrailBuffer.SCREEN_LIMIT, TrailBuffer.SCREEN_LIMIT, out=points)
+
+        # Decimation: keep a point when the distance along the trail crosses a multiple of the spacing
+        # (every step writes into the scratch buffers, nothing of size count x length is allocated)
+        spacing = max(float(engine.trail_min_spacing_px), 1e-3)
+        step, along = self._step[0, :count], self._step[1, :count]
+        np.subtract(points[:, 1:, 0], points[:, :-1, 0], out=step)
+        np.subtract(points[:, 1:, 1], points[:, :-1, 1], out=along)
+        np.hypot(step, along, out=step)
+        np.cumsum(step, axis=1, out=along)
+        along *= 1 / spacing
+        bucket = np.floor(along, out=along)
+        keep, filled = self._keep[0, :count], self._keep[1, :count]
+        keep[:, :2] = True  # First bucket (along >= 0) differs from "none"
+        np.not_equal(bucket[:, 1:], bucket[:, :-1], out=keep[:, 2:])
+        starts = length - self.filled[slot_index]
+        keep[np.arange(count), starts] = True  # Oldest valid point of each trail
+        np.greater_equal(self._columns, starts[:, None], out=filled)
+        keep &= filled  # Slots not yet filled hold no point
+        # Only the kept points are converted to Python, in one call
+        sizes = np.count_nonzero(keep, axis=1)
+        kept = np.compress(keep.ravel(), points.reshape(-1, 2), axis=0,
+                           out=self._kept[:int(sizes.sum())]).tolist()
+        sizes = sizes.tolist()
+
+        # Fading shades, computed once per distinct color (bodies share the palette objects)
+        background = (Display.BLACK if engine.screen_mode == "dark" else Display.WHITE).rgb
+        bands = TrailBuffer.FADE_BANDS
+        shades: dict[int, list] = {}
+
+        draw_lines = pygame.draw.lines
+        heads = zip(frame.screen_x[bodies_index].tolist(), frame.screen_y[bodies_index].tolist())
+        offset = 0
+        for (i, _), size, head in zip(drawn, sizes, heads):
+            polyline = kept[offset:offset + size]
+            polyline.append(head)
+            offset += size
+            body = bodies[i]
+            color = Display.DUCKY_GREEN if body.is_selected else body.color
+            palette = shades.get(id(color))
+            if palette is None:
+                rgb = color.rgb
+                palette = shades[id(color)] = [
+                    tuple(int(b + (c - b) * (band + 1) / bands) for b, c in zip(background, rgb))
+                    for band in range(bands)]
+            # Bands share their boundary point so that the line stays continuous
+            last = len(polyline) - 1
+            for band in range(bands):
+                first, end = band * last // bands, (band + 1) * last // bands
+                if end > first:
+                    draw_lines(screen, palette[band], False, polyline[first:end + 1])
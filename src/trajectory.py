@@ -0,0 +1,649 @@
+"""
+Chunked columnar trajectory recordings.
+=======================================
+
+Records the full history of a run (every K physics steps) to
+user_data/recordings/, and reads arbitrary time windows back without
+loading the file.
+
+Data file (<name>.getraj, little-endian):
+    header  : magic b"GETRAJ\\x00\\x00", uint32 version, uint32 metadata length,
+              metadata (UTF-8 JSON), zero padding to 64 bytes
+    chunks  : appended one after the other, each one is
+              chunk header (magic b"CHNK", uint32 frames, uint32 slots, uint32 flags, uint64 payload bytes)
+              times   float64[frames]          engine clock (Engine.simulation_time) of each frame
+              ids     int64[slots]             slot -> body ID table of the chunk
+              <field> float64[frames, slots]   one block per field of FIELDS (NaN = body absent)
+              (chunks with flags & CHUNK_ENCODED hold a StateCodec payload instead, see codec.py;
+              with an AdaptiveSampler, NaN between two samples of a body = skipped, see sampling.py)
+
+Index file (<name>.getraj.idx): small header then one fixed-size record per
+chunk (time range, byte offset, size, shape, bounding box of every body
+position in the chunk, offset of its bounds record). Readers memory-map
+all files and binary-search the index to seek to any time.
+
+Bounds file (<name>.getraj.bbox): magic b"GETRJBOX", then one record per
+chunk, BOUNDS_DTYPE[slots] (body ID + bounding box of its positions over
+the chunk). Spatial queries (see trajectory_query.py) prune chunks with
+the index and bodies with these records before reading any payload.
+
+A chunk keeps the same slot table for all its frames. Bodies removed by
+fusion leave NaN in their slot; a body appearing closes the current chunk
+so that the next one gets a new slot table.
+
+Usage:
+    from trajectory import TrajectoryRecorder, TrajectoryReader
+
+    recorder = TrajectoryRecorder(path, sample_every=1)                  # raw float64
+    recorder = TrajectoryRecorder(path, codec=StateCodec(position_error=1e-3))  # compact
+    recorder = TrajectoryRecorder(path, codec=codec, sampler=AdaptiveSampler(tolerance=0.5))  # decimated
+    recorder.on_physics_step(engine)   # called by Engine.physics_step
+    recorder.close()
+
+    reader = TrajectoryReader(path)
+    t, ids, values = reader.frame_at(12.5)
+    times, track = reader.track(42, t0=0.0, t1=30.0)
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+import state
+from codec import StateCodec
+from logger import Logger
+from sampling import AdaptiveSampler
+
+
+# Per-body fields stored in every chunk
+FIELDS: tuple[str, ...] = ("x", "y", "vx", "vy", "fx", "fy", "mass", "radius", "density")
+
+MAGIC = b"GETRAJ\x00\x00"
+INDEX_MAGIC = b"GETRJIDX"
+VERSION = 2  # v2: encoded chunks (CHUNK_ENCODED flag)
+INDEX_VERSION = 2  # v2: bounding boxes + bounds file
+EXTENSION = ".getraj"
+INDEX_EXTENSION = ".idx"
+BOUNDS_EXTENSION = ".bbox"
+BOUNDS_MAGIC = b"GETRJBOX"
+NO_BOUNDS = np.iinfo(np.uint64).max  # bounds_offset of chunks without a bounds record
+
+# magic, version, metadata length
+_HEADER = struct.Struct("<8sII")
+# magic, frames, slots, flags, payload bytes
+_CHUNK = struct.Struct("<4sIIIQ")
+_CHUNK_MAGIC = b"CHNK"
+CHUNK_ENCODED = 1
+# magic, version, record size
+_INDEX_HEADER = struct.Struct("<8sII")
+
+_INDEX_DTYPE_V1 = np.dtype([
+    ("t_start", "<f8"),
+    ("t_end", "<f8"),
+    ("offset", "<u8"),
+    ("nbytes", "<u8"),
+    ("frames", "<u4"),
+    ("slots", "<u4"),
+])
+INDEX_DTYPE = np.dtype(_INDEX_DTYPE_V1.descr + [
+    ("x_min", "<f8"),
+    ("x_max", "<f8"),
+    ("y_min", "<f8"),
+    ("y_max", "<f8"),
+    ("bounds_offset", "<u8"),
+])
+BOUNDS_DTYPE = np.dtype([
+    ("id", "<i8"),
+    ("x_min", "<f8"),
+    ("x_max", "<f8"),
+    ("y_min", "<f8"),
+    ("y_max", "<f8"),
+])
+
+
+def _gather(bodies: list) -> np.ndarray:
+    """Return a (len(FIELDS), bodies) array of the current body state."""
+    if not bodies:
+        return np.empty((len(FIELDS), 0), dtype=np.float64)
+    rows = [(c.x, c.y, c.vx, c.vy, c.force[0], c.force[1], c.mass, c.radius, c.density) for c in bodies]
+    return np.array(rows, dtype=np.float64).T
+
+
+class _ChunkBuffer:
+    """In-memory chunk being filled by the recorder (one slot table, fixed frame capacity)."""
+
+    def __init__(self, ids: list[int], capacity: int):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.slot_of = {body_id: slot for slot, body_id in enumerate(ids)}
+        self.times = np.empty(capacity, dtype=np.float64)
+        self.values = np.full((len(FIELDS), capacity, len(ids)), np.nan, dtype=np.float64)
+        self.frames = 0
+        self.kept: Optional[np.ndarray] = None  # bool[capacity, slots] when sampled
+        self.last_seen = np.full(len(ids), -1, dtype=np.int64)
+
+    def full(self) -> bool:
+        return self.frames >= len(self.times)
+
+    def add(self, sim_time: float, slots: np.ndarray, values: np.ndarray,
+            keep: Optional[np.ndarray] = None, keep_previous: Optional[np.ndarray] = None) -> None:
+        self.times[self.frames] = sim_time
+        self.values[:, self.frames, slots] = values
+        self.last_seen[slots] = self.frames
+        if keep is not None:
+            if self.kept is None:
+                self.kept = np.zeros((len(self.times), len(self.ids)), dtype=bool)
+            self.kept[self.frames, slots[keep]] = True
+            if keep_previous is not None and self.frames > 0:
+                # Samples are only dropped when the chunk is written: still there
+                self.kept[self.frames - 1, slots[keep_previous]] = True
+        self.frames += 1
+
+    def drop_skipped(self) -> None:
+        """Blank the samples the sampler skipped (the last frame of every body is always kept)."""
+        if self.kept is None:
+            return
+        present = self.last_seen >= 0
+        self.kept[self.last_seen[present], np.flatnonzero(present)] = True
+        self.values[:, ~self.kept] = np.nan
+
+
+class TrajectoryRecorder:
+    """
+    Appends body states to a trajectory file, one chunk at a time.
+
+    Chunks are filled on the main thread (a copy of a few floats per body
+    and step) and written by a single background thread, so the frame loop
+    does not wait for the disk unless it falls MAX_PENDING_CHUNKS behind.
+    """
+
+    # Chunks queued for the writer before the main thread waits for the oldest (bounds the memory)
+    MAX_PENDING_CHUNKS = 2
+
+    def __init__(self,
+                 path: str,
+                 sample_every: int = 1,
+                 frames_per_chunk: int = 128,
+                 chunk_bytes: int = 64 << 20,
+                 codec: Optional[StateCodec] = None,
+                 sampler: Optional[AdaptiveSampler] = None,
+                 metadata: Optional[dict[str, Any]] = None):
+        """
+        Args:
+            path: Output file (the index is written next to it, path + ".idx")
+            sample_every: Record one frame every K physics steps
+            frames_per_chunk: Max frames per chunk (a chunk may close earlier when bodies appear)
+            chunk_bytes: Max in-memory size of a chunk (large scenes get fewer frames per chunk)
+            codec: Compact encoding of the chunks (None = raw float64, readable in place)
+            sampler: Per-body decimation / region of interest (None = every body every frame).
+                Skipped samples cost almost nothing with a codec, raw chunks keep their size
+            metadata: Extra JSON-serializable info stored in the header
+        """
+        self.path = path
+        self.index_path = path + INDEX_EXTENSION
+        self.bounds_path = path + BOUNDS_EXTENSION
+        self.sample_every = max(1, int(sample_every))
+        self.frames_per_chunk = max(1, int(frames_per_chunk))
+        self.chunk_bytes = int(chunk_bytes)
+        self.codec = codec
+        self.sampler = sampler if sampler is not None and sampler.active else None
+
+        self._steps = 0
+        self._chunk: Optional[_ChunkBuffer] = None
+        self._offset = 0
+        self._bounds_offset = len(BOUNDS_MAGIC)
+
+        # Bounding boxes may be off by what the reader rebuilds / decodes
+        self._bounds_padding = 0.0
+        if self.sampler is not None and self.sampler.tolerance is not None:
+            self._bounds_padding += self.sampler.tolerance
+        if codec is not None and codec.position_error is not None:
+            self._bounds_padding += codec.position_error
+
+        # Statistics (read by the HUD)
+        self.frames_recorded = 0
+        self.chunks_written = 0
+        self.bytes_written = 0
+
+        header_meta = {
+            "fields": list(FIELDS),
+            "sample_every": self.sample_every,
+            "frames_per_chunk": self.frames_per_chunk,
+            "codec": codec.describe() if codec is not None else None,
+            "sampling": self.sampler.describe() if self.sampler is not None else None,
+            "created": time.time(),
+            **(metadata or {}),
+        }
+        meta_bytes = json.dumps(header_meta).encode("utf-8")
+        header = _HEADER.pack(MAGIC, VERSION, len(meta_bytes)) + meta_bytes
+        header += b"\x00" * (-len(header) % 64)
+
+        self._file = open(path, "wb")
+        self._file.write(header)
+        self._file.flush()
+        self._offset = len(header)
+
+        self._index = open(self.index_path, "wb")
+        self._index.write(_INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, INDEX_DTYPE.itemsize))
+        self._index.flush()
+
+        self._bounds = open(self.bounds_path, "wb")
+        self._bounds.write(BOUNDS_MAGIC)
+        self._bounds.flush()
+
+        # One worker: chunks are written in submission order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="TrajectoryWriter")
+        self._pending: deque[Future] = deque()  # Submitted chunks, oldest first
+        self._closed = False
+
+    # ==================== MAIN THREAD ====================
+
+    def on_physics_step(self, engine) -> None:
+        """Count a physics step and record a frame every sample_every steps."""
+        self._steps += 1
+        if self._steps % self.sample_every == 0:
+            self.record_frame(engine)
+
+    def record_frame(self, engine) -> None:
+        """Append the current state of all alive bodies as one frame."""
+        if self._closed:
+            return
+
+        bodies = [c for c in state.circles if not c.suicide]
+        ids = [c.number for c in bodies]
+
+        chunk = self._chunk
+        if chunk is not None and any(body_id not in chunk.slot_of for body_id in ids):
+            # New bodies need a new slot table
+            self._submit_chunk()
+            chunk = None
+        if chunk is None:
+            frame_bytes = max(1, len(ids)) * len(FIELDS) * 8
+            capacity = max(1, min(self.frames_per_chunk, self.chunk_bytes // frame_bytes))
+            chunk = self._chunk = _ChunkBuffer(ids, capacity)
+            if self.sampler is not None:
+                self.sampler.begin_chunk(len(ids))
+
+        slots = np.fromiter((chunk.slot_of[body_id] for body_id in ids), np.intp, len(ids))
+        values = _gather(bodies)
+        keep = keep_previous = None
+        if self.sampler is not None:
+            keep = self.sampler.select(engine, bodies, chunk.frames, engine.simulation_time, slots, values)
+            keep_previous = self.sampler.keep_previous
+        chunk.add(engine.simulation_time, slots, values, keep, keep_previous)
+        self.frames_recorded += 1
+
+        if chunk.full():
+            self._submit_chunk()
+
+    def _submit_chunk(self) -> None:
+        chunk = self._chunk
+        self._chunk = None
+        if chunk is None or chunk.frames == 0:
+            return
+        pending = self._pending
+        while pending and pending[0].done():
+            pending.popleft()
+        # Backpressure: a lagging disk must not pile up whole chunks in memory
+        while len(pending) >= self.MAX_PENDING_CHUNKS:
+            pending.popleft().result()
+        pending.append(self._writer.submit(self._write_chunk, chunk))
+
+    def close(self) -> None:
+        """Write the pending chunk and close both files (waits for the writer)."""
+        if self._closed:
+            return
+        self._submit_chunk()
+        self._closed = True
+        self._writer.shutdown(wait=True)
+        self._file.close()
+        self._index.close()
+        self._bounds.close()
+        Logger.info(f"Trajectory recording closed: {self.path} ({self.frames_recorded} frames, "
+                    f"{self.chunks_written} chunks, {self.bytes_written / 1e6:.1f} MB)")
+
+    # ==================== WRITER THREAD ====================
+
+    def _encode_chunk(self, chunk: _ChunkBuffer) -> tuple[int, list]:
+        """Return (flags, payload buffers) of a chunk."""
+        chunk.drop_skipped()
+        frames = chunk.frames
+        if self.codec is not None:
+            values = {name: chunk.values[i, :frames, :] for i, name in enumerate(FIELDS)}
+            return CHUNK_ENCODED, [self.codec.encode(chunk.times[:frames], chunk.ids, values)]
+
+        parts = [chunk.times[:frames], chunk.ids]
+        for i in range(len(FIELDS)):
+            parts.append(np.ascontiguousarray(chunk.values[i, :frames, :]))
+        return 0, [memoryview(part).cast("B") for part in parts]
+
+    def _chunk_bounds(self, chunk: _ChunkBuffer) -> np.ndarray:
+        """Bounding box of every body over the chunk (before skipped samples are dropped)."""
+        frames = chunk.frames
+        x, y = chunk.values[0, :frames], chunk.values[1, :frames]
+        bounds = np.empty(len(chunk.ids), dtype=BOUNDS_DTYPE)
+        bounds["id"] = chunk.ids
+        # fmin / fmax skip NaN (absent frames)
+        bounds["x_min"] = np.fmin.reduce(x, axis=0) - self._bounds_padding
+        bounds["x_max"] = np.fmax.reduce(x, axis=0) + self._bounds_padding
+        bounds["y_min"] = np.fmin.reduce(y, axis=0) - self._bounds_padding
+        bounds["y_max"] = np.fmax.reduce(y, axis=0) + self._bounds_padding
+        return bounds
+
+    def _write_chunk(self, chunk: _ChunkBuffer) -> None:
+        try:
+            bounds = self._chunk_bounds(chunk)
+            flags, payload = self._encode_chunk(chunk)
+            payload_bytes = sum(memoryview(part).nbytes for part in payload)
+            offset = self._offset
+
+            self._file.write(_CHUNK.pack(_CHUNK_MAGIC, chunk.frames, len(chunk.ids), flags, payload_bytes))
+            for part in payload:
+                self._file.write(part)
+            self._file.flush()
+
+            record = np.zeros(1, dtype=INDEX_DTYPE)
+            record["t_start"] = chunk.times[0]
+            record["t_end"] = chunk.times[chunk.frames - 1]
+            record["offset"] = offset
+            record["nbytes"] = _CHUNK.size + payload_bytes
+            record["frames"] = chunk.frames
+            record["slots"] = len(chunk.ids)
+            for name in ("x_min", "y_min"):
+                record[name] = np.fmin.reduce(bounds[name]) if len(bounds) else np.inf
+            for name in ("x_max", "y_max"):
+                record[name] = np.fmax.reduce(bounds[name]) if len(bounds) else -np.inf
+            record["bounds_offset"] = self._bounds_offset
+
+            self._bounds.write(bounds.tobytes())
+            self._bounds.flush()
+            self._bounds_offset += bounds.nbytes
+
+            # The index is written after the data it points to
+            self._index.write(record.tobytes())
+            self._index.flush()
+
+            self._offset += _CHUNK.size + payload_bytes
+            self.chunks_written += 1
+            self.bytes_written = self._offset
+        except (OSError, ValueError) as e:
+            Logger.exception(f"Trajectory chunk write failed: {e}")
+
+
+class TrajectoryChunk:
+    """
+    One chunk: zero-copy views on the memory-mapped file (raw chunks) or
+    decoded arrays (encoded chunks).
+
+    Attributes:
+        times: float64[frames]
+        ids: int64[slots]
+        values: dict field -> float64[frames, slots] (NaN = body absent)
+    """
+
+    def __init__(self, times: np.ndarray, ids: np.ndarray, values: dict[str, np.ndarray]):
+        self.times = times
+        self.ids = ids
+        self.values = values
+        self.decoded = False
+        self.nbytes = 0
+        self._slot_of: Optional[dict[int, int]] = None
+
+    def slot(self, body_id: int) -> Optional[int]:
+        """Return the slot of a body in this chunk, or None."""
+        if self._slot_of is None:
+            self._slot_of = {int(body_id): slot for slot, body_id in enumerate(self.ids)}
+        return self._slot_of.get(int(body_id))
+
+    def frame(self, frame: int) -> tuple[float, np.ndarray, dict[str, np.ndarray]]:
+        """Return (time, ids, values) of the bodies present at one frame."""
+        present = ~np.isnan(self.values["x"][frame])
+        return (float(self.times[frame]), self.ids[present],
+                {name: column[frame][present] for name, column in self.values.items()})
+
+
+class TrajectoryReader:
+    """
+    Random-access reader over a trajectory file.
+
+    Both the data and the index are memory-mapped: opening a multi-GB
+    recording reads nothing but the headers, and each query only touches
+    the chunks it needs.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + INDEX_EXTENSION
+        self.bounds_path = path + BOUNDS_EXTENSION
+
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, meta_length = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a GravityEngine trajectory: {path}")
+        if version > VERSION:
+            raise ValueError(f"Trajectory format v{version} is newer than supported v{VERSION}")
+        self.version = version
+        self.metadata: dict[str, Any] = json.loads(bytes(self._data[_HEADER.size:_HEADER.size + meta_length]))
+        self.fields: tuple[str, ...] = tuple(self.metadata["fields"])
+        self._data_start = _HEADER.size + meta_length + (-(_HEADER.size + meta_length) % 64)
+        self.sampled = bool(self.metadata.get("sampling"))
+
+        self._load_index()
+        self._cache: dict[int, TrajectoryChunk] = {}
+        self._cache_bytes = 0
+
+    # ==================== INDEX ====================
+
+    def _load_index(self) -> None:
+        if os.path.exists(self.index_path) and os.path.getsize(self.index_path) >= _INDEX_HEADER.size:
+            with open(self.index_path, "rb") as f:
+                self._index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, record_size = _INDEX_HEADER.unpack_from(self._index_map, 0)
+            dtype = INDEX_DTYPE if version >= 2 else _INDEX_DTYPE_V1
+            if magic != INDEX_MAGIC or version > INDEX_VERSION or record_size != dtype.itemsize:
+                raise ValueError(f"Unsupported trajectory index: {self.index_path}")
+            count = (len(self._index_map) - _INDEX_HEADER.size) // record_size
+            self.index = np.frombuffer(self._index_map, dtype=dtype, count=count, offset=_INDEX_HEADER.size)
+            if version < 2:
+                self.index = self._upgrade_index(self.index)
+        else:
+            # Index lost (e.g. crash before it was created): rebuild it by walking the chunks
+            Logger.warning(f"Trajectory index missing, scanning {self.path}")
+            self.index = self._scan_chunks()
+        self._starts = self.index["t_start"]
+
+        self._bounds_map = None
+        if os.path.exists(self.bounds_path) and os.path.getsize(self.bounds_path) > len(BOUNDS_MAGIC):
+            with open(self.bounds_path, "rb") as f:
+                self._bounds_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._bounds_map[:len(BOUNDS_MAGIC)] != BOUNDS_MAGIC:
+                raise ValueError(f"Unsupported trajectory bounds: {self.bounds_path}")
+
+    @staticmethod
+    def _upgrade_index(records: np.ndarray) -> np.ndarray:
+        """Index records without bounding boxes (v1 index, scanned chunks): boxes cover everything."""
+        index = np.zeros(len(records), dtype=INDEX_DTYPE)
+        for name in _INDEX_DTYPE_V1.names:
+            index[name] = records[name]
+        index["x_min"] = index["y_min"] = -np.inf
+        index["x_max"] = index["y_max"] = np.inf
+        index["bounds_offset"] = NO_BOUNDS
+        return index
+
+    def _scan_chunks(self) -> np.ndarray:
+        records = []
+        offset = self._data_start
+        while offset + _CHUNK.size <= len(self._data):
+            magic, frames, slots, _flags, payload_bytes = _CHUNK.unpack_from(self._data, offset)
+            if magic != _CHUNK_MAGIC or offset + _CHUNK.size + payload_bytes > len(self._data):
+                break  # truncated tail
+            times = self._read_chunk(offset).times
+            records.append((times[0], times[-1], offset, _CHUNK.size + payload_bytes, frames, slots))
+            offset += _CHUNK.size + payload_bytes
+        return self._upgrade_index(np.array(records, dtype=_INDEX_DTYPE_V1))
+
+    def refresh(self) -> None:
+        """Re-map the files to see chunks appended since opening (live recordings)."""
+        self.__init__(self.path)
+
+    # ==================== PROPERTIES ====================
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self.index)
+
+    @property
+    def t_min(self) -> float:
+        return float(self.index["t_start"][0]) if len(self.index) else 0.0
+
+    @property
+    def t_max(self) -> float:
+        return float(self.index["t_end"][-1]) if len(self.index) else 0.0
+
+    def bounds(self, i: int) -> Optional[np.ndarray]:
+        """Return the BOUNDS_DTYPE[slots] record of chunk i (body ID + box), or None if not recorded."""
+        record = self.index[i]
+        offset = int(record["bounds_offset"])
+        if self._bounds_map is None or offset == NO_BOUNDS:
+            return None
+        count = int(record["slots"])
+        if offset + count * BOUNDS_DTYPE.itemsize > len(self._bounds_map):
+            return None  # Written after this reader mapped the file
+        return np.frombuffer(self._bounds_map, dtype=BOUNDS_DTYPE, count=count, offset=offset)
+
+    # ==================== CHUNK ACCESS ====================
+
+    # Decoded chunks are real memory (mapped ones are not): bound what the cache keeps
+    CACHE_ENTRIES = 64
+    CACHE_DECODED_BYTES = 256 << 20
+
+    def chunk(self, i: int) -> TrajectoryChunk:
+        """Return chunk i (cached)."""
+        cached = self._cache.get(i)
+        if cached is not None:
+            return cached
+
+        chunk = self._read_chunk(int(self.index[i]["offset"]))
+        if self.sampled:
+            self._fill_skipped(chunk)
+        chunk.nbytes = sum(values.nbytes for values in chunk.values.values()) if chunk.decoded else 0
+        while self._cache and (len(self._cache) >= self.CACHE_ENTRIES
+                               or self._cache_bytes + chunk.nbytes > self.CACHE_DECODED_BYTES):
+            self._cache_bytes -= self._cache.pop(next(iter(self._cache))).nbytes
+        self._cache[i] = chunk
+        self._cache_bytes += chunk.nbytes
+        return chunk
+
+    @staticmethod
+    def _fill_skipped(chunk: TrajectoryChunk) -> None:
+        """
+        Rebuild the samples skipped by an AdaptiveSampler, every field by
+        linear interpolation between the kept samples around the gap.
+        """
+        kept = ~np.isnan(chunk.values["x"])
+        frames = len(chunk.times)
+        rows = np.arange(frames)[:, None]
+        previous = np.maximum.accumulate(np.where(kept, rows, -1), axis=0)
+        following = np.minimum.accumulate(np.where(kept, rows, frames)[::-1], axis=0)[::-1]
+        gaps = ~kept & (previous >= 0) & (following < frames)
+        if not gaps.any():
+            return
+
+        previous = np.where(gaps, previous, rows)
+        following = np.where(gaps, following, rows)
+        t0, t1 = chunk.times[previous], chunk.times[following]
+        weight = np.divide(chunk.times[:, None] - t0, t1 - t0, out=np.zeros_like(t0), where=t1 > t0)
+        for name, values in chunk.values.items():
+            v0 = np.take_along_axis(values, previous, axis=0)
+            v1 = np.take_along_axis(values, following, axis=0)
+            chunk.values[name] = np.where(gaps, v0 + weight * (v1 - v0), values)
+        chunk.decoded = True  # Now real memory, counted by the cache
+
+    def _read_chunk(self, offset: int) -> TrajectoryChunk:
+        magic, frames, slots, flags, payload_bytes = _CHUNK.unpack_from(self._data, offset)
+        if magic != _CHUNK_MAGIC:
+            raise ValueError(f"Corrupted trajectory chunk at offset {offset}")
+
+        position = offset + _CHUNK.size
+        if flags & CHUNK_ENCODED:
+            times, ids, values = StateCodec.decode(memoryview(self._data)[position:position + payload_bytes])
+            chunk = TrajectoryChunk(times, ids, values)
+            chunk.decoded = True
+            return chunk
+
+        times = np.frombuffer(self._data, np.float64, frames, position)
+        position += times.nbytes
+        ids = np.frombuffer(self._data, np.int64, slots, position)
+        position += ids.nbytes
+        values = {}
+        for name in self.fields:
+            block = np.frombuffer(self._data, np.float64, frames * slots, position)
+            values[name] = block.reshape(frames, slots)
+            position += block.nbytes
+
+        return TrajectoryChunk(times, ids, values)
+
+    def locate(self, t: float) -> tuple[int, int]:
+        """
+        Return (chunk index, frame index) of the last frame at or before t
+        (clamped to the first / last frame of the recording).
+        """
+        if not len(self.index):
+            raise ValueError("Empty trajectory")
+        i = int(np.searchsorted(self._starts, t, side="right")) - 1
+        i = min(max(i, 0), len(self.index) - 1)
+        times = self.chunk(i).times
+        frame = bisect_right(times, t) - 1
+        return i, min(max(frame, 0), len(times) - 1)
+
+    def frame_at(self, t: float) -> tuple[float, np.ndarray, dict[str, np.ndarray]]:
+        """Return (time, ids, values) of the recorded frame at or just before t."""
+        i, frame = self.locate(t)
+        return self.chunk(i).frame(frame)
+
+    def chunks_between(self, t0: float, t1: float) -> Iterator[TrajectoryChunk]:
+        """Yield the chunks overlapping [t0, t1], in time order."""
+        first = max(int(np.searchsorted(self._starts, t0, side="right")) - 1, 0)
+        last = int(np.searchsorted(self._starts, t1, side="right"))
+        for i in range(first, last):
+            if self.index["t_end"][i] >= t0:
+                yield self.chunk(i)
+
+    def window(self, t0: float, t1: float) -> Iterator[tuple[float, np.ndarray, dict[str, np.ndarray]]]:
+        """Yield every frame (time, ids, values) recorded in [t0, t1]."""
+        for chunk in self.chunks_between(t0, t1):
+            start = int(np.searchsorted(chunk.times, t0, side="left"))
+            stop = int(np.searchsorted(chunk.times, t1, side="right"))
+            for frame in range(start, stop):
+                yield chunk.frame(frame)
+
+    def track(self, body_id: int, t0: float = -np.inf, t1: float = np.inf) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """
+        Return the history of one body between t0 and t1.
+
+        Returns:
+            (times, values) with values a dict field -> 1D array (only frames where the body exists)
+        """
+        times_parts = []
+        value_parts: dict[str, list] = {name: [] for name in self.fields}
+        for chunk in self.chunks_between(t0, t1):
+            slot = chunk.slot(body_id)
+            if slot is None:
+                continue
+            mask = (chunk.times >= t0) & (chunk.times <= t1) & ~np.isnan(chunk.values["x"][:, slot])
+            times_parts.append(chunk.times[mask])
+            for name in self.fields:
+                value_parts[name].append(chunk.values[name][mask, slot])
+
+        if not times_parts:
+            return np.empty(0), {name: np.empty(0) for name in self.fields}
+        return np.concatenate(times_parts), {name: np.concatenate(parts) for name, parts in value_parts.items()}
@@ -0,0 +1,187 @@
+"""
+Spatio-temporal queries over recorded runs.
+===========================================
+
+Answers questions about a recording (see trajectory.py) without
+re-simulating, reading only the chunks that can contain an answer:
+
+    1. time pruning: binary search of the chunk start times in the index
+    2. space pruning: bounding box of each chunk (index record), then of
+       each body in the chunk (bounds file), checked with vectorized
+       comparisons over the memory-mapped tables
+    3. exact test on the frames of the remaining chunks / bodies
+
+The index is a flat, time-sorted table of (t_start, t_end, box) records:
+one record per chunk, scanned in a few microseconds even for hours of
+recording, so no tree is built on top of it.
+
+Boxes are (x_min, y_min, x_max, y_max) in world meters.
+
+Usage:
+    from trajectory import TrajectoryReader
+    from trajectory_query import TrajectoryQuery
+
+    query = TrajectoryQuery(TrajectoryReader(path))
+    t, ids, values = query.inside_box((0, 0, 500, 500), t=12.5)
+    first_times = query.passed_through_box((0, 0, 500, 500), t0=0.0, t1=60.0)
+    encounters = query.near(42, distance=25.0, t0=10.0, t1=20.0)
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from trajectory import TrajectoryReader
+
+
+class TrajectoryQuery:
+    """
+    Box and proximity queries over a TrajectoryReader.
+    """
+
+    def __init__(self, reader: TrajectoryReader):
+        self.reader = reader
+
+        # Statistics of the last query (how much was pruned)
+        self.chunks_considered = 0
+        self.chunks_read = 0
+
+    # ==================== PRUNING ====================
+
+    def chunks_overlapping(self, box: tuple[float, float, float, float],
+                           t0: float = -np.inf, t1: float = np.inf) -> np.ndarray:
+        """Return the indices of the chunks whose time range and bounding box overlap the query."""
+        index = self.reader.index
+        first = max(int(np.searchsorted(index["t_start"], t0, side="right")) - 1, 0)
+        last = int(np.searchsorted(index["t_start"], t1, side="right"))
+        records = index[first:last]
+        x_min, y_min, x_max, y_max = box
+        hit = ((records["t_end"] >= t0)
+               & (records["x_max"] >= x_min) & (records["x_min"] <= x_max)
+               & (records["y_max"] >= y_min) & (records["y_min"] <= y_max))
+        return first + np.flatnonzero(hit)
+
+    def _candidate_slots(self, i: int, box: tuple[float, float, float, float]) -> Optional[np.ndarray]:
+        """Slots of chunk i whose own box overlaps the query (None = no bounds recorded, all slots)."""
+        bounds = self.reader.bounds(i)
+        if bounds is None:
+            return None
+        x_min, y_min, x_max, y_max = box
+        return np.flatnonzero((bounds["x_max"] >= x_min) & (bounds["x_min"] <= x_max)
+                              & (bounds["y_max"] >= y_min) & (bounds["y_min"] <= y_max))
+
+    @staticmethod
+    def _inside(x: np.ndarray, y: np.ndarray, box: tuple[float, float, float, float]) -> np.ndarray:
+        x_min, y_min, x_max, y_max = box
+        return (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+
+    # ==================== QUERIES ====================
+
+    def inside_box(self, box: tuple[float, float, float, float],
+                   t: float) -> tuple[float, np.ndarray, dict[str, np.ndarray]]:
+        """
+        Return the bodies inside a box at the recorded frame at or just before t.
+
+        Returns:
+            (frame time, ids, values) with values a dict field -> 1D array
+        """
+        reader = self.reader
+        i, frame = reader.locate(t)
+        self.chunks_considered, self.chunks_read = 1, 0
+        empty = (float(t), np.empty(0, np.int64), {name: np.empty(0) for name in reader.fields})
+
+        record = reader.index[i]
+        if not (record["x_max"] >= box[0] and record["x_min"] <= box[2]
+                and record["y_max"] >= box[1] and record["y_min"] <= box[3]):
+            return empty
+        slots = self._candidate_slots(i, box)
+        if slots is not None and not len(slots):
+            return empty
+
+        chunk = reader.chunk(i)
+        self.chunks_read = 1
+        if slots is None:
+            slots = np.arange(len(chunk.ids))
+        x, y = chunk.values["x"][frame, slots], chunk.values["y"][frame, slots]
+        slots = slots[self._inside(x, y, box)]  # NaN (absent) compares False
+        return (float(chunk.times[frame]), chunk.ids[slots],
+                {name: column[frame, slots] for name, column in chunk.values.items()})
+
+    def passed_through_box(self, box: tuple[float, float, float, float],
+                           t0: float = -np.inf, t1: float = np.inf) -> dict[int, float]:
+        """
+        Return every body recorded inside a box between t0 and t1.
+
+        Returns:
+            dict body ID -> first recorded time inside the box
+        """
+        found: dict[int, float] = {}
+        chunks = self.chunks_overlapping(box, t0, t1)
+        self.chunks_considered, self.chunks_read = len(chunks), 0
+        for i in chunks:
+            slots = self._candidate_slots(int(i), box)
+            if slots is not None and not len(slots):
+                continue
+
+            chunk = self.reader.chunk(int(i))
+            self.chunks_read += 1
+            if slots is None:
+                slots = np.arange(len(chunk.ids))
+            frames = (chunk.times >= t0) & (chunk.times <= t1)
+            inside = self._inside(chunk.values["x"][frames][:, slots], chunk.values["y"][frames][:, slots], box)
+            times = chunk.times[frames]
+            for column in np.flatnonzero(inside.any(axis=0)):
+                body_id = int(chunk.ids[slots[column]])
+                if body_id not in found:
+                    found[body_id] = float(times[np.argmax(inside[:, column])])
+        return found
+
+    def near(self, body_id: int, distance: float,
+             t0: float = -np.inf, t1: float = np.inf) -> dict[int, tuple[float, float]]:
+        """
+        Return every body that came within `distance` of body `body_id` between t0 and t1
+        (distance between centers, at the same recorded frame).
+
+        Returns:
+            dict body ID -> (time of closest approach, closest distance)
+        """
+        reader = self.reader
+        found: dict[int, tuple[float, float]] = {}
+        chunks = self.chunks_overlapping((-np.inf, -np.inf, np.inf, np.inf), t0, t1)
+        self.chunks_considered, self.chunks_read = len(chunks), 0
+        for i in chunks:
+            i = int(i)
+            bounds = reader.bounds(i)
+            slots = None
+            if bounds is not None:
+                rows = np.flatnonzero(bounds["id"] == body_id)
+                if not len(rows):
+                    continue  # Body not in this chunk
+                reference = bounds[rows[0]]
+                box = (reference["x_min"] - distance, reference["y_min"] - distance,
+                       reference["x_max"] + distance, reference["y_max"] + distance)
+                slots = self._candidate_slots(i, box)
+                slots = slots[slots != rows[0]]
+                if not len(slots):
+                    continue
+
+            chunk = reader.chunk(i)
+            self.chunks_read += 1
+            reference_slot = chunk.slot(body_id)
+            if reference_slot is None:
+                continue
+            if slots is None:
+                slots = np.flatnonzero(np.arange(len(chunk.ids)) != reference_slot)
+
+            frames = (chunk.times >= t0) & (chunk.times <= t1)
+            x, y = chunk.values["x"][frames], chunk.values["y"][frames]
+            separation = np.hypot(x[:, slots] - x[:, [reference_slot]], y[:, slots] - y[:, [reference_slot]])
+            separation = np.where(np.isnan(separation), np.inf, separation)
+            times = chunk.times[frames]
+            for column in np.flatnonzero((separation <= distance).any(axis=0)):
+                frame = int(np.argmin(separation[:, column]))
+                other = int(chunk.ids[slots[column]])
+                closest = float(separation[frame, column])
+                if other not in found or closest < found[other][1]:
+                    found[other] = (float(times[frame]), closest)
+        return found
@@ -1,4 +1,5 @@
 import state
+import numpy as np
 import pygame
 from typing import Optional
 from color import Color, Display
@@ -102,8 +103,12 @@ def write_screen(text: str = "[text]",
         Returns:
             Pygame Rect object representing the text area, or None on error
         """
-        written = state.engine.font.render(text, 1, color)
-        rect = state.engine.screen.blit(written, dest=(dest[0], dest[1] + line * (state.engine.txt_gap + state.engine.txt_size)))
+        engine = state.engine
+        written = engine.text.render(text, engine.font, color)
+        position = (dest[0], dest[1] + line * (engine.txt_gap + engine.txt_size))
+        rect = engine.screen.blit(written, dest=position)
+        # HUD layout of the frame (unclipped area), compared between frames by IdleRenderer
+        engine.hud_record.append((text, color, pygame.Rect(position, written.get_size())))
         return rect
 
     @staticmethod
@@ -118,3 +123,35 @@ def average(l: list[float] | tuple[float] | set[float]) -> float:
             Average value, or 0 if sequence is empty
         """
         return sum(l) / len(l) if len(l) > 0 else 0
+
+    @staticmethod
+    def drawn_regions(surface: pygame.Surface, gap: int = 32) -> list[pygame.Rect]:
+        """
+        Rectangles covering the non-transparent pixels of a per-pixel alpha surface.
+
+        Rows holding pixels are grouped into bands, then each band is split
+        into column runs separated by more than `gap` transparent pixels.
+
+        Args:
+            surface: Surface with per-pixel alpha (e.g. the HUD layer)
+            gap: Transparent columns tolerated inside a rectangle
+
+        Returns:
+            List of rectangles (empty if the surface is fully transparent)
+        """
+        def runs(mask: np.ndarray, tolerance: int) -> list[tuple[int, int]]:
+            # (start, end) of the True runs, merging runs closer than the tolerance
+            indices = np.flatnonzero(mask)
+            if len(indices) == 0:
+                return []
+            breaks = np.flatnonzero(np.diff(indices) > tolerance + 1)
+            starts = np.concatenate(([indices[0]], indices[breaks + 1]))
+            ends = np.concatenate((indices[breaks], [indices[-1]])) + 1
+            return list(zip(starts.tolist(), ends.tolist()))
+
+        occupied = pygame.surfarray.pixels_alpha(surface) > 0  # Indexed [x, y]
+        regions = []
+        for top, bottom in runs(occupied.any(axis=0), 0):
+            for left, right in runs(occupied[:, top:bottom].any(axis=1), gap):
+                regions.append(pygame.Rect(left, top, right - left, bottom - top))
+        return regions
@@ -0,0 +1,203 @@
+"""
+Batched velocity / force vector overlay.
+========================================
+
+Circle.print_global_speed_vector, print_force_vector and
+print_cardinal_speed_vectors interpolate, project and scale one body at a
+time, with two or three draw calls each. VectorOverlay does the same
+computation in one NumPy pass over the visible bodies of a FrameData:
+
+    1. interpolated velocity and force of every visible body
+    2. screen endpoints, with the same scaling as the Circle methods:
+         velocity  v * global_speed_vector_scale
+         force     direction * log10(|F| + 1) * vector_scale * force_vector_scale
+    3. decimation: vectors shorter than MIN_LENGTH_PX are not drawn
+    4. arrowheads (optional): two barbs, ARROW_RATIO of the vector length
+       capped at ARROW_MAX_PX, on vectors of at least ARROW_MIN_LENGTH_PX
+
+Vectors are grouped by (color, width). In each group, 1 px vectors up to
+RASTER_MAX_PX are rasterized in one batch (shafts and barbs sampled once
+per pixel, one surfarray write); the others are drawn with one
+pygame.draw.lines call each (shaft and barbs in one polyline), or aalines
+when antialiased. The Circle methods are kept for console debugging.
+
+Usage:
+    from vectors import VectorOverlay
+
+    VectorOverlay.draw(engine.screen, frame, engine)   # in Engine.render_world
+"""
+
+from itertools import chain
+from math import cos, radians, sin
+
+import numpy as np
+import pygame
+
+from color import Display
+
+
+class VectorOverlay:
+    """
+    Vectorized velocity, cardinal and force vectors of the visible bodies.
+    """
+
+    # Shorter vectors are not drawn (screen pixels)
+    MIN_LENGTH_PX = 1.0
+    # Arrowheads: barb length = ARROW_RATIO x vector length, at most ARROW_MAX_PX
+    ARROW_MIN_LENGTH_PX = 6.0
+    ARROW_RATIO = 0.25
+    ARROW_MAX_PX = 10.0
+    ARROW_ANGLE = radians(25)
+    # Thin vectors up to this length (px) are rasterized together with NumPy,
+    # longer ones are drawn by pygame (one call costs about as much as ~50 pixels)
+    RASTER_MAX_PX = 48.0
+
+    @staticmethod
+    def _gather(bodies: list, getter, width: int) -> np.ndarray:
+        """Table (len(bodies), width) of the values returned by getter for each body."""
+        count = len(bodies)
+        return np.fromiter(chain.from_iterable(map(getter, bodies)), np.float64, count * width).reshape(count, width)
+
+    @staticmethod
+    def draw(screen: pygame.Surface, frame, engine) -> None:
+        """
+        Draw the vectors of the frame's visible bodies.
+
+        Args:
+            screen: Target surface
+            frame: FrameData of the current frame (interpolated at frame.alpha)
+            engine: Running engine (camera, vector settings)
+        """
+        visible = frame.visible
+        if len(visible) == 0:
+            return
+        bodies = [frame.bodies[i] for i in visible.tolist()]
+        alpha = frame.alpha
+        scale = engine.camera.scale
+        x0, y0 = frame.screen_x[visible], frame.screen_y[visible]
+        arrowheads = bool(engine.vector_arrowheads)
+        antialias = bool(engine.vector_antialiasing)
+
+        # ===== VELOCITY =====
+        motion = VectorOverlay._gather(
+            bodies, lambda body: (body.prev_vx, body.vx, body.prev_vy, body.vy, body.global_speed_vector_scale), 5)
+        prev_vx, vx, prev_vy, vy, speed_scale = motion.T
+        vx = (prev_vx + (vx - prev_vx) * alpha) * speed_scale * scale
+        vy = (prev_vy + (vy - prev_vy) * alpha) * speed_scale * scale
+        widths = [body.vector_width for body in bodies]
+        VectorOverlay._emit(screen, x0, y0, vx, vy, [body.GSV_color for body in bodies], widths,
+                            arrowheads, antialias)
+
+        if engine.cardinal_vectors:
+            zeros = np.zeros_like(vx)
+            VectorOverlay._emit(screen, x0, y0, vx, zeros, [body.CSV_x_color for body in bodies], widths,
+                                arrowheads, antialias)
+            VectorOverlay._emit(screen, x0, y0, zeros, vy, [body.CSV_y_color for body in bodies], widths,
+                                arrowheads, antialias)
+
+        # ===== FORCE =====
+        if engine.force_vectors:
+            forces = VectorOverlay._gather(
+                bodies, lambda body: (*body.prev_force, *body.force, body.force_vector_scale), 5)
+            prev_fx, prev_fy, fx, fy, force_scale = forces.T
+            magnitude = np.hypot(fx, fy)
+            # Same as print_force_vector: interpolated force over the current magnitude
+            with np.errstate(divide="ignore", invalid="ignore"):
+                length = np.log10(magnitude + 1) * engine.vector_scale * force_scale * scale / magnitude
+            length = np.where(magnitude < 1e-10, 0.0, length)
+            fx = (prev_fx + (fx - prev_fx) * alpha) * length
+            fy = (prev_fy + (fy - prev_fy) * alpha) * length
+            VectorOverlay._emit(screen, x0, y0, fx, fy, [Display.SP_BLUE] * len(bodies), [1] * len(bodies),
+                                arrowheads, antialias)
+
+    @staticmethod
+    def _emit(screen: pygame.Surface, x0: np.ndarray, y0: np.ndarray, dx: np.ndarray, dy: np.ndarray,
+              colors: list, widths: list, arrowheads: bool, antialias: bool) -> None:
+        """Draw the segments (x0, y0) → (x0 + dx, y0 + dy), grouped by (color, width)."""
+        length = np.nan_to_num(np.hypot(dx, dy), nan=0.0)
+        kept = np.flatnonzero(length >= VectorOverlay.MIN_LENGTH_PX)
+        if len(kept) == 0:
+            return
+        x0, y0, dx, dy, length = x0[kept], y0[kept], dx[kept], dy[kept], length[kept]
+        x1, y1 = x0 + dx, y0 + dy
+
+        # Barbs: the reversed unit vector rotated by ±ARROW_ANGLE
+        if arrowheads:
+            with_arrow = length >= VectorOverlay.ARROW_MIN_LENGTH_PX
+            barb = np.minimum(length * VectorOverlay.ARROW_RATIO, VectorOverlay.ARROW_MAX_PX) / length
+            bx, by = -dx * barb, -dy * barb
+            c, s = cos(VectorOverlay.ARROW_ANGLE), sin(VectorOverlay.ARROW_ANGLE)
+            left_x, left_y = x1 + bx * c - by * s, y1 + bx * s + by * c
+            right_x, right_y = x1 + bx * c + by * s, y1 - bx * s + by * c
+        else:
+            with_arrow = np.zeros(len(kept), dtype=bool)
+            left_x, left_y, right_x, right_y = x1, y1, x1, y1
+
+        # Colors are compared by identity (Color is not hashable): bodies share the palette objects
+        color_ids = list(map(id, colors))
+        palette = {color_id: color for color_id, color in zip(color_ids, colors)}
+        codes: dict = {}
+        if len(palette) == 1 and widths.count(widths[0]) == len(widths):
+            codes[(color_ids[0], widths[0])] = 0
+            group = None
+        else:
+            group = np.fromiter((codes.setdefault((color_ids[i], widths[i]), len(codes)) for i in kept.tolist()),
+                                np.int64, len(kept))
+
+        for (color_id, width), code in codes.items():
+            color = tuple(palette[color_id])
+            members = np.arange(len(kept)) if group is None else np.flatnonzero(group == code)
+
+            if width == 1 and not antialias:
+                # Short thin vectors: shafts and barbs rasterized in one batch
+                short = members[length[members] <= VectorOverlay.RASTER_MAX_PX]
+                members = members[length[members] > VectorOverlay.RASTER_MAX_PX]
+                barbed = short[with_arrow[short]]
+                VectorOverlay._rasterize(screen, color,
+                                         np.concatenate((x0[short], x1[barbed], x1[barbed])),
+                                         np.concatenate((y0[short], y1[barbed], y1[barbed])),
+                                         np.concatenate((x1[short], left_x[barbed], right_x[barbed])),
+                                         np.concatenate((y1[short], left_y[barbed], right_y[barbed])))
+            if len(members) == 0:
+                continue
+
+            # One polyline per vector: start, end, then left barb, end, right barb
+            points = np.stack((x0[members], y0[members], x1[members], y1[members],
+                               left_x[members], left_y[members], x1[members], y1[members],
+                               right_x[members], right_y[members]), axis=1).reshape(-1, 5, 2).tolist()
+            arrow_flags = with_arrow[members].tolist()
+            if antialias and width == 1:
+                draw_aalines = pygame.draw.aalines
+                for polyline, arrow in zip(points, arrow_flags):
+                    draw_aalines(screen, color, False, polyline if arrow else polyline[:2])
+            else:
+                draw_lines = pygame.draw.lines
+                for polyline, arrow in zip(points, arrow_flags):
+                    draw_lines(screen, color, False, polyline if arrow else polyline[:2], width)
+
+    @staticmethod
+    def _rasterize(screen: pygame.Surface, color: tuple, x0: np.ndarray, y0: np.ndarray,
+                   x1: np.ndarray, y1: np.ndarray) -> None:
+        """Draw 1 px segments with a single surfarray write (DDA: one sample per pixel of the major axis)."""
+        if len(x0) == 0:
+            return
+        dx, dy = x1 - x0, y1 - y0
+        steps = np.maximum(np.ceil(np.maximum(np.abs(dx), np.abs(dy))).astype(np.int64), 1)
+        counts = steps + 1
+        # Sample k of each segment: start + k * (segment / steps)
+        k = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        xs = (np.repeat(x0, counts) + np.repeat(dx / steps, counts) * k).astype(np.int64)
+        ys = (np.repeat(y0, counts) + np.repeat(dy / steps, counts) * k).astype(np.int64)
+
+        width, height = screen.get_size()
+        on_screen = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        xs, ys = xs[on_screen], ys[on_screen]
+        # 32-bit surfaces: one mapped integer per pixel (several times faster than per channel)
+        if screen.get_bytesize() == 4:
+            target, value = pygame.surfarray.pixels2d(screen), screen.map_rgb(color)
+        else:
+            target, value = pygame.surfarray.pixels3d(screen), color[:3]
+        try:
+            target[xs, ys] = value
+        finally:
+            del target